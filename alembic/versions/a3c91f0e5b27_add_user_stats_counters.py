@@ -0,0 +1,50 @@
+"""add user stats counters
+
+Revision ID: a3c91f0e5b27
+Revises: 7866385d4c54
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c91f0e5b27'
+down_revision: Union[str, None] = '7866385d4c54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-user task list and task counters for the dashboard
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('total_task_lists', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_task_lists', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_tasks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Per-user, per-day time block counters
+    op.create_table(
+        'user_day_stats',
+        sa.Column('user_id', sa.String(length=36), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('total_time_blocks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_time_blocks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('missed_time_blocks', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'date')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_day_stats')
+    op.drop_table('user_stats')
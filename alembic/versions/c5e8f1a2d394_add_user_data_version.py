@@ -0,0 +1,28 @@
+"""add user data version
+
+Revision ID: c5e8f1a2d394
+Revises: b7d2e4a61c08
+Create Date: 2026-10-17 18:20:11.204715
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8f1a2d394'
+down_revision: Union[str, None] = 'b7d2e4a61c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
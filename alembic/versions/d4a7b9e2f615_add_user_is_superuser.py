@@ -0,0 +1,35 @@
+"""add user is_superuser
+
+Revision ID: d4a7b9e2f615
+Revises: c5e8f1a2d394
+Create Date: 2026-10-17 21:04:37.518203
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7b9e2f615'
+down_revision: Union[str, None] = 'c5e8f1a2d394'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing accounts, including one squatting on FIRST_SUPERUSER_EMAIL, start
+    # unprivileged. The initial revision already has the column (nullable)
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('users')}
+    if 'is_superuser' in columns:
+        op.execute("UPDATE users SET is_superuser = false")
+    else:
+        op.add_column(
+            'users',
+            sa.Column('is_superuser', sa.Boolean(), nullable=False, server_default=sa.false())
+        )
+
+
+def downgrade() -> None:
+    # Left in place: upgrade cannot tell whether it added the column
+    pass
@@ -1,22 +1,60 @@
-from typing import Generator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.security import verify_password
-from app.db.database import get_db
-from app.models.user import User
+from app.db.database import get_db, route_reads
+from app.models.user import User, SubscriptionTier
 from app.schemas.token import TokenData
 
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 
-def get_current_user(
-    db: Session = Depends(get_db),
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached snapshot of the user fields endpoints read"""
+    user_id: str
+    email: str
+    name: str
+    subscription_tier: SubscriptionTier
+    subscription_expires_at: Optional[datetime]
+    created_at: datetime
+    is_superuser: bool = False
+    
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentUser":
+        return cls(
+            user_id=user.user_id,
+            email=user.email,
+            name=user.name,
+            subscription_tier=user.subscription_tier,
+            subscription_expires_at=user.subscription_expires_at,
+            created_at=user.created_at,
+            is_superuser=bool(user.is_superuser)
+        )
+
+
+# Principals keyed by user id; a hit skips the users lookup entirely
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Forget a cached principal after its tier, expiry or profile changes"""
+    principal_cache.pop(user_id)
+
+
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
-) -> User:
+) -> CurrentUser:
     """Get current authenticated user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,15 +71,33 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.user_id == token_data.user_id).first()
+    # Read-replica routing keeps this user's reads on the primary right after a write
+    await route_reads(db, token_data.user_id)
+    
+    principal = principal_cache.get(token_data.user_id)
+    if principal is not None:
+        return principal
+    
+    user = await db.get(User, token_data.user_id)
     if user is None:
         raise credentials_exception
     
-    return user
+    principal = CurrentUser.from_user(user)
+    principal_cache.set(principal.user_id, principal)
+    return principal
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+async def get_current_active_user(
+    current_user: CurrentUser = Depends(get_current_user)
+) -> CurrentUser:
     """Get current active user"""
-    return current_user
\ No newline at end of file
+    return current_user
+
+
+async def get_current_admin(
+    current_user: CurrentUser = Depends(get_current_active_user)
+) -> CurrentUser:
+    """Operational endpoints are limited to superusers"""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    return current_user
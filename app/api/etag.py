@@ -0,0 +1,58 @@
+import hashlib
+from datetime import date
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import get_db
+from app.api.deps import get_current_active_user, CurrentUser
+from app.models.user import User
+
+
+async def bump_data_version(db: AsyncSession, user_id: str) -> None:
+    """Mark a user's data as changed; call in the same transaction as the write"""
+    await db.execute(
+        update(User).where(User.user_id == user_id).values(
+            data_version=User.data_version + 1,
+            updated_at=User.updated_at  # a data write is not a profile update
+        ).execution_options(synchronize_session=False)
+    )
+
+
+async def get_data_version(db: AsyncSession, user_id: str) -> int:
+    return await db.scalar(select(User.data_version).where(User.user_id == user_id)) or 0
+
+
+def make_etag(user_id: str, version: int, request: Request) -> str:
+    """Weak validator for one URL's payload at a given data version"""
+    # Payloads also vary with the query string and, for "today" figures, the date
+    raw = f"{user_id}:{version}:{date.today().isoformat()}:{request.url.path}?{request.url.query}"
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
+) -> str:
+    """Dependency for polled GET endpoints.
+
+    Answers 304 Not Modified from the user's data version alone, before the
+    endpoint runs any of its own queries; otherwise sets the ETag header.
+    """
+    etag = make_etag(current_user.user_id, await get_data_version(db, current_user.user_id), request)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return etag
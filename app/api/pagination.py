@@ -0,0 +1,87 @@
+import base64
+import json
+from datetime import date, datetime, time
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Largest page a client may ask for; bigger requests get a 422
+MAX_PAGE_SIZE = 500
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    python_type = column.type.python_type
+    if python_type in (date, datetime, time) and isinstance(value, str):
+        return python_type.fromisoformat(value)
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor"""
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """Decode a cursor produced by encode_cursor for the given sort columns"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def keyset_filter(columns: Sequence, values: Sequence[Any]):
+    """Rows strictly after `values` in ascending `columns` order.
+
+    Spelled out as (a > x) OR (a = x AND b > y) ... rather than a row-value
+    comparison so every backend can drive it from a composite index.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column > values[i]))
+    return or_(*clauses)
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    columns: Sequence,
+    key: Callable[[Any], Sequence[Any]],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    skip: int = 0
+) -> Tuple[list, Optional[str]]:
+    """Fetch one page ordered by `columns` and the cursor for the next one.
+
+    Single-entity selects yield ORM objects, otherwise rows. `key` extracts
+    the sort values from one of those. `skip` is the deprecated offset
+    fallback and is ignored when a cursor is given.
+    """
+    stmt = stmt.order_by(*columns)
+
+    if cursor:
+        stmt = stmt.where(keyset_filter(columns, decode_cursor(cursor, columns)))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.scalars().all() if len(stmt.column_descriptions) == 1 else result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(key(rows[-1]))
+
+    return rows, next_cursor
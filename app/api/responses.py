@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Type
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+__all__ = ["ORJSONResponse", "serialize"]
+
+
+@lru_cache(maxsize=None)
+def _field_names(model: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(model.__fields__)
+
+
+def serialize(model: Type[BaseModel], obj: Any, **values: Any) -> Dict[str, Any]:
+    """Read the fields a response model declares off an ORM object.
+
+    Keyword arguments supply fields the object does not carry. Nothing is
+    validated or converted: dates, times and enums go to orjson as they are,
+    which encodes them natively. Endpoints return the result in an
+    ORJSONResponse so FastAPI skips its jsonable_encoder pass.
+
+    A returned Response bypasses the route's response_model entirely, so
+    the model only picks the fields and documents the shape; it is never
+    applied at runtime. tests/test_response_models.py validates every typed
+    route's payload against its model instead.
+    """
+    row = {name: getattr(obj, name) for name in _field_names(model) if name not in values}
+    row.update(values)
+    return row
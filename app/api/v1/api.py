@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import auth, task_lists, tasks, time_blocks, dashboard, subscription
+from app.api.v1.endpoints import auth, task_lists, tasks, time_blocks, dashboard, subscription, admin
 
 api_router = APIRouter()
 
@@ -9,4 +9,5 @@ api_router.include_router(task_lists.router, prefix="/task-lists", tags=["Task L
 api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
 api_router.include_router(time_blocks.router, prefix="/time-blocks", tags=["Time Blocks"])
 api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
-api_router.include_router(subscription.router, prefix="/subscription", tags=["Subscription"])
\ No newline at end of file
+api_router.include_router(subscription.router, prefix="/subscription", tags=["Subscription"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"])
\ No newline at end of file
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+from app.api.deps import get_current_admin, CurrentUser
+from app.db.slow_queries import slow_query_log
+
+router = APIRouter()
+
+
+@router.get("/slow-queries", response_model=dict)
+async def get_slow_queries(current_user: CurrentUser = Depends(get_current_admin)):
+    """Slow statement shapes seen by this process, most total time first"""
+    return {
+        "threshold_ms": slow_query_log.threshold * 1e3,
+        "explain_interval_seconds": slow_query_log.explain_interval,
+        "slow_queries": slow_query_log.report()
+    }
+
+
+@router.delete("/slow-queries", response_model=dict)
+async def clear_slow_queries(current_user: CurrentUser = Depends(get_current_admin)):
+    """Forget every recorded slow statement"""
+    slow_query_log.clear()
+    return {"message": "Slow query log cleared"}
@@ -1,38 +1,68 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import (
+    create_access_token,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
+    PasswordHasherBusy
+)
 from app.db.database import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse
 from app.schemas.token import Token
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, CurrentUser
 
 router = APIRouter()
 
 
+def _password_hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/signup", response_model=dict)
-def signup(user_in: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
+    # The superuser account is seeded, never registered
+    if user_in.email.lower() == settings.FIRST_SUPERUSER_EMAIL.lower():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_in.email).first()
+    existing_user = (await db.execute(select(User).where(User.email == user_in.email))).scalars().first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # bcrypt runs on the dedicated hashing pool, not a request thread
+    try:
+        password_hash = await hash_password_async(user_in.password)
+    except PasswordHasherBusy:
+        raise _password_hasher_busy()
+    
     # Create new user
     user = User(
         email=user_in.email,
         name=user_in.name,
-        password_hash=get_password_hash(user_in.password)
+        password_hash=password_hash
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.flush()
+    db.info["user_id"] = user.user_id  # first reads after signup come from the primary
+    await db.commit()
+    await db.refresh(user)
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -54,12 +84,26 @@ def signup(user_in: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=dict)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_db)):
     """Login user"""
     # Find user by email
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    user = (await db.execute(select(User).where(User.email == user_credentials.email))).scalars().first()
+    
+    try:
+        valid = bool(user) and await verify_password_async(user_credentials.password, user.password_hash)
+    except PasswordHasherBusy:
+        raise _password_hasher_busy()
+    
+    # Bring the stored hash up to the calibrated cost while we have the plaintext;
+    # optional work, so a busy hashing pool skips it rather than failing the login
+    if valid and password_needs_rehash(user.password_hash):
+        try:
+            user.password_hash = await hash_password_async(user_credentials.password)
+            await db.commit()
+        except PasswordHasherBusy:
+            pass
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -85,9 +129,9 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=dict)
-def get_current_user_info(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+async def get_current_user_info(
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get current user information"""
     return {
@@ -1,75 +1,40 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from datetime import date, datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
 from app.db.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
-from app.models.task_list import TaskList, TaskListStatus
-from app.models.task import Task
-from app.models.time_block import TimeBlock, TimeBlockStatus
+from app.api.deps import get_current_active_user, CurrentUser
+from app.api.etag import conditional_get
+from app.api.responses import ORJSONResponse
+from app.schemas.dashboard import DashboardStats
+from app.services.stats import get_dashboard_counters
 
 router = APIRouter()
 
 
-@router.get("/stats", response_model=dict)
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+@router.get("/stats", response_model=DashboardStats)
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    etag: str = Depends(conditional_get)
 ):
     """Get dashboard statistics for current user"""
+    counters = await get_dashboard_counters(db, current_user.user_id, date.today())
     
-    # Task Lists Stats
-    total_task_lists = db.query(TaskList).filter(
-        TaskList.user_id == current_user.user_id
-    ).count()
-    
-    completed_task_lists = db.query(TaskList).filter(
-        TaskList.user_id == current_user.user_id,
-        TaskList.status == TaskListStatus.COMPLETED
-    ).count()
-    
-    # Tasks Stats
-    total_tasks = db.query(Task).join(TaskList).filter(
-        TaskList.user_id == current_user.user_id
-    ).count()
-    
-    completed_tasks = db.query(Task).join(TaskList).filter(
-        TaskList.user_id == current_user.user_id,
-        Task.is_completed == True
-    ).count()
-    
-    # Today's Time Blocks
-    today = date.today()
-    today_time_blocks = db.query(TimeBlock).filter(
-        TimeBlock.user_id == current_user.user_id,
-        TimeBlock.date == today
-    ).count()
-    
-    completed_time_blocks = db.query(TimeBlock).filter(
-        TimeBlock.user_id == current_user.user_id,
-        TimeBlock.date == today,
-        TimeBlock.status == TimeBlockStatus.COMPLETED
-    ).count()
-    
-    missed_time_blocks = db.query(TimeBlock).filter(
-        TimeBlock.user_id == current_user.user_id,
-        TimeBlock.date == today,
-        TimeBlock.status == TimeBlockStatus.MISSED
-    ).count()
+    total_tasks = counters["total_tasks"]
+    completed_tasks = counters["completed_tasks"]
     
     # Calculate overall completion percentage
     overall_completion = 0.0
     if total_tasks > 0:
         overall_completion = (completed_tasks / total_tasks) * 100
     
-    return {
-        "total_task_lists": total_task_lists,
-        "completed_task_lists": completed_task_lists,
+    return ORJSONResponse({
+        "total_task_lists": counters["total_task_lists"],
+        "completed_task_lists": counters["completed_task_lists"],
         "total_tasks": total_tasks,
         "completed_tasks": completed_tasks,
-        "today_time_blocks": today_time_blocks,
-        "completed_time_blocks": completed_time_blocks,
-        "missed_time_blocks": missed_time_blocks,
+        "today_time_blocks": counters["total_time_blocks"],
+        "completed_time_blocks": counters["completed_time_blocks"],
+        "missed_time_blocks": counters["missed_time_blocks"],
         "overall_completion": round(overall_completion, 2)
-    }
\ No newline at end of file
+    }, headers={"ETag": etag})
\ No newline at end of file
@@ -1,9 +1,13 @@
+from typing import Tuple
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 import uuid
 from app.db.database import get_db
-from app.api.deps import get_current_active_user
+from app.api.deps import get_current_active_user, CurrentUser, invalidate_principal
+from app.api.etag import bump_data_version
 from app.models.user import User, SubscriptionTier
 from app.models.subscription import Subscription, SubscriptionStatus
 from app.schemas.subscription import (
@@ -19,16 +23,16 @@ router = APIRouter()
 
 
 @router.get("/status", response_model=dict)
-def get_subscription_status(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_subscription_status(
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Get current subscription status"""
     
     # Get latest subscription
-    latest_subscription = db.query(Subscription).filter(
+    latest_subscription = (await db.execute(select(Subscription).where(
         Subscription.user_id == current_user.user_id
-    ).order_by(Subscription.created_at.desc()).first()
+    ).order_by(Subscription.created_at.desc()).limit(1))).scalars().first()
     
     is_active = False
     if current_user.subscription_tier != SubscriptionTier.FREE:
@@ -59,8 +63,8 @@ def get_subscription_status(
 @router.post("/initialize", response_model=dict)
 async def initialize_payment(
     subscription_in: SubscriptionInitialize,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Initialize Paystack payment for subscription"""
     
@@ -94,17 +98,52 @@ async def initialize_payment(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _tier_for_amount(amount: float) -> Tuple[SubscriptionTier, int]:
+    """Subscription tier and duration in days paid for by an amount in naira"""
+    if amount >= 29000:  # Yearly
+        return SubscriptionTier.YEARLY, 365
+    return SubscriptionTier.MONTHLY, 30  # Monthly
+
+
+def _already_activated(subscription: Subscription, current_user: CurrentUser) -> dict:
+    """Answer a repeated verification from the subscription it already created"""
+    if subscription.user_id != current_user.user_id:
+        raise HTTPException(status_code=400, detail="Payment reference belongs to another account")
+    
+    tier, _ = _tier_for_amount(float(subscription.amount))
+    return {
+        "success": True,
+        "message": "Subscription already activated",
+        "subscription": {
+            "subscription_id": subscription.subscription_id,
+            "tier": tier.value,
+            "expires_at": subscription.expires_at
+        }
+    }
+
+
+async def _get_by_reference(db: AsyncSession, reference: str):
+    return (await db.execute(select(Subscription).where(
+        Subscription.paystack_reference == reference
+    ))).scalars().first()
+
+
 @router.post("/verify", response_model=dict)
 async def verify_payment(
     verification: SubscriptionVerify,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Verify Paystack payment and activate subscription"""
     
+    # Retries of an activated reference are answered without calling Paystack
+    existing = await _get_by_reference(db, verification.reference)
+    if existing:
+        return _already_activated(existing, current_user)
+    
     try:
-        # Verify transaction with Paystack
-        response = await paystack_service.verify_transaction(verification.reference)
+        # Verify transaction with Paystack (concurrent calls share one request)
+        response = await paystack_service.verify_transaction_once(verification.reference)
         
         if not response.get("status"):
             raise HTTPException(status_code=400, detail="Payment verification failed")
@@ -116,32 +155,35 @@ async def verify_payment(
         
         # Determine subscription tier and duration
         amount = data["amount"] / 100  # Convert from kobo to naira
-        
-        if amount >= 29000:  # Yearly
-            tier = SubscriptionTier.YEARLY
-            duration_days = 365
-        else:  # Monthly
-            tier = SubscriptionTier.MONTHLY
-            duration_days = 30
+        tier, duration_days = _tier_for_amount(amount)
         
         # Update user subscription
-        current_user.subscription_tier = tier
-        current_user.subscription_expires_at = datetime.utcnow() + timedelta(days=duration_days)
+        user = await db.get(User, current_user.user_id)
+        user.subscription_tier = tier
+        user.subscription_expires_at = datetime.utcnow() + timedelta(days=duration_days)
         
         # Create subscription record
         subscription = Subscription(
-            user_id=current_user.user_id,
+            user_id=user.user_id,
             paystack_reference=verification.reference,
             amount=amount,
             currency=data["currency"],
             status=SubscriptionStatus.ACTIVE,
             started_at=datetime.utcnow(),
-            expires_at=current_user.subscription_expires_at
+            expires_at=user.subscription_expires_at
         )
         
         db.add(subscription)
-        db.commit()
-        db.refresh(subscription)
+        try:
+            await bump_data_version(db, current_user.user_id)
+            await db.commit()
+        except IntegrityError:
+            # Another request activated this reference first
+            await db.rollback()
+            return _already_activated(await _get_by_reference(db, verification.reference), current_user)
+        
+        await db.refresh(subscription)
+        invalidate_principal(user.user_id)
         
         return {
             "success": True,
@@ -153,15 +195,17 @@ async def verify_payment(
             }
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("/cancel", response_model=dict)
-def cancel_subscription(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def cancel_subscription(
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Cancel current subscription"""
     
@@ -169,18 +213,21 @@ def cancel_subscription(
         raise HTTPException(status_code=400, detail="No active subscription to cancel")
     
     # Get latest subscription
-    latest_subscription = db.query(Subscription).filter(
+    latest_subscription = (await db.execute(select(Subscription).where(
         Subscription.user_id == current_user.user_id
-    ).order_by(Subscription.created_at.desc()).first()
+    ).order_by(Subscription.created_at.desc()).limit(1))).scalars().first()
     
     if latest_subscription:
         latest_subscription.status = SubscriptionStatus.CANCELLED
     
     # Set user back to free tier
-    current_user.subscription_tier = SubscriptionTier.FREE
-    current_user.subscription_expires_at = None
+    user = await db.get(User, current_user.user_id)
+    user.subscription_tier = SubscriptionTier.FREE
+    user.subscription_expires_at = None
     
-    db.commit()
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    invalidate_principal(user.user_id)
     
     return {
         "success": True,
@@ -1,22 +1,40 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Dict, List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy import select, update, delete, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
-from app.models.task_list import TaskList
+from app.api.deps import get_current_active_user, CurrentUser
+from app.api.etag import bump_data_version, conditional_get
+from app.api.pagination import paginate, MAX_PAGE_SIZE
+from app.api.responses import ORJSONResponse, serialize
+from app.core.response_cache import response_cache, task_list_tag, task_lists_tag, time_blocks_tag
+from app.models.task_list import TaskList, TaskListStatus
 from app.models.task import Task
-from app.schemas.task_list import TaskListCreate, TaskListUpdate, TaskListResponse
+from app.models.time_block import TimeBlock
+from app.schemas.task_list import TaskListCreate, TaskListUpdate, TaskListResponse, TaskListPage, TaskListDetail
+from app.schemas.task import TaskResponse, TaskPage
+from app.services.stats import adjust_user_stats
 
 router = APIRouter()
 
 
+async def _task_counts(db: AsyncSession, task_list_ids: List[str]) -> Dict[str, Tuple[int, int]]:
+    """(total, completed) tasks per list in one grouped query; lists without tasks are absent"""
+    if not task_list_ids:
+        return {}
+    rows = (await db.execute(select(
+        Task.task_list_id,
+        func.count(Task.task_id),
+        func.coalesce(func.sum(case((Task.is_completed == True, 1), else_=0)), 0)
+    ).where(Task.task_list_id.in_(task_list_ids)).group_by(Task.task_list_id))).all()
+    return {task_list_id: (int(total), int(completed)) for task_list_id, total, completed in rows}
+
+
 @router.post("", response_model=dict)
-def create_task_list(
+async def create_task_list(
     task_list_in: TaskListCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Create a new task list"""
     task_list = TaskList(
@@ -28,8 +46,12 @@ def create_task_list(
     )
     
     db.add(task_list)
-    db.commit()
-    db.refresh(task_list)
+    await db.flush()
+    await adjust_user_stats(db, current_user.user_id, total_task_lists=1)
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(task_lists_tag(current_user.user_id))
+    await db.refresh(task_list)
     
     return {
         "message": "Task list created successfully",
@@ -49,158 +71,210 @@ def create_task_list(
     }
 
 
-@router.get("", response_model=dict)
-def get_task_lists(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    skip: int = 0,
-    limit: int = 100
+@router.get("", response_model=TaskListPage)
+async def get_task_lists(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    etag: str = Depends(conditional_get),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)
 ):
-    """Get all task lists for current user"""
-    task_lists = db.query(TaskList).filter(
-        TaskList.user_id == current_user.user_id
-    ).offset(skip).limit(limit).all()
-    
-    # Add task counts
-    result = []
-    for task_list in task_lists:
-        total_tasks = db.query(Task).filter(Task.task_list_id == task_list.task_list_id).count()
-        completed_tasks = db.query(Task).filter(
-            Task.task_list_id == task_list.task_list_id,
-            Task.is_completed == True
-        ).count()
+    """Get all task lists for current user, oldest first"""
+    async def build():
+        task_lists, next_cursor = await paginate(
+            db,
+            select(TaskList).where(TaskList.user_id == current_user.user_id),
+            [TaskList.created_at, TaskList.task_list_id],
+            key=lambda tl: (tl.created_at, tl.task_list_id),
+            cursor=cursor,
+            limit=limit,
+            skip=skip
+        )
         
-        result.append({
-            "task_list_id": task_list.task_list_id,
-            "user_id": task_list.user_id,
-            "title": task_list.title,
-            "duration_type": task_list.duration_type,
-            "start_date": task_list.start_date,
-            "end_date": task_list.end_date,
-            "status": task_list.status.value,
-            "created_at": task_list.created_at,
-            "completed_at": task_list.completed_at,
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks
-        })
+        counts = await _task_counts(db, [task_list.task_list_id for task_list in task_lists])
+        result = []
+        for task_list in task_lists:
+            total_tasks, completed_tasks = counts.get(task_list.task_list_id, (0, 0))
+            result.append(serialize(
+                TaskListResponse,
+                task_list,
+                total_tasks=total_tasks,
+                completed_tasks=completed_tasks
+            ))
+        return {"task_lists": result, "next_cursor": next_cursor}
     
-    return {"task_lists": result}
+    return await response_cache.respond(
+        request, current_user.user_id, [task_lists_tag(current_user.user_id)], build, db, etag=etag
+    )
 
 
-@router.get("/{task_list_id}", response_model=dict)
-def get_task_list(
+@router.get("/{task_list_id}", response_model=TaskListDetail)
+async def get_task_list(
     task_list_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Get a specific task list"""
-    task_list = db.query(TaskList).filter(
-        TaskList.task_list_id == task_list_id,
-        TaskList.user_id == current_user.user_id
-    ).first()
-    
-    if not task_list:
-        raise HTTPException(status_code=404, detail="Task list not found")
-    
-    total_tasks = db.query(Task).filter(Task.task_list_id == task_list.task_list_id).count()
-    completed_tasks = db.query(Task).filter(
-        Task.task_list_id == task_list.task_list_id,
-        Task.is_completed == True
-    ).count()
-    
-    return {
-        "task_list": {
-            "task_list_id": task_list.task_list_id,
-            "user_id": task_list.user_id,
-            "title": task_list.title,
-            "duration_type": task_list.duration_type,
-            "start_date": task_list.start_date,
-            "end_date": task_list.end_date,
-            "status": task_list.status.value,
-            "created_at": task_list.created_at,
-            "completed_at": task_list.completed_at,
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks
+    async def build():
+        task_list = (await db.execute(select(TaskList).where(
+            TaskList.task_list_id == task_list_id,
+            TaskList.user_id == current_user.user_id
+        ))).scalars().first()
+        
+        if not task_list:
+            raise HTTPException(status_code=404, detail="Task list not found")
+        
+        total_tasks, completed_tasks = (await _task_counts(db, [task_list.task_list_id])).get(
+            task_list.task_list_id, (0, 0)
+        )
+        
+        return {
+            "task_list": serialize(
+                TaskListResponse,
+                task_list,
+                total_tasks=total_tasks,
+                completed_tasks=completed_tasks
+            )
         }
-    }
+    
+    # Entries are per user, so only an owner's build can ever be served
+    return await response_cache.respond(request, current_user.user_id, [task_list_tag(task_list_id)], build, db)
 
 
 @router.put("/{task_list_id}", response_model=dict)
-def update_task_list(
+async def update_task_list(
     task_list_id: str,
     task_list_in: TaskListUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Update a task list"""
-    task_list = db.query(TaskList).filter(
+    task_list = (await db.execute(select(TaskList).where(
         TaskList.task_list_id == task_list_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task_list:
         raise HTTPException(status_code=404, detail="Task list not found")
     
+    was_completed = task_list.status == TaskListStatus.COMPLETED
+    
     update_data = task_list_in.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task_list, field, value)
     
-    db.commit()
-    db.refresh(task_list)
+    await db.flush()
+    is_completed = task_list.status == TaskListStatus.COMPLETED
+    await adjust_user_stats(
+        db,
+        current_user.user_id,
+        completed_task_lists=int(is_completed) - int(was_completed)
+    )
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(task_lists_tag(current_user.user_id), task_list_tag(task_list_id))
+    await db.refresh(task_list)
     
     return {"message": "Task list updated successfully"}
 
 
 @router.delete("/{task_list_id}", response_model=dict)
-def delete_task_list(
+async def delete_task_list(
     task_list_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Delete a task list"""
-    task_list = db.query(TaskList).filter(
+    task_list = (await db.execute(select(TaskList).where(
         TaskList.task_list_id == task_list_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task_list:
         raise HTTPException(status_code=404, detail="Task list not found")
     
-    db.delete(task_list)
-    db.commit()
+    # Tasks go with the list, so their counters go too
+    total_tasks, completed_tasks = (await _task_counts(db, [task_list.task_list_id])).get(
+        task_list.task_list_id, (0, 0)
+    )
+    was_completed = task_list.status == TaskListStatus.COMPLETED
+    
+    # Set-based, as the foreign keys would do it: the ORM cascade loads every
+    # task and then each task's time blocks one query at a time
+    task_ids = select(Task.task_id).where(Task.task_list_id == task_list.task_list_id)
+    await db.execute(
+        update(TimeBlock).where(TimeBlock.task_id.in_(task_ids)).values(task_id=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.execute(
+        delete(Task).where(Task.task_list_id == task_list.task_list_id).execution_options(synchronize_session=False)
+    )
+    await db.execute(delete(TaskList).where(TaskList.task_list_id == task_list.task_list_id))
+    await adjust_user_stats(
+        db,
+        current_user.user_id,
+        total_task_lists=-1,
+        completed_task_lists=-int(was_completed),
+        total_tasks=-int(total_tasks),
+        completed_tasks=-int(completed_tasks)
+    )
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    # The list's tasks go too, and with them the titles shown on their time blocks
+    await response_cache.invalidate(
+        task_lists_tag(current_user.user_id),
+        task_list_tag(task_list_id),
+        *([time_blocks_tag(current_user.user_id)] if total_tasks else [])
+    )
     
     return {"message": "Task list deleted successfully"}
 
 
-@router.get("/{task_list_id}/tasks", response_model=dict)
-def get_tasks_for_list(
+@router.get("/{task_list_id}/tasks", response_model=TaskPage)
+async def get_tasks_for_list(
     task_list_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    etag: str = Depends(conditional_get),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE)
 ):
     """Get all tasks for a specific task list"""
-    # Verify task list belongs to user
-    task_list = db.query(TaskList).filter(
-        TaskList.task_list_id == task_list_id,
-        TaskList.user_id == current_user.user_id
-    ).first()
-    
-    if not task_list:
-        raise HTTPException(status_code=404, detail="Task list not found")
-    
-    tasks = db.query(Task).filter(Task.task_list_id == task_list_id).order_by(Task.order_index).all()
+    async def build():
+        # Verify task list belongs to user
+        task_list = (await db.execute(select(TaskList).where(
+            TaskList.task_list_id == task_list_id,
+            TaskList.user_id == current_user.user_id
+        ))).scalars().first()
+        
+        if not task_list:
+            raise HTTPException(status_code=404, detail="Task list not found")
+        
+        query = select(Task).where(Task.task_list_id == task_list_id)
+        
+        # Unpaged unless the client asks for a page size or passes a cursor
+        next_cursor = None
+        if cursor or limit:
+            tasks, next_cursor = await paginate(
+                db,
+                query,
+                [Task.order_index, Task.task_id],
+                key=lambda task: (task.order_index, task.task_id),
+                cursor=cursor,
+                limit=limit or 100
+            )
+        else:
+            tasks = (await db.execute(query.order_by(Task.order_index, Task.task_id))).scalars().all()
+        
+        return {
+            "tasks": [serialize(TaskResponse, task) for task in tasks],
+            "next_cursor": next_cursor
+        }
     
-    return {
-        "tasks": [
-            {
-                "task_id": task.task_id,
-                "task_list_id": task.task_list_id,
-                "title": task.title,
-                "is_completed": task.is_completed,
-                "completed_at": task.completed_at,
-                "order_index": task.order_index,
-                "created_at": task.created_at
-            }
-            for task in tasks
-        ]
-    }
\ No newline at end of file
+    return await response_cache.respond(
+        request, current_user.user_id, [task_list_tag(task_list_id)], build, db, etag=etag
+    )
\ No newline at end of file
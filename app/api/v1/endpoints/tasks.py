@@ -1,37 +1,50 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import uuid
 from app.db.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
+from app.api.deps import get_current_active_user, CurrentUser
+from app.api.etag import bump_data_version
+from app.api.responses import ORJSONResponse, serialize
+from app.core.response_cache import response_cache, task_list_tag, task_lists_tag, time_blocks_tag
 from app.models.task_list import TaskList
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import (
+    TaskCreate,
+    TaskBulkCreate,
+    TaskUpdate,
+    TaskBulkUpdate,
+    TaskResponse,
+    TaskDetail,
+    TaskBulkCreated
+)
+from app.services.stats import adjust_user_stats
 
 router = APIRouter()
 
 
 @router.post("", response_model=dict)
-def create_task(
+async def create_task(
     task_in: TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Create a new task"""
     # Verify task list belongs to user
-    task_list = db.query(TaskList).filter(
+    task_list = (await db.execute(select(TaskList).where(
         TaskList.task_list_id == task_in.task_list_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task_list:
         raise HTTPException(status_code=404, detail="Task list not found")
     
     # Get next order index
-    max_order = db.query(Task).filter(
+    max_order = await db.scalar(select(func.count(Task.task_id)).where(
         Task.task_list_id == task_in.task_list_id
-    ).count()
+    ))
     
     task = Task(
         task_list_id=task_in.task_list_id,
@@ -40,8 +53,12 @@ def create_task(
     )
     
     db.add(task)
-    db.commit()
-    db.refresh(task)
+    await db.flush()
+    await adjust_user_stats(db, current_user.user_id, total_tasks=1)
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(task_list_tag(task_in.task_list_id), task_lists_tag(current_user.user_id))
+    await db.refresh(task)
     
     return {
         "message": "Task created successfully",
@@ -57,71 +74,189 @@ def create_task(
     }
 
 
-@router.get("/{task_id}", response_model=dict)
-def get_task(
+@router.post("/bulk", response_model=TaskBulkCreated)
+async def create_tasks_bulk(
+    tasks_in: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
+):
+    """Create many tasks in one list with a single multi-row insert"""
+    # Verify task list belongs to user
+    task_list = (await db.execute(select(TaskList.task_list_id).where(
+        TaskList.task_list_id == tasks_in.task_list_id,
+        TaskList.user_id == current_user.user_id
+    ))).first()
+    
+    if not task_list:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    
+    # New tasks go after the current last one, in request order
+    max_order = await db.scalar(select(func.max(Task.order_index)).where(
+        Task.task_list_id == tasks_in.task_list_id
+    ))
+    first_index = 0 if max_order is None else max_order + 1
+    
+    now = datetime.utcnow()
+    rows = [
+        {
+            "task_id": str(uuid.uuid4()),
+            "task_list_id": tasks_in.task_list_id,
+            "title": title,
+            "is_completed": False,
+            "completed_at": None,
+            "order_index": first_index + offset,
+            "created_at": now
+        }
+        for offset, title in enumerate(tasks_in.titles)
+    ]
+    
+    await db.execute(insert(Task).values(rows))
+    await adjust_user_stats(db, current_user.user_id, total_tasks=len(rows))
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(task_list_tag(tasks_in.task_list_id), task_lists_tag(current_user.user_id))
+    
+    return ORJSONResponse({
+        "message": f"{len(rows)} tasks created successfully",
+        "tasks": rows
+    })
+
+
+@router.patch("/bulk", response_model=dict)
+async def update_tasks_bulk(
+    tasks_in: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
+):
+    """Complete, uncomplete or rename many tasks with one UPDATE statement"""
+    if (tasks_in.task_ids is None) == (tasks_in.task_list_id is None):
+        raise HTTPException(status_code=400, detail="Provide either task_ids or task_list_id")
+    
+    # Only tasks in the user's own lists can match
+    owned_lists = select(TaskList.task_list_id).where(TaskList.user_id == current_user.user_id)
+    filters = [Task.task_list_id.in_(owned_lists)]
+    if tasks_in.task_ids is not None:
+        filters.append(Task.task_id.in_(tasks_in.task_ids))
+    else:
+        filters.append(Task.task_list_id == tasks_in.task_list_id)
+    
+    if tasks_in.action == "complete":
+        # Already completed tasks keep their original completed_at
+        filters.append(Task.is_completed == False)
+        values = {"is_completed": True, "completed_at": datetime.utcnow()}
+        completed_delta = 1
+    elif tasks_in.action == "uncomplete":
+        filters.append(Task.is_completed == True)
+        values = {"is_completed": False, "completed_at": None}
+        completed_delta = -1
+    elif tasks_in.action == "rename":
+        if not tasks_in.title:
+            raise HTTPException(status_code=400, detail="Title is required to rename tasks")
+        values = {"title": tasks_in.title}
+        completed_delta = 0
+    else:
+        raise HTTPException(status_code=400, detail="Invalid action")
+    
+    # Lists whose cached reads the update can change
+    if tasks_in.task_ids is not None:
+        task_list_ids = (await db.execute(
+            select(Task.task_list_id).where(*filters[:2]).distinct()
+        )).scalars().all()
+    else:
+        task_list_ids = [tasks_in.task_list_id]
+    
+    result = await db.execute(
+        update(Task).where(*filters).values(**values).execution_options(synchronize_session=False)
+    )
+    updated = result.rowcount
+    
+    await adjust_user_stats(db, current_user.user_id, completed_tasks=completed_delta * updated)
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    if updated:
+        await response_cache.invalidate(
+            *map(task_list_tag, task_list_ids),
+            task_lists_tag(current_user.user_id),
+            *([time_blocks_tag(current_user.user_id)] if tasks_in.action == "rename" else [])
+        )
+    
+    return {
+        "message": "Tasks updated successfully",
+        "updated": updated
+    }
+
+
+@router.get("/{task_id}", response_model=TaskDetail)
+async def get_task(
     task_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Get a specific task"""
-    task = db.query(Task).join(TaskList).filter(
+    task = (await db.execute(select(Task).join(TaskList).where(
         Task.task_id == task_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    return {
-        "task": {
-            "task_id": task.task_id,
-            "task_list_id": task.task_list_id,
-            "title": task.title,
-            "is_completed": task.is_completed,
-            "completed_at": task.completed_at,
-            "order_index": task.order_index,
-            "created_at": task.created_at
-        }
-    }
+    return ORJSONResponse({"task": serialize(TaskResponse, task)})
 
 
 @router.put("/{task_id}", response_model=dict)
-def update_task(
+async def update_task(
     task_id: str,
     task_in: TaskUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Update a task"""
-    task = db.query(Task).join(TaskList).filter(
+    task = (await db.execute(select(Task).join(TaskList).where(
         Task.task_id == task_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    was_completed = task.is_completed
+    
     update_data = task_in.dict(exclude_unset=True)
+    renamed = update_data.get("title", task.title) != task.title
     for field, value in update_data.items():
         setattr(task, field, value)
     
-    db.commit()
-    db.refresh(task)
+    await db.flush()
+    await adjust_user_stats(
+        db,
+        current_user.user_id,
+        completed_tasks=int(bool(task.is_completed)) - int(bool(was_completed))
+    )
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    # Time blocks show the task's title
+    await response_cache.invalidate(
+        task_list_tag(task.task_list_id),
+        task_lists_tag(current_user.user_id),
+        *([time_blocks_tag(current_user.user_id)] if renamed else [])
+    )
+    await db.refresh(task)
     
     return {"message": "Task updated successfully"}
 
 
 @router.patch("/{task_id}/toggle", response_model=dict)
-def toggle_task_completion(
+async def toggle_task_completion(
     task_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Toggle task completion status"""
-    task = db.query(Task).join(TaskList).filter(
+    task = (await db.execute(select(Task).join(TaskList).where(
         Task.task_id == task_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
@@ -129,8 +264,12 @@ def toggle_task_completion(
     task.is_completed = not task.is_completed
     task.completed_at = datetime.utcnow() if task.is_completed else None
     
-    db.commit()
-    db.refresh(task)
+    await db.flush()
+    await adjust_user_stats(db, current_user.user_id, completed_tasks=1 if task.is_completed else -1)
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(task_list_tag(task.task_list_id), task_lists_tag(current_user.user_id))
+    await db.refresh(task)
     
     return {
         "message": "Task status updated",
@@ -143,21 +282,37 @@ def toggle_task_completion(
 
 
 @router.delete("/{task_id}", response_model=dict)
-def delete_task(
+async def delete_task(
     task_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Delete a task"""
-    task = db.query(Task).join(TaskList).filter(
+    task = (await db.execute(select(Task).join(TaskList).where(
         Task.task_id == task_id,
         TaskList.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db.delete(task)
-    db.commit()
+    was_completed, task_list_id = task.is_completed, task.task_list_id
+    
+    await db.delete(task)
+    await db.flush()
+    await adjust_user_stats(
+        db,
+        current_user.user_id,
+        total_tasks=-1,
+        completed_tasks=-int(bool(was_completed))
+    )
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    # Time blocks scheduled for the task lose its title
+    await response_cache.invalidate(
+        task_list_tag(task_list_id),
+        task_lists_tag(current_user.user_id),
+        time_blocks_tag(current_user.user_id)
+    )
     
     return {"message": "Task deleted successfully"}
\ No newline at end of file
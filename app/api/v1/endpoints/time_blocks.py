@@ -1,33 +1,107 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from datetime import datetime, date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, date, time, timedelta
+from collections import Counter
+import uuid
 from app.db.database import get_db
-from app.api.deps import get_current_active_user
-from app.models.user import User
-from app.models.time_block import TimeBlock
+from app.api.deps import get_current_active_user, CurrentUser
+from app.api.etag import bump_data_version, conditional_get
+from app.api.pagination import paginate, MAX_PAGE_SIZE
+from app.api.responses import ORJSONResponse, serialize
+from app.core.response_cache import response_cache, time_blocks_tag
+from app.models.time_block import TimeBlock, TimeBlockStatus
 from app.models.task import Task
-from app.schemas.time_block import TimeBlockCreate, TimeBlockUpdate, TimeBlockResponse
+from app.models.task_list import TaskList
+from app.schemas.time_block import (
+    TimeBlockCreate,
+    TimeBlockTemplateImport,
+    TimeBlockUpdate,
+    TimeBlockResponse,
+    TimeBlockPage,
+    TimeBlockDetail,
+    TimeBlockTemplateCreated,
+    TimeBlockConflicts
+)
+from app.services.scheduling import (
+    find_overlapping_blocks,
+    find_blocks_in_range,
+    find_conflicts_in_range,
+    overlapping_pairs
+)
+from app.services.stats import adjust_day_stats, add_day_time_blocks, time_block_status_deltas
 
 router = APIRouter()
 
+# Upper bounds for one template import
+MAX_TEMPLATE_DAYS = 366
+MAX_TEMPLATE_BLOCKS = 2000
+
+
+def _interval_json(interval) -> dict:
+    time_block_id, day, start_time, end_time = interval
+    return {
+        "time_block_id": time_block_id,
+        "date": day.isoformat(),
+        "start_time": str(start_time),
+        "end_time": str(end_time)
+    }
+
+
+async def _check_overlap(
+    db: AsyncSession,
+    user_id: str,
+    day: date,
+    start_time: time,
+    end_time: time,
+    allow_overlap: bool,
+    exclude_id: Optional[str] = None
+) -> List[dict]:
+    """Reject a slot that overlaps other blocks unless overlaps are allowed; returns the overlaps"""
+    if end_time <= start_time:
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    
+    conflicts = await find_overlapping_blocks(db, user_id, day, start_time, end_time, exclude_id)
+    if conflicts and not allow_overlap:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Time block overlaps existing blocks",
+                "conflicts": [_interval_json(conflict) for conflict in conflicts]
+            }
+        )
+    return [_interval_json(conflict) for conflict in conflicts]
+
 
 @router.post("", response_model=dict)
-def create_time_block(
+async def create_time_block(
     time_block_in: TimeBlockCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Create a new time block"""
     # Verify task belongs to user if task_id is provided
+    task_title = None
     if time_block_in.task_id:
-        task = db.query(Task).join(Task.task_list).filter(
+        task = (await db.execute(select(Task).join(Task.task_list).where(
             Task.task_id == time_block_in.task_id,
             Task.task_list.has(user_id=current_user.user_id)
-        ).first()
+        ))).scalars().first()
         
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
+        
+        task_title = task.title
+    
+    conflicts = await _check_overlap(
+        db,
+        current_user.user_id,
+        time_block_in.date,
+        time_block_in.start_time,
+        time_block_in.end_time,
+        time_block_in.allow_overlap
+    )
     
     time_block = TimeBlock(
         user_id=current_user.user_id,
@@ -39,14 +113,18 @@ def create_time_block(
     )
     
     db.add(time_block)
-    db.commit()
-    db.refresh(time_block)
-    
-    # Get task title if exists
-    task_title = None
-    if time_block.task_id:
-        task = db.query(Task).filter(Task.task_id == time_block.task_id).first()
-        task_title = task.title if task else None
+    await db.flush()
+    await adjust_day_stats(
+        db,
+        current_user.user_id,
+        time_block.date,
+        total_time_blocks=1,
+        **time_block_status_deltas(time_block.status)
+    )
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(time_blocks_tag(current_user.user_id))
+    await db.refresh(time_block)
     
     return {
         "message": "Time block created successfully",
@@ -62,129 +140,279 @@ def create_time_block(
             "completed_at": time_block.completed_at,
             "created_at": time_block.created_at,
             "task_title": task_title
-        }
+        },
+        "conflicts": conflicts
     }
 
 
-@router.get("", response_model=dict)
-def get_time_blocks(
-    date_filter: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
-    skip: int = 0,
-    limit: int = 100
+@router.post("/template", response_model=TimeBlockTemplateCreated)
+async def import_time_block_template(
+    template_in: TimeBlockTemplateImport,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
-    """Get time blocks for current user, optionally filtered by date"""
-    query = db.query(TimeBlock).filter(TimeBlock.user_id == current_user.user_id)
+    """Create the blocks of a day or week template over a date range in one insert"""
+    is_week = any(entry.weekday is not None for entry in template_in.blocks)
+    if any(entry.weekday is not None and not 0 <= entry.weekday <= 6 for entry in template_in.blocks):
+        raise HTTPException(status_code=400, detail="Weekday must be between 0 (Monday) and 6 (Sunday)")
+    if any(entry.end_time <= entry.start_time for entry in template_in.blocks):
+        raise HTTPException(status_code=400, detail="End time must be after start time")
+    
+    # Without an explicit range a week template fills one week, a day template one day
+    end_date = template_in.end_date or template_in.start_date + timedelta(days=6 if is_week else 0)
+    days = (end_date - template_in.start_date).days + 1
+    if days < 1:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    if days > MAX_TEMPLATE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_TEMPLATE_DAYS} days")
     
-    if date_filter:
-        query = query.filter(TimeBlock.date == date_filter)
+    # Verify every referenced task belongs to user in one query
+    task_ids = {entry.task_id for entry in template_in.blocks if entry.task_id}
+    task_titles = {}
+    if task_ids:
+        task_titles = dict((await db.execute(select(Task.task_id, Task.title).join(TaskList).where(
+            Task.task_id.in_(task_ids),
+            TaskList.user_id == current_user.user_id
+        ))).all())
+        
+        if len(task_titles) != len(task_ids):
+            raise HTTPException(status_code=404, detail="Task not found")
     
-    time_blocks = query.offset(skip).limit(limit).all()
+    now = datetime.utcnow()
+    rows = []
+    for offset in range(days):
+        day = template_in.start_date + timedelta(days=offset)
+        for entry in template_in.blocks:
+            if entry.weekday is not None and entry.weekday != day.weekday():
+                continue
+            rows.append({
+                "time_block_id": str(uuid.uuid4()),
+                "user_id": current_user.user_id,
+                "task_id": entry.task_id,
+                "date": day,
+                "start_time": entry.start_time,
+                "end_time": entry.end_time,
+                "status": TimeBlockStatus.PENDING,
+                "notes": entry.notes,
+                "completed_at": None,
+                "created_at": now
+            })
     
-    result = []
-    for tb in time_blocks:
-        task_title = None
-        if tb.task_id:
-            task = db.query(Task).filter(Task.task_id == tb.task_id).first()
-            task_title = task.title if task else None
+    if len(rows) > MAX_TEMPLATE_BLOCKS:
+        raise HTTPException(status_code=400, detail=f"Template would create more than {MAX_TEMPLATE_BLOCKS} time blocks")
+    
+    # New blocks are checked against the range's existing blocks and each other in one sweep
+    conflicts = []
+    if rows:
+        new_ids = {row["time_block_id"] for row in rows}
+        intervals = await find_blocks_in_range(db, current_user.user_id, template_in.start_date, end_date)
+        intervals.extend((row["time_block_id"], row["date"], row["start_time"], row["end_time"]) for row in rows)
+        intervals.sort(key=lambda interval: (interval[1], interval[2]))
+        conflicts = [
+            {"first": _interval_json(first), "second": _interval_json(second)}
+            for first, second in overlapping_pairs(intervals)
+            if first[0] in new_ids or second[0] in new_ids
+        ]
+        if conflicts and not template_in.allow_overlap:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Template blocks overlap existing or other template blocks", "conflicts": conflicts}
+            )
         
-        result.append({
-            "time_block_id": tb.time_block_id,
-            "user_id": tb.user_id,
-            "task_id": tb.task_id,
-            "date": tb.date,
-            "start_time": str(tb.start_time),
-            "end_time": str(tb.end_time),
-            "status": tb.status.value,
-            "notes": tb.notes,
-            "completed_at": tb.completed_at,
-            "created_at": tb.created_at,
-            "task_title": task_title
-        })
+        await db.execute(insert(TimeBlock).values(rows))
+        await add_day_time_blocks(db, current_user.user_id, Counter(row["date"] for row in rows))
+        await bump_data_version(db, current_user.user_id)
+        await db.commit()
+        await response_cache.invalidate(time_blocks_tag(current_user.user_id))
+    
+    rows.sort(key=lambda row: (row["date"], row["start_time"]))
     
-    return {"time_blocks": result}
+    return ORJSONResponse({
+        "message": f"{len(rows)} time blocks created successfully",
+        "time_blocks": [{**row, "task_title": task_titles.get(row["task_id"])} for row in rows],
+        "conflicts": conflicts
+    })
 
 
-@router.get("/{time_block_id}", response_model=dict)
-def get_time_block(
+@router.get("", response_model=TimeBlockPage)
+async def get_time_blocks(
+    request: Request,
+    date_filter: Optional[date] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user),
+    etag: str = Depends(conditional_get),
+    cursor: Optional[str] = None,
+    skip: int = Query(0, ge=0, deprecated=True),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Get time blocks for current user in calendar order, optionally filtered by date"""
+    async def build():
+        # Task titles come back in the same statement via an outer join
+        query = select(TimeBlock, Task.title).outerjoin(
+            Task, TimeBlock.task_id == Task.task_id
+        ).where(TimeBlock.user_id == current_user.user_id)
+        
+        if date_filter:
+            query = query.where(TimeBlock.date == date_filter)
+        
+        time_blocks, next_cursor = await paginate(
+            db,
+            query,
+            [TimeBlock.date, TimeBlock.start_time, TimeBlock.time_block_id],
+            key=lambda row: (row[0].date, row[0].start_time, row[0].time_block_id),
+            cursor=cursor,
+            limit=limit,
+            skip=skip
+        )
+        
+        result = [serialize(TimeBlockResponse, tb, task_title=task_title) for tb, task_title in time_blocks]
+        return {"time_blocks": result, "next_cursor": next_cursor}
+    
+    return await response_cache.respond(
+        request, current_user.user_id, [time_blocks_tag(current_user.user_id)], build, db, etag=etag
+    )
+
+
+@router.get("/conflicts", response_model=TimeBlockConflicts)
+async def get_time_block_conflicts(
+    start_date: date,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
+):
+    """List every pair of overlapping time blocks between two dates"""
+    end_date = end_date or start_date
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="End date must not be before start date")
+    if (end_date - start_date).days + 1 > MAX_TEMPLATE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range cannot exceed {MAX_TEMPLATE_DAYS} days")
+    
+    pairs = await find_conflicts_in_range(db, current_user.user_id, start_date, end_date)
+    
+    return ORJSONResponse({
+        "conflicts": [
+            {"first": _interval_json(first), "second": _interval_json(second)}
+            for first, second in pairs
+        ]
+    })
+
+
+@router.get("/{time_block_id}", response_model=TimeBlockDetail)
+async def get_time_block(
     time_block_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Get a specific time block"""
-    time_block = db.query(TimeBlock).filter(
+    row = (await db.execute(select(TimeBlock, Task.title).outerjoin(
+        Task, TimeBlock.task_id == Task.task_id
+    ).where(
         TimeBlock.time_block_id == time_block_id,
         TimeBlock.user_id == current_user.user_id
-    ).first()
+    ))).first()
     
-    if not time_block:
+    if not row:
         raise HTTPException(status_code=404, detail="Time block not found")
     
-    task_title = None
-    if time_block.task_id:
-        task = db.query(Task).filter(Task.task_id == time_block.task_id).first()
-        task_title = task.title if task else None
+    time_block, task_title = row
     
-    return {
-        "time_block": {
-            "time_block_id": time_block.time_block_id,
-            "user_id": time_block.user_id,
-            "task_id": time_block.task_id,
-            "date": time_block.date,
-            "start_time": str(time_block.start_time),
-            "end_time": str(time_block.end_time),
-            "status": time_block.status.value,
-            "notes": time_block.notes,
-            "completed_at": time_block.completed_at,
-            "created_at": time_block.created_at,
-            "task_title": task_title
-        }
-    }
+    return ORJSONResponse({"time_block": serialize(TimeBlockResponse, time_block, task_title=task_title)})
 
 
 @router.patch("/{time_block_id}", response_model=dict)
-def update_time_block(
+async def update_time_block(
     time_block_id: str,
     time_block_in: TimeBlockUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Update a time block"""
-    time_block = db.query(TimeBlock).filter(
+    time_block = (await db.execute(select(TimeBlock).where(
         TimeBlock.time_block_id == time_block_id,
         TimeBlock.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not time_block:
         raise HTTPException(status_code=404, detail="Time block not found")
     
+    old_date, old_status = time_block.date, time_block.status
+    
     update_data = time_block_in.dict(exclude_unset=True)
+    allow_overlap = update_data.pop("allow_overlap", False)
+    
+    # Rescheduling is checked against the rest of the target day
+    if {"date", "start_time", "end_time"} & update_data.keys():
+        await _check_overlap(
+            db,
+            current_user.user_id,
+            update_data.get("date") or time_block.date,
+            update_data.get("start_time") or time_block.start_time,
+            update_data.get("end_time") or time_block.end_time,
+            allow_overlap,
+            exclude_id=time_block.time_block_id
+        )
+    
     for field, value in update_data.items():
         setattr(time_block, field, value)
     
-    db.commit()
-    db.refresh(time_block)
+    await db.flush()
+    if time_block.date != old_date:
+        # The block moves between days' counters
+        await adjust_day_stats(
+            db,
+            current_user.user_id,
+            old_date,
+            total_time_blocks=-1,
+            **time_block_status_deltas(old_status, -1)
+        )
+        await adjust_day_stats(
+            db,
+            current_user.user_id,
+            time_block.date,
+            total_time_blocks=1,
+            **time_block_status_deltas(time_block.status)
+        )
+    else:
+        status_deltas = time_block_status_deltas(time_block.status)
+        for name, delta in time_block_status_deltas(old_status, -1).items():
+            status_deltas[name] += delta
+        await adjust_day_stats(db, current_user.user_id, time_block.date, **status_deltas)
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(time_blocks_tag(current_user.user_id))
+    await db.refresh(time_block)
     
     return {"message": "Time block updated successfully"}
 
 
 @router.delete("/{time_block_id}", response_model=dict)
-def delete_time_block(
+async def delete_time_block(
     time_block_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ):
     """Delete a time block"""
-    time_block = db.query(TimeBlock).filter(
+    time_block = (await db.execute(select(TimeBlock).where(
         TimeBlock.time_block_id == time_block_id,
         TimeBlock.user_id == current_user.user_id
-    ).first()
+    ))).scalars().first()
     
     if not time_block:
         raise HTTPException(status_code=404, detail="Time block not found")
     
-    db.delete(time_block)
-    db.commit()
+    block_date, block_status = time_block.date, time_block.status
+    
+    await db.delete(time_block)
+    await db.flush()
+    await adjust_day_stats(
+        db,
+        current_user.user_id,
+        block_date,
+        total_time_blocks=-1,
+        **time_block_status_deltas(block_status, -1)
+    )
+    await bump_data_version(db, current_user.user_id)
+    await db.commit()
+    await response_cache.invalidate(time_blocks_tag(current_user.user_id))
     
     return {"message": "Time block deleted successfully"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic import BaseSettings, AnyHttpUrl, validator
 
 
@@ -12,8 +12,55 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     
+    # Password hashing
+    BCRYPT_ROUNDS: int = 0  # 0 = calibrate against BCRYPT_TARGET_MS at startup
+    BCRYPT_TARGET_MS: int = 250
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+    PASSWORD_HASH_WORKERS: int = 2  # 0 = hash on the default thread pool
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    
+    # Authenticated-principal cache (0 disables)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Response compression (brotli is used only if the package is installed)
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller bodies are sent as they are
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    
+    # Tag-invalidated cache of per-user read responses; "memory" is per process,
+    # so run several workers only with "redis"
+    RESPONSE_CACHE_BACKEND: str = "memory"  # "memory", "redis" or "off"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_USE_MOCK_REDIS: bool = False  # in-process fake for the redis backend, for offline runs
+    RESPONSE_CACHE_TTL_SECONDS: int = 300  # 0 disables
+    RESPONSE_CACHE_MAX_ENTRIES: int = 10000  # memory backend only
+    
+    # Prometheus /metrics endpoint and the request/pool/Paystack instrumentation behind it
+    METRICS_ENABLED: bool = True
+    
+    # Per-request sampling profiler; off unless a token or a sample rate is set
+    PROFILING_TOKEN: str = ""  # send as X-Profile header or ?profile= to profile one request
+    PROFILING_SAMPLE_RATE: float = 0.0  # fraction of all requests to profile
+    PROFILING_INTERVAL_MS: float = 1.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_KEEP: int = 50  # newest folded-stack files kept on disk
+    
     # Database - REQUIRED, no default
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: Optional[str] = None  # GET/HEAD requests read from here when set
+    # After a write, the user's reads stay on the primary this long. "memory"
+    # remembers writers per process; with several workers use "redis" (at
+    # RESPONSE_CACHE_REDIS_URL) so every worker sees them.
+    DB_READ_YOUR_WRITES_SECONDS: int = 5
+    DB_READ_YOUR_WRITES_BACKEND: str = "memory"  # "memory" or "redis"
+    DB_CHECK_ON_STARTUP: bool = False  # connect once during startup and fail fast if unreachable
+    DB_CREATE_TABLES_ON_STARTUP: bool = False  # create_all during startup; migrations are the default
+    DB_QUERY_HEADERS: bool = False  # per-request Server-Timing and X-DB-Queries response headers
+    SLOW_QUERY_THRESHOLD_MS: float = 200  # 0 disables the slow-query log
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: int = 600  # per statement shape
+    SLOW_QUERY_MAX_ENTRIES: int = 200
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
@@ -29,6 +76,16 @@ class Settings(BaseSettings):
     # Paystack
     PAYSTACK_SECRET_KEY: str
     PAYSTACK_PUBLIC_KEY: str
+    PAYSTACK_CONNECT_TIMEOUT: float = 5.0
+    PAYSTACK_READ_TIMEOUT: float = 15.0
+    PAYSTACK_MAX_CONNECTIONS: int = 20
+    PAYSTACK_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    PAYSTACK_KEEPALIVE_EXPIRY: float = 30.0
+    PAYSTACK_MAX_RETRIES: int = 3  # idempotent GETs only
+    PAYSTACK_RETRY_BACKOFF: float = 0.25  # seconds, doubled per attempt and jittered
+    PAYSTACK_VERIFY_CACHE_TTL_SECONDS: int = 3600
+    PAYSTACK_VERIFY_CACHE_MAX_SIZE: int = 10000
+    PAYSTACK_USE_MOCK: bool = False  # answer from the in-process fake, for offline runs
     
     # First Superuser
     FIRST_SUPERUSER_EMAIL: str
@@ -0,0 +1,60 @@
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+Value = Union[bytes, str, int, float]
+
+
+def _encode(value: Value) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class MockRedis:
+    """In-process stand-in for the subset of the redis.asyncio client the response cache uses.
+
+    Values come back as bytes and keys expire like they do on a server, so
+    the Redis backend can run without one. Every call is counted.
+    """
+
+    def __init__(self, timer=time.monotonic):
+        self._timer = timer
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self.calls: Dict[str, int] = {"get": 0, "mget": 0, "set": 0, "incr": 0, "delete": 0}
+
+    def _live(self, name: str) -> Optional[bytes]:
+        entry = self._data.get(name)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= self._timer():
+            del self._data[name]
+            return None
+        return value
+
+    async def get(self, name: str) -> Optional[bytes]:
+        self.calls["get"] += 1
+        return self._live(name)
+
+    async def mget(self, keys: List[str]) -> List[Optional[bytes]]:
+        self.calls["mget"] += 1
+        return [self._live(name) for name in keys]
+
+    async def set(self, name: str, value: Value, ex: Optional[float] = None) -> bool:
+        self.calls["set"] += 1
+        self._data[name] = (None if ex is None else self._timer() + ex, _encode(value))
+        return True
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        self.calls["incr"] += 1
+        value = int(self._live(name) or 0) + amount
+        expires_at = self._data[name][0] if name in self._data else None
+        self._data[name] = (expires_at, _encode(value))
+        return value
+
+    async def delete(self, *names: str) -> int:
+        self.calls["delete"] += 1
+        return sum(self._data.pop(name, None) is not None for name in names)
+
+    async def aclose(self) -> None:
+        return None
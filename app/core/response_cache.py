@@ -0,0 +1,247 @@
+import sys
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import RESPONSE_CACHE_REQUESTS
+from app.db.database import use_primary
+
+# Rendered JSON bodies of per-user read endpoints, invalidated by tag.
+#
+# Every tag has a version number that a write bumps after it commits. An entry
+# is stored together with the versions its tags had when the request started
+# building it, and is only served while they are all unchanged, so a write
+# that lands mid-build leaves an entry that can never be served. A writer
+# bumps before it responds, so its own next read is always rebuilt.
+
+Versions = Tuple[int, ...]
+
+
+def task_lists_tag(user_id: str) -> str:
+    """A user's set of task lists and their task counts"""
+    return f"user:{user_id}:task-lists"
+
+
+def time_blocks_tag(user_id: str) -> str:
+    """A user's time blocks, including the titles of their tasks"""
+    return f"user:{user_id}:time-blocks"
+
+
+def task_list_tag(task_list_id: str) -> str:
+    """One task list and the tasks in it"""
+    return f"task-list:{task_list_id}"
+
+
+def _encode_versions(versions: Versions) -> bytes:
+    return ",".join(map(str, versions)).encode()
+
+
+class MemoryBackend:
+    """Per-process LRU; only correct while every write goes through this process"""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.maxsize = maxsize
+        self._tags: "OrderedDict[str, int]" = OrderedDict()
+        self._clock = 0
+        # Tags not in _tags read as the highest version ever evicted, so
+        # forgetting a tag can only invalidate entries, never revive them
+        self._floor = 0
+
+    async def lookup(self, key: str, tags: Sequence[str]) -> Tuple[Versions, Optional[bytes]]:
+        versions = tuple(self._tags.get(tag, self._floor) for tag in tags)
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == versions:
+            return versions, entry[1]
+        return versions, None
+
+    async def store(self, key: str, versions: Versions, body: bytes) -> None:
+        self.entries.set(key, (versions, body))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self._clock += 1
+            self._tags[tag] = self._clock
+            self._tags.move_to_end(tag)
+        while len(self._tags) > self.maxsize:
+            _, version = self._tags.popitem(last=False)
+            self._floor = max(self._floor, version)
+
+    async def close(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self.entries), "maxsize": self.maxsize, "tags": len(self._tags)}
+
+
+class RedisBackend:
+    """Entries and tag versions in Redis, shared by every worker process.
+
+    Entries expire after the TTL; tag keys never do. Run the server with a
+    volatile-* eviction policy so memory pressure only drops entries: a lost
+    tag key would read as version 0 again.
+    """
+
+    name = "redis"
+
+    def __init__(self, client, ttl: float, prefix: str = "response-cache:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def lookup(self, key: str, tags: Sequence[str]) -> Tuple[Versions, Optional[bytes]]:
+        # Tag versions and the entry in one round trip
+        values = await self.client.mget([f"{self.prefix}tag:{tag}" for tag in tags] + [f"{self.prefix}entry:{key}"])
+        versions = tuple(int(value or 0) for value in values[:-1])
+        entry = values[-1]
+        if entry is not None:
+            stored, _, body = entry.partition(b"\n")
+            if stored == _encode_versions(versions):
+                return versions, body
+        return versions, None
+
+    async def store(self, key: str, versions: Versions, body: bytes) -> None:
+        await self.client.set(f"{self.prefix}entry:{key}", _encode_versions(versions) + b"\n" + body, ex=int(self.ttl))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            await self.client.incr(f"{self.prefix}tag:{tag}")
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class ResponseCache:
+    """Tagged cache of JSON response bodies with hit and miss counts per route"""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.counts: Dict[str, List[int]] = {}  # route -> [hits, misses]
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def _count(self, route: str, hit: bool) -> None:
+        counts = self.counts.setdefault(route, [0, 0])
+        counts[0 if hit else 1] += 1
+        RESPONSE_CACHE_REQUESTS.inc(route, "hit" if hit else "miss")
+
+    def _error(self, action: str, error: Exception) -> None:
+        self.errors += 1
+        print(f"✗ Response cache {action} failed: {type(error).__name__}: {error}", file=sys.stderr)
+
+    async def respond(
+        self,
+        request: Request,
+        user_id: str,
+        tags: Sequence[str],
+        build: Callable[[], Awaitable[Any]],
+        db: AsyncSession,
+        etag: Optional[str] = None
+    ) -> Response:
+        """Serve the cached body for this user and URL, or build, store and send it.
+
+        `build` returns the payload and may raise HTTPException; only
+        successful payloads are stored. With an `etag` (from conditional_get)
+        the entry is keyed by it too, so a body is only ever sent under the
+        data version it was built at: a write bumps data_version before it
+        invalidates tags, and a read in between must not pair the new ETag
+        with the old body. A miss is always built from the
+        primary: a lagging replica could miss a write whose invalidation has
+        already happened. With a replica configured, hits are what keep these
+        reads off the primary.
+        """
+        headers = {"ETag": etag} if etag else None
+        if not self.enabled:
+            return ORJSONResponse(await build(), headers=headers)
+
+        route = getattr(request.scope.get("route"), "path_format", request.url.path)
+        key = f"{user_id}:{request.url.path}?{request.url.query}"
+        if etag:
+            key += f":{etag}"
+        try:
+            versions, body = await self.backend.lookup(key, tags)
+        except Exception as e:
+            self._error("lookup", e)
+            return ORJSONResponse(await build(), headers=headers)
+
+        if body is not None:
+            self._count(route, hit=True)
+            return Response(body, media_type="application/json", headers=headers)
+        self._count(route, hit=False)
+
+        # The payload must come from a snapshot newer than the versions just
+        # read; a transaction left open by earlier dependencies may be older
+        use_primary(db)
+        if db.in_transaction():
+            await db.commit()
+        response = ORJSONResponse(await build(), headers=headers)
+        try:
+            await self.backend.store(key, versions, response.body)
+        except Exception as e:
+            self._error("store", e)
+        return response
+
+    async def invalidate(self, *tags: str) -> None:
+        """Make every entry carrying one of `tags` unservable; call after the write commits"""
+        if not self.enabled or not tags:
+            return
+        try:
+            await self.backend.invalidate(tags)
+        except Exception as e:
+            self._error("invalidation", e)
+
+    async def close(self) -> None:
+        if self.enabled:
+            await self.backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates overall and per route, for /health"""
+        if not self.enabled:
+            return {"backend": "off"}
+
+        def rates(hits: int, misses: int) -> Dict[str, Any]:
+            lookups = hits + misses
+            return {"hits": hits, "misses": misses, "hit_rate": round(hits / lookups, 4) if lookups else 0.0}
+
+        return {
+            "backend": self.backend.name,
+            **rates(sum(c[0] for c in self.counts.values()), sum(c[1] for c in self.counts.values())),
+            "errors": self.errors,
+            "routes": {route: rates(*counts) for route, counts in self.counts.items()},
+            **self.backend.stats()
+        }
+
+
+def _build_backend():
+    backend = settings.RESPONSE_CACHE_BACKEND
+    if backend == "off" or settings.RESPONSE_CACHE_TTL_SECONDS <= 0:
+        return None
+    if backend == "memory":
+        return MemoryBackend(maxsize=settings.RESPONSE_CACHE_MAX_ENTRIES, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+    if backend == "redis":
+        if settings.RESPONSE_CACHE_USE_MOCK_REDIS:
+            from app.core.redis_mock import MockRedis
+            client = MockRedis()
+        else:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package")
+            client = redis.from_url(settings.RESPONSE_CACHE_REDIS_URL)
+        return RedisBackend(client, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+    raise RuntimeError(f"Unknown RESPONSE_CACHE_BACKEND {backend!r}; use memory, redis or off")
+
+
+response_cache = ResponseCache(_build_backend())
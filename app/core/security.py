@@ -1,12 +1,30 @@
+import asyncio
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 from app.core.config import settings
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Cost factor new hashes are made with; replaced by calibrate_bcrypt_rounds()
+bcrypt_rounds: int = settings.BCRYPT_ROUNDS or bcrypt.default_rounds
+
+_pool: Optional[Executor] = None
+_pool_lock = threading.Lock()
+_in_flight = 0
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hashing jobs are already queued"""
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
@@ -26,6 +44,100 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
\ No newline at end of file
+    return bcrypt.using(rounds=rounds or bcrypt_rounds).hash(password)
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor a bcrypt hash was made with, e.g. 12 for $2b$12$..."""
+    try:
+        return int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return None
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash was made with a lower cost than the current target.
+
+    Only upward: every worker calibrates its own target, and workers that
+    land on different costs would otherwise rehash the same password back
+    and forth on every login.
+    """
+    rounds = hash_rounds(hashed_password)
+    return rounds is None or rounds < bcrypt_rounds
+
+
+def _timed_hash(rounds: int) -> float:
+    start = time.perf_counter()
+    get_password_hash("calibration-password", rounds)
+    return time.perf_counter() - start
+
+
+def _get_pool() -> Optional[Executor]:
+    global _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn keeps the workers free of the server's threads and sockets
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+async def _run_hasher(fn, *args):
+    """Run a bcrypt call on the hashing pool, refusing work past the queue limit"""
+    global _in_flight
+    with _pool_lock:
+        if _in_flight >= settings.PASSWORD_HASH_MAX_QUEUE:
+            raise PasswordHasherBusy()
+        _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+    finally:
+        with _pool_lock:
+            _in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password off the event loop and the request thread pool"""
+    return await _run_hasher(get_password_hash, password, bcrypt_rounds)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password off the event loop and the request thread pool"""
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
+
+async def calibrate_bcrypt_rounds() -> int:
+    """Pick the highest cost whose hash time stays within BCRYPT_TARGET_MS.
+
+    Each extra round doubles the work, so one timing at the minimum cost is
+    enough to extrapolate. Skipped when BCRYPT_ROUNDS pins the cost.
+    """
+    global bcrypt_rounds
+    if settings.BCRYPT_ROUNDS:
+        bcrypt_rounds = settings.BCRYPT_ROUNDS
+        return bcrypt_rounds
+
+    low, high = settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+    samples = [await _run_hasher(_timed_hash, low) for _ in range(3)]
+    elapsed_ms = max(min(samples), 1e-6) * 1000
+
+    extra = 0
+    if settings.BCRYPT_TARGET_MS > elapsed_ms:
+        extra = math.floor(math.log2(settings.BCRYPT_TARGET_MS / elapsed_ms))
+    bcrypt_rounds = max(low, min(high, low + extra))
+    return bcrypt_rounds
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hashing worker processes"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -7,6 +7,7 @@ from app.models.task_list import TaskList
 from app.models.task import Task
 from app.models.time_block import TimeBlock
 from app.models.subscription import Subscription
+from app.models.user_stats import UserStats, UserDayStats
 
 # This ensures all models are registered with Base.metadata
-__all__ = ["Base", "User", "TaskList", "Task", "TimeBlock", "Subscription"]
\ No newline at end of file
+__all__ = ["Base", "User", "TaskList", "Task", "TimeBlock", "Subscription", "UserStats", "UserDayStats"]
\ No newline at end of file
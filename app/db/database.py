@@ -1,85 +1,226 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from fastapi import Request
+from sqlalchemy import create_engine, text, Engine, Insert, Update, Delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker, declarative_base, Session
 from app.core.config import settings
+from app.db.query_stats import instrument_engine
+from app.db.pool_metrics import instrument_pool
+from app.db.recent_writers import recent_writers
+from app.db.slow_queries import slow_query_log
+from typing import AsyncGenerator, NamedTuple, Optional
 import urllib.parse
-import sys
+import ssl
 
-# Validate DATABASE_URL exists
-if not settings.DATABASE_URL:
-    print("ERROR: DATABASE_URL environment variable is not set!", file=sys.stderr)
-    sys.exit(1)
+# Nothing here connects, prints or builds an engine at import time: engines
+# are created on first use, and the lifespan decides whether to check them.
 
-print(f"Attempting to connect to database...", file=sys.stderr)
+Base = declarative_base()
 
-# Parse DATABASE_URL
-parsed = urllib.parse.urlparse(settings.DATABASE_URL)
 
-# Extract components
-username = urllib.parse.unquote(parsed.username or "")
-password = urllib.parse.unquote(parsed.password or "")
-host = parsed.hostname
-port = parsed.port
+class EngineConfig(NamedTuple):
+    sync_url: str
+    async_url: str
+    connect_args: dict
+    async_connect_args: dict
+    pool_args: dict
+    description: str
 
-# Validate required components
-if not host:
-    print(f"ERROR: Could not parse hostname from DATABASE_URL", file=sys.stderr)
-    sys.exit(1)
 
-# Set default port if not provided
-if port is None:
-    port = 3306
-    
-database = parsed.path[1:] if parsed.path else ""
-
-print(f"Database host: {host}:{port}", file=sys.stderr)
-print(f"Database name: {database}", file=sys.stderr)
-
-# Build clean URL WITHOUT any SSL params in the URL
-clean_url = f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}"
-
-# Configure SSL via connect_args for Aiven
-connect_args = {}
-query_params = urllib.parse.parse_qs(parsed.query)
-
-# Aiven requires SSL - configure it properly for PyMySQL
-if "ssl-mode" in query_params or "ssl_mode" in query_params or "ssl" in query_params:
-    # PyMySQL SSL configuration for Aiven
-    connect_args["ssl"] = {
-        "ssl_mode": "REQUIRED"
-    }
-    print("SSL mode: REQUIRED (Aiven Cloud)", file=sys.stderr)
-else:
-    # Force SSL even if not in URL (Aiven requires it)
-    connect_args["ssl"] = {
-        "ssl_mode": "REQUIRED"
-    }
-    print("SSL mode: REQUIRED (forced for cloud database)", file=sys.stderr)
-
-# Create engine with appropriate settings for cloud database
-engine = create_engine(
-    clean_url,
-    connect_args=connect_args,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_size=5,  # Smaller pool for free tier
-    max_overflow=10,  # Allow up to 15 total connections
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    echo=False,
-)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+def engine_config(database_url: Optional[str] = None) -> EngineConfig:
+    """Translate DATABASE_URL into driver URLs and connection arguments"""
+    database_url = database_url or settings.DATABASE_URL
+    if not database_url:
+        raise RuntimeError("DATABASE_URL environment variable is not set")
+
+    parsed = urllib.parse.urlparse(database_url)
+
+    if parsed.scheme.startswith("sqlite"):
+        # Local stand-in: same file for the sync and the aiosqlite engine
+        path = database_url.split(":", 1)[1]
+        return EngineConfig(
+            sync_url=f"sqlite:{path}",
+            async_url=f"sqlite+aiosqlite:{path}",
+            connect_args={"check_same_thread": False},
+            async_connect_args={},
+            pool_args={},
+            description=f"SQLite {path.lstrip('/') or ':memory:'}"
+        )
+
+    # Extract components
+    username = urllib.parse.unquote(parsed.username or "")
+    password = urllib.parse.unquote(parsed.password or "")
+    host = parsed.hostname
+    port = parsed.port or 3306
+
+    if not host:
+        raise RuntimeError("Could not parse hostname from DATABASE_URL")
+
+    database = parsed.path[1:] if parsed.path else ""
+
+    # Aiven requires SSL whether or not the URL asks for it; REQUIRED means
+    # encrypted but unverified. PyMySQL takes a dict, aiomysql an SSLContext.
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+
+    return EngineConfig(
+        # Build clean URLs WITHOUT any SSL params in the URL
+        sync_url=f"mysql+pymysql://{username}:{password}@{host}:{port}/{database}",
+        async_url=f"mysql+aiomysql://{username}:{password}@{host}:{port}/{database}",
+        connect_args={"ssl": {"ssl_mode": "REQUIRED"}},
+        async_connect_args={"ssl": ssl_context},
+        pool_args=dict(
+            pool_pre_ping=True,  # Verify connections before using them
+            pool_size=5,  # Smaller pool for free tier
+            max_overflow=10,  # Allow up to 15 total connections
+            pool_recycle=3600,  # Recycle connections after 1 hour
+        ),
+        description=f"MySQL {host}:{port}/{database} (SSL required)"
+    )
+
+
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+_replica_engine: Optional[AsyncEngine] = None
+_session_factory: Optional[sessionmaker] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> Engine:
+    """Synchronous engine for Alembic and maintenance scripts, created on first use"""
+    global _engine
+    if _engine is None:
+        config = engine_config()
+        _engine = create_engine(config.sync_url, connect_args=config.connect_args, echo=False, **config.pool_args)
+        instrument_engine(_engine)
+        instrument_pool(_engine, "sync")
+        slow_query_log.instrument(_engine)
+    return _engine
+
+
+def _create_async_engine(database_url: str, name: str) -> AsyncEngine:
+    config = engine_config(database_url)
+    engine = create_async_engine(
+        config.async_url,
+        connect_args=config.async_connect_args,
+        echo=False,
+        **config.pool_args
+    )
+    instrument_engine(engine.sync_engine)
+    instrument_pool(engine.sync_engine, name)
+    return engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """Async engine used by the API, created on first use"""
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = _create_async_engine(settings.DATABASE_URL, "async")
+        slow_query_log.instrument(_async_engine.sync_engine, explain_engine=_async_engine)
+    return _async_engine
+
+
+def get_replica_engine() -> Optional[AsyncEngine]:
+    """Async engine for DATABASE_REPLICA_URL, or None when no replica is configured"""
+    global _replica_engine
+    if _replica_engine is None and settings.DATABASE_REPLICA_URL:
+        _replica_engine = _create_async_engine(settings.DATABASE_REPLICA_URL, "replica")
+        slow_query_log.instrument(_replica_engine.sync_engine)
+    return _replica_engine
+
+
+class RoutingSession(Session):
+    """Sends a read-only session's queries to the replica, everything else to the primary.
 
-def get_db():
-    db = SessionLocal()
-    try:
+    A session is read-only when `info["read_only"]` is set (get_db does so for
+    GET and HEAD requests, and route_reads clears it again for a recent
+    writer). Any flush or DML statement goes to the primary regardless.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        primary = get_async_engine().sync_engine
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.info["wrote"] = True
+            return primary
+
+        replica = get_replica_engine()
+        if replica is None or not self.info.get("read_only"):
+            return primary
+        return replica.sync_engine
+
+
+class RoutingAsyncSession(AsyncSession):
+    """Records its user in `recent_writers` once a commit that wrote has gone through"""
+
+    async def commit(self) -> None:
+        await super().commit()
+        if self.info.pop("wrote", False) and self.info.get("user_id"):
+            await recent_writers.mark(self.info["user_id"])
+
+
+def use_primary(db: AsyncSession) -> None:
+    """Read from the primary for the rest of this session, e.g. before reading data that is about to be rewritten"""
+    db.info["read_only"] = False
+
+
+async def route_reads(db: AsyncSession, user_id: str) -> None:
+    """Attribute the session to a user: its writes mark them as a recent writer, whose reads stay on the primary"""
+    db.info["user_id"] = user_id
+    if db.info.get("read_only") and get_replica_engine() is not None and await recent_writers.contains(user_id):
+        use_primary(db)
+
+
+def SessionLocal() -> Session:
+    """New synchronous session"""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_factory()
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """New async session; reads only go to a replica once the session is marked read-only"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(),
+            class_=RoutingAsyncSession,
+            sync_session_class=RoutingSession,
+            autoflush=False,
+            expire_on_commit=False,  # attributes stay readable after commit without a lazy load
+        )
+    return _async_session_factory()
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        db.info["read_only"] = request.method in ("GET", "HEAD")
         yield db
-    finally:
-        db.close()
-
-# Test connection on startup
-try:
-    with engine.connect() as conn:
-        print("✓ Database connection successful!", file=sys.stderr)
-except Exception as e:
-    print(f"✗ Database connection failed: {e}", file=sys.stderr)
-    # Don't exit - let the app start and fail on first request with better error
\ No newline at end of file
+
+
+async def check_database(create_tables: bool = False) -> None:
+    """Readiness step: open a connection and optionally create missing tables.
+
+    `create_tables` needs every model imported (see app.db.base). Raises if
+    the database cannot be reached.
+    """
+    async with get_async_engine().begin() as conn:
+        await conn.execute(text("SELECT 1"))
+        if create_tables:
+            await conn.run_sync(Base.metadata.create_all)
+    
+    if get_replica_engine() is not None:
+        async with get_replica_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections; engines are rebuilt on next use"""
+    global _engine, _async_engine, _replica_engine, _session_factory, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+    _engine = _async_engine = _replica_engine = _session_factory = _async_session_factory = None
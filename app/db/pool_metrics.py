@@ -0,0 +1,97 @@
+import time
+from typing import Dict, Tuple
+from sqlalchemy import event, Engine
+from sqlalchemy.pool import Pool
+from app.core.metrics import (
+    registry, Gauge, DB_POOL_CHECKOUTS, DB_POOL_CONNECTIONS, DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECT_TIME, DB_POOL_HOLD_TIME
+)
+
+# Engines by label ("sync", "async", "replica"). Their pool is read when the
+# metrics are collected: dispose() swaps engine.pool for a new instance.
+_engines: Dict[str, Engine] = {}
+
+
+def _pool_status(read) -> Dict[Tuple[str, ...], float]:
+    values = {}
+    for name, engine in _engines.items():
+        try:
+            values[(name,)] = read(engine.pool)
+        except AttributeError:  # pools without a fixed size (SQLite memory, NullPool)
+            continue
+    return values
+
+
+registry.register(Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ("engine",),
+    function=lambda: _pool_status(lambda pool: pool.checkedout())
+))
+registry.register(Gauge(
+    "db_pool_size", "Configured persistent connections (pool_size)", ("engine",),
+    function=lambda: _pool_status(lambda pool: pool.size())
+))
+registry.register(Gauge(
+    "db_pool_overflow", "Connections open beyond pool_size; negative while the pool is still filling", ("engine",),
+    function=lambda: _pool_status(lambda pool: pool.overflow())
+))
+
+
+def pool_status() -> Dict[str, Dict[str, int]]:
+    """Checked-out, size and overflow per instrumented engine's current pool, for /health"""
+    status = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        try:
+            status[name] = {"checked_out": pool.checkedout(), "size": pool.size(), "overflow": pool.overflow()}
+        except AttributeError:
+            status[name] = {}
+    return status
+
+
+def _time_checkouts(pool: Pool, name: str) -> None:
+    """Observe how long each checkout from this pool instance takes, queueing and connecting included"""
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, name)
+
+    pool.connect = timed_connect
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Count checkouts and new connections, and time waiting for, opening and holding connections.
+
+    Listeners are registered on the engine; SQLAlchemy hands them on to the
+    pool that replaces this one on dispose(). There is no event before a
+    checkout starts, so the wait is timed by wrapping connect() on the pool
+    instance, and the wrapper is applied again to each replacement pool.
+    """
+    _engines[name] = engine
+    _time_checkouts(engine.pool, name)
+
+    def on_do_connect(dialect, connection_record, cargs, cparams):
+        connection_record.info["pool_metrics_connect_started"] = time.perf_counter()
+
+    def on_connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTIONS.inc(name)
+        started = connection_record.info.pop("pool_metrics_connect_started", None)
+        if started is not None:
+            DB_POOL_CONNECT_TIME.observe(time.perf_counter() - started, name)
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc(name)
+        connection_record.info["pool_metrics_checked_out_at"] = time.perf_counter()
+
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("pool_metrics_checked_out_at", None)
+        if checked_out_at is not None:
+            DB_POOL_HOLD_TIME.observe(time.perf_counter() - checked_out_at, name)
+
+    event.listen(engine, "do_connect", on_do_connect)
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "engine_disposed", lambda engine: _time_checkouts(engine.pool, name))
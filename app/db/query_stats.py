@@ -0,0 +1,87 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import event, Engine
+
+# Statement counts, rows and database time for whatever is being tracked in
+# the current context (normally one request). The listeners are installed on
+# every engine but only do work while something is being tracked.
+
+
+class QueryStats:
+    """Totals for one tracked scope"""
+    __slots__ = ("statements", "rows", "seconds", "recorded")
+
+    def __init__(self, record_statements: bool = False):
+        self.statements = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.recorded: Optional[List[str]] = [] if record_statements else None
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1e3:.1f};desc="{self.statements} queries, {self.rows} rows"'
+
+
+# A tuple so nested scopes (a test around a request) each see every statement
+_active: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+def _record(statement: str, context, rows: int) -> None:
+    scopes = _active.get()
+    if not scopes:
+        return
+    # The start time lives on the statement's execution context, so a
+    # statement that fails leaves nothing behind on the pooled connection
+    started = getattr(context, "query_stats_started", None)
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    for stats in scopes:
+        stats.statements += 1
+        stats.rows += rows
+        stats.seconds += elapsed
+        if stats.recorded is not None:
+            stats.recorded.append(statement)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _active.get():
+        context.query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Rows as the DBAPI reports them: affected rows for DML, and returned rows
+    # for a SELECT on MySQL drivers (SQLite reports -1 there, counted as 0)
+    _record(statement, context, max(cursor.rowcount, 0))
+
+
+def _handle_error(exception_context) -> None:
+    if exception_context.statement is not None:
+        _record(exception_context.statement, exception_context.execution_context, 0)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the counting listeners to a (sync or async.sync_engine) engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """Count every statement issued from this context until the block exits"""
+    stats = QueryStats(record_statements)
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "block") -> Iterator[QueryStats]:
+    """Fail with the offending SQL when the block issues more than `limit` statements"""
+    with track_queries(record_statements=True) as stats:
+        yield stats
+    if stats.statements > limit:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(stats.recorded, 1))
+        raise AssertionError(f"{label} issued {stats.statements} queries, expected at most {limit}:\n{listing}")
@@ -0,0 +1,78 @@
+import sys
+import time
+from typing import Callable, Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class RecentWriters:
+    """Users who wrote within the read-your-writes window; their reads stay on the primary.
+
+    Always remembered in this process. With a Redis client the mark is also
+    kept there under a key that expires with the window, so a read that
+    lands on another worker process sees it too.
+    """
+
+    def __init__(self, ttl: float, client=None, prefix: str = "recent-writer:", timer: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.client = client
+        self.prefix = prefix
+        self.local = TTLCache(maxsize=100000, ttl=ttl, timer=timer)
+
+    @property
+    def shared(self) -> bool:
+        return self.client is not None
+
+    async def mark(self, user_id: str) -> None:
+        """Record a committed write by `user_id`"""
+        if self.ttl <= 0:
+            return
+        self.local.set(user_id, True)
+        if self.client is not None:
+            try:
+                await self.client.set(f"{self.prefix}{user_id}", 1, ex=int(self.ttl))
+            except Exception as e:
+                print(f"✗ Recording a recent writer failed: {type(e).__name__}: {e}", file=sys.stderr)
+
+    async def contains(self, user_id: Optional[str]) -> bool:
+        """Whether `user_id` wrote within the window; an unreachable Redis counts as yes"""
+        if user_id is None or self.ttl <= 0:
+            return False
+        if self.local.get(user_id) is not None:
+            return True
+        if self.client is None:
+            return False
+        try:
+            return await self.client.get(f"{self.prefix}{user_id}") is not None
+        except Exception as e:
+            print(f"✗ Recent writer lookup failed: {type(e).__name__}: {e}", file=sys.stderr)
+            return True
+
+    def clear(self) -> None:
+        """Forget this process's marks; shared ones expire on their own"""
+        self.local.clear()
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+
+def _build_recent_writers() -> RecentWriters:
+    backend = settings.DB_READ_YOUR_WRITES_BACKEND
+    if backend == "memory":
+        return RecentWriters(settings.DB_READ_YOUR_WRITES_SECONDS)
+    if backend == "redis":
+        if settings.RESPONSE_CACHE_USE_MOCK_REDIS:
+            from app.core.redis_mock import MockRedis
+            client = MockRedis()
+        else:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("DB_READ_YOUR_WRITES_BACKEND=redis needs the redis package")
+            client = redis.from_url(settings.RESPONSE_CACHE_REDIS_URL)
+        return RecentWriters(settings.DB_READ_YOUR_WRITES_SECONDS, client)
+    raise RuntimeError(f"Unknown DB_READ_YOUR_WRITES_BACKEND {backend!r}; use memory or redis")
+
+
+recent_writers = _build_recent_writers()
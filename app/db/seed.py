@@ -0,0 +1,36 @@
+import asyncio
+import sys
+from sqlalchemy import select
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.database import AsyncSessionLocal
+from app.models.user import User
+
+
+async def seed_superuser() -> None:
+    """Create the FIRST_SUPERUSER_EMAIL account with admin rights if it does not exist yet.
+
+    An existing account with that address that is not a superuser is left
+    alone: anyone could have registered it before signup started refusing
+    the address, so it has to be promoted by hand.
+    """
+    async with AsyncSessionLocal() as db:
+        user = (await db.execute(
+            select(User).where(User.email == settings.FIRST_SUPERUSER_EMAIL)
+        )).scalars().first()
+        
+        if user is None:
+            password_hash = await asyncio.to_thread(get_password_hash, settings.FIRST_SUPERUSER_PASSWORD)
+            db.add(User(
+                email=settings.FIRST_SUPERUSER_EMAIL,
+                name="Admin",
+                password_hash=password_hash,
+                is_superuser=True
+            ))
+            await db.commit()
+            print(f"✓ Superuser {settings.FIRST_SUPERUSER_EMAIL} created", file=sys.stderr)
+        elif not user.is_superuser:
+            print(
+                f"✗ {settings.FIRST_SUPERUSER_EMAIL} exists but is not a superuser; promote it manually",
+                file=sys.stderr
+            )
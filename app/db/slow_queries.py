@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import re
+import sys
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.core.config import settings
+
+# Statements slower than a threshold, grouped by the shape of their SQL. Each
+# shape keeps one example of its parameters so EXPLAIN can be run on it in the
+# background, at most once per interval.
+
+# ASGI scope of the request being served; the route is read from it lazily
+request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"(?:\?|%s)(?:\s*,\s*(?:\?|%s))+")
+_SPACE = re.compile(r"\s+")
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+EXPLAIN_PREFIX = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN "}
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement shape: literals and expanded IN lists folded into placeholders"""
+    statement = _STRING.sub("?", statement)
+    statement = _NUMBER.sub("?", statement)
+    statement = _PLACEHOLDER_LIST.sub("?, ...", statement)
+    return _SPACE.sub(" ", statement).strip()
+
+
+def parameter_shape(parameters: Any, executemany: bool) -> str:
+    """Types of the bound values, not the values themselves"""
+    if executemany:
+        return f"{len(parameters)} x {parameter_shape(parameters[0], False)}" if parameters else "[]"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def current_route() -> str:
+    scope = request_scope.get()
+    if scope is None:
+        return "(no request)"
+    route = scope.get("route")
+    return f"{scope['method']} {getattr(route, 'path_format', None) or scope['path']}"
+
+
+class SlowQuery:
+    __slots__ = ("fingerprint", "sql", "statement", "parameters", "parameter_shapes", "count", "total_seconds",
+                 "max_seconds", "first_seen", "last_seen", "routes", "plan", "explained_at", "explain_error")
+
+    def __init__(self, fingerprint: str, sql: str, statement: str, parameters: Any):
+        self.fingerprint = fingerprint
+        self.sql = sql
+        self.statement = statement
+        self.parameters = parameters
+        self.parameter_shapes: Counter = Counter()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.first_seen = self.last_seen = datetime.utcnow()
+        self.routes: Counter = Counter()
+        self.plan: Optional[List[List[str]]] = None
+        self.explained_at: Optional[float] = None
+        self.explain_error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "parameter_shapes": dict(self.parameter_shapes),
+            "count": self.count,
+            "total_ms": round(self.total_seconds * 1e3, 2),
+            "mean_ms": round(self.total_seconds * 1e3 / self.count, 2),
+            "max_ms": round(self.max_seconds * 1e3, 2),
+            "first_seen": self.first_seen.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "routes": dict(self.routes.most_common(10)),
+            "plan": self.plan,
+            "explain_error": self.explain_error
+        }
+
+
+class SlowQueryLog:
+    """Fingerprint-deduplicated record of slow statements with background EXPLAIN"""
+
+    def __init__(self, threshold_ms: float, explain_interval: float = 600, max_entries: int = 200):
+        self.threshold = threshold_ms / 1000
+        self.explain_interval = explain_interval
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, SlowQuery]" = OrderedDict()
+        self._explain_engine: Optional[AsyncEngine] = None
+        self._explaining: set = set()
+        self._tasks: set = set()  # strong references until each EXPLAIN finishes
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def instrument(self, engine, explain_engine: Optional[AsyncEngine] = None) -> None:
+        """Time every statement on `engine` (a sync Engine or an AsyncEngine's sync_engine)"""
+        if not self.enabled:
+            return
+        if explain_engine is not None:
+            self._explain_engine = explain_engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, so a statement that raises leaves nothing on the pooled connection
+        if context is not None:
+            context.slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= self.threshold and not statement.lstrip().upper().startswith("EXPLAIN"):
+            self.record(statement, parameters, executemany, elapsed, conn.dialect.name)
+
+    def record(self, statement: str, parameters: Any, executemany: bool, elapsed: float, dialect: str) -> SlowQuery:
+        sql = normalize_sql(statement)
+        fingerprint = hashlib.sha1(sql.encode()).hexdigest()[:16]
+        entry = self.entries.get(fingerprint)
+        if entry is None:
+            entry = self.entries[fingerprint] = SlowQuery(
+                fingerprint, sql, statement, None if executemany else parameters
+            )
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        self.entries.move_to_end(fingerprint)
+
+        entry.count += 1
+        entry.total_seconds += elapsed
+        entry.max_seconds = max(entry.max_seconds, elapsed)
+        entry.last_seen = datetime.utcnow()
+        entry.parameter_shapes[parameter_shape(parameters, executemany)] += 1
+        entry.routes[current_route()] += 1
+
+        if self._explain_due(entry):
+            entry.explained_at = time.monotonic()
+            print(
+                f"Slow query {fingerprint} ({elapsed * 1e3:.0f} ms, seen {entry.count}x, {current_route()}): {sql[:300]}",
+                file=sys.stderr
+            )
+            self._schedule_explain(entry, dialect)
+        return entry
+
+    def _explain_due(self, entry: SlowQuery) -> bool:
+        return entry.fingerprint not in self._explaining and (
+            entry.explained_at is None or time.monotonic() - entry.explained_at >= self.explain_interval
+        )
+
+    def _schedule_explain(self, entry: SlowQuery, dialect: str) -> None:
+        prefix = EXPLAIN_PREFIX.get(dialect)
+        if prefix is None or self._explain_engine is None or entry.parameters is None:
+            return
+        if not entry.statement.lstrip().upper().startswith(EXPLAINABLE):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # sync scripts: nothing to run it on
+            return
+        self._explaining.add(entry.fingerprint)
+        task = loop.create_task(self._explain(entry, prefix))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _explain(self, entry: SlowQuery, prefix: str) -> None:
+        """Run EXPLAIN on the stored example on its own connection"""
+        try:
+            async with self._explain_engine.connect() as conn:
+                result = await conn.exec_driver_sql(prefix + entry.statement, entry.parameters)
+                entry.plan = [[str(value) for value in row] for row in result.all()]
+                entry.explain_error = None
+        except Exception as e:
+            entry.explain_error = f"{type(e).__name__}: {e}"
+        finally:
+            self._explaining.discard(entry.fingerprint)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Entries, most total time first"""
+        return [entry.as_dict() for entry in sorted(self.entries.values(), key=lambda e: -e.total_seconds)]
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+    explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+    max_entries=settings.SLOW_QUERY_MAX_ENTRIES
+)
@@ -1,17 +1,68 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.db.database import engine
-from app.db.base import Base
+from app.api.deps import principal_cache
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.core.metrics import registry
+from app.core.response_cache import response_cache
+from app.core.security import calibrate_bcrypt_rounds, shutdown_password_hasher
+from app.services.paystack import paystack_service
+from app.db.database import check_database, dispose_engines, engine_config
+from app.db.recent_writers import recent_writers
+from app.db.pool_metrics import pool_status
+from app.db.seed import seed_superuser
+from app.db.base import Base  # noqa: F401 -- registers every model for create_all
 import sys
 
+
+async def database_ready() -> None:
+    """Opt-in readiness step: fail fast on an unreachable database, optionally create tables, seed the superuser"""
+    print(f"Checking database: {engine_config().description}", file=sys.stderr)
+    try:
+        await check_database(create_tables=settings.DB_CREATE_TABLES_ON_STARTUP)
+    except Exception as e:
+        print(f"✗ Database check failed: {e}", file=sys.stderr)
+        raise
+    print("✓ Database ready!", file=sys.stderr)
+    await seed_superuser()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start shared resources before serving and release them on shutdown"""
+    if settings.DB_CHECK_ON_STARTUP or settings.DB_CREATE_TABLES_ON_STARTUP:
+        await database_ready()
+    
+    rounds = await calibrate_bcrypt_rounds()
+    print(f"✓ bcrypt cost factor: {rounds}", file=sys.stderr)
+    
+    await paystack_service.start()
+    
+    yield
+    
+    # Stop background worker processes and close pooled connections
+    shutdown_password_hasher()
+    await paystack_service.close()
+    await response_cache.close()
+    await recent_writers.close()
+    await dispose_engines()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -23,17 +74,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create database tables on startup
-@app.on_event("startup")
-async def startup_event():
-    """Create tables on startup if they don't exist"""
-    print("Checking/Creating database tables...", file=sys.stderr)
-    try:
-        Base.metadata.create_all(bind=engine)
-        print("✓ Database tables ready!", file=sys.stderr)
-    except Exception as e:
-        print(f"✗ Failed to create tables: {e}", file=sys.stderr)
-        raise
+# Compress large JSON bodies for clients that accept it
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# Lets the slow-query log attribute statements to routes
+if settings.SLOW_QUERY_THRESHOLD_MS > 0:
+    app.add_middleware(RequestContextMiddleware)
+
+# Statement counts and database time per request, for profiling
+if settings.DB_QUERY_HEADERS:
+    app.add_middleware(QueryStatsMiddleware)
+
+# On-demand request profiling; not installed at all unless configured
+if settings.PROFILING_TOKEN or settings.PROFILING_SAMPLE_RATE > 0:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS,
+        directory=settings.PROFILING_DIR,
+        keep=settings.PROFILING_KEEP,
+    )
+
+# Outermost, so latency covers every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -52,4 +122,17 @@ def root():
 @app.get("/health")
 def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {
+        "status": "healthy",
+        "principal_cache": principal_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "db_pool": pool_status()
+    }
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
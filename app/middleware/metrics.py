@@ -0,0 +1,39 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import HTTP_REQUESTS, HTTP_LATENCY, HTTP_IN_FLIGHT
+
+
+class MetricsMiddleware:
+    """Per-route request counts, latency and in-flight requests.
+
+    Routes are labelled by their path template ("/api/v1/tasks/{task_id}"),
+    which the router leaves in the scope; requests that match no route share
+    one label so unknown URLs cannot grow the series without bound.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            path = getattr(route, "path_format", None) or "unmatched"
+            HTTP_LATENCY.observe(time.perf_counter() - started, scope["method"], path)
+            HTTP_REQUESTS.inc(scope["method"], path, status)
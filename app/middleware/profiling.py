@@ -0,0 +1,160 @@
+import asyncio
+import hmac
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from types import FrameType
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAM = "profile"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class RequestSampler(threading.Thread):
+    """Wall-clock stack sampler for one request task.
+
+    Every interval it looks at what the event loop thread is doing. While the
+    request's task is running, the thread's Python stack is recorded; while it
+    is suspended, its await chain is recorded with the awaited object as the
+    leaf, so database and network waits show up next to CPU time. Time spent
+    running other tasks is recorded as "[event loop busy]". Stacks are kept in
+    folded form ("root;caller;callee count") as read by flamegraph.pl and
+    speedscope.
+    """
+
+    def __init__(self, task: asyncio.Task, root_code, label: str, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.task = task
+        self.loop = task.get_loop()
+        self.loop_thread = threading.get_ident()
+        self.root_code = root_code
+        self.label = label
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stopped = threading.Event()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.samples[self.sample()] += 1
+            except Exception:  # the loop moved on mid-walk; drop this sample
+                continue
+
+    def sample(self) -> str:
+        if asyncio.current_task(self.loop) is self.task:
+            frames = []
+            frame = sys._current_frames().get(self.loop_thread)
+            while frame is not None and frame.f_code is not self.root_code:
+                frames.append(_frame_label(frame))
+                frame = frame.f_back
+            return ";".join([self.label, *reversed(frames)])
+        if asyncio.current_task(self.loop) is not None:
+            return ";".join([self.label, *self.await_chain(), "[event loop busy]"])
+        return ";".join([self.label, *self.await_chain()])
+
+    def await_chain(self) -> List[str]:
+        """Suspended coroutine frames below the profiling middleware, ending with what they wait on"""
+        frames, below_root = [], False
+        awaitable = self.task.get_coro()
+        while awaitable is not None:
+            frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+            if frame is None:
+                frames.append(f"[await {type(awaitable).__name__}]")
+                break
+            if below_root:
+                frames.append(_frame_label(frame))
+            below_root = below_root or frame.f_code is self.root_code
+            awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+        return frames
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ProfilingMiddleware:
+    """Opt-in per-request sampling profiler.
+
+    A request is profiled when it carries the configured token in the
+    X-Profile header or the `profile` query parameter, or when it is picked
+    by `sample_rate`. The folded stacks are written to `directory`, keeping
+    only the newest `keep` files, and the file name is returned in the
+    X-Profile response header. Only added to the app when profiling is
+    configured, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp, token: str = "", sample_rate: float = 0.0, interval_ms: float = 1.0,
+                 directory: str = "profiles", keep: int = 50):
+        self.app = app
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.directory = directory
+        self.keep = keep
+
+    def requested(self, scope: Scope) -> bool:
+        if self.sample_rate and random.random() < self.sample_rate:
+            return True
+        if not self.token:
+            return False
+        supplied = Headers(scope=scope).get(PROFILE_HEADER)
+        if supplied is None and scope.get("query_string"):
+            supplied = QueryParams(scope["query_string"]).get(PROFILE_QUERY_PARAM)
+        return supplied is not None and hmac.compare_digest(supplied.encode(), self.token.encode())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.requested(scope):
+            await self.app(scope, receive, send)
+            return
+        await self.profile(scope, receive, send)
+
+    async def profile(self, scope: Scope, receive: Receive, send: Send) -> None:
+        started_at = datetime.utcnow()
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", scope["path"]).strip("-")[:60] or "root"
+        filename = f"{started_at:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}-{scope['method']}-{slug}.folded"
+
+        async def send_with_name(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile"] = filename
+            await send(message)
+
+        sampler = RequestSampler(
+            asyncio.current_task(), ProfilingMiddleware.profile.__code__,
+            f"{scope['method']} {scope['path']}", self.interval
+        )
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_name)
+        finally:
+            sampler.stop()
+            await run_in_threadpool(self.save, filename, sampler.folded())
+
+    def save(self, filename: str, folded: str) -> None:
+        """Write one profile and delete the oldest beyond the retention count"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, filename), "w") as f:
+            f.write(folded)
+
+        profiles = sorted(name for name in os.listdir(self.directory) if name.endswith(".folded"))
+        for name in profiles[:max(len(profiles) - self.keep, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
@@ -0,0 +1,29 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.db.query_stats import track_queries
+
+
+class QueryStatsMiddleware:
+    """Report the request's SQL work in Server-Timing and X-DB-Queries headers.
+
+    Headers are written when the response starts, so statements issued while
+    a streaming body is still being sent are not included.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing())
+                    headers["X-DB-Queries"] = str(stats.statements)
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
@@ -0,0 +1,20 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.db.slow_queries import request_scope
+
+
+class RequestContextMiddleware:
+    """Make the request's ASGI scope visible to engine events, which get no request object"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
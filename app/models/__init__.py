@@ -2,4 +2,5 @@ from app.models.user import User
 from app.models.task_list import TaskList
 from app.models.task import Task
 from app.models.time_block import TimeBlock
-from app.models.subscription import Subscription
\ No newline at end of file
+from app.models.subscription import Subscription
+from app.models.user_stats import UserStats, UserDayStats
\ No newline at end of file
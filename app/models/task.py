@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -7,6 +7,12 @@ from app.db.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Task listing: WHERE task_list_id ORDER BY order_index
+        Index("ix_tasks_list_order", "task_list_id", "order_index", "task_id"),
+        # Completion counts: WHERE task_list_id AND is_completed
+        Index("ix_tasks_list_completed", "task_list_id", "is_completed"),
+    )
     
     task_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     task_list_id = Column(String(36), ForeignKey("task_lists.task_list_id", ondelete="CASCADE"), nullable=False)
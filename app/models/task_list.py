@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Date, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -14,6 +14,12 @@ class TaskListStatus(str, enum.Enum):
 
 class TaskList(Base):
     __tablename__ = "task_lists"
+    __table_args__ = (
+        # Listing: WHERE user_id ORDER BY created_at, task_list_id
+        Index("ix_task_lists_user_created", "user_id", "created_at", "task_list_id"),
+        # Status counts: WHERE user_id AND status
+        Index("ix_task_lists_user_status", "user_id", "status"),
+    )
     
     task_list_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String(36), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
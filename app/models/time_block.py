@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Date, Time, Text, ForeignKey, Enum
+from sqlalchemy import Column, String, DateTime, Date, Time, Text, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -14,6 +14,12 @@ class TimeBlockStatus(str, enum.Enum):
 
 class TimeBlock(Base):
     __tablename__ = "time_blocks"
+    __table_args__ = (
+        # Calendar listing: WHERE user_id [AND date] ORDER BY date, start_time
+        Index("ix_time_blocks_user_date_start", "user_id", "date", "start_time", "time_block_id"),
+        # Per-day status counts: WHERE user_id AND date [AND status]
+        Index("ix_time_blocks_user_date_status", "user_id", "date", "status"),
+    )
     
     time_block_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String(36), ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum
+from sqlalchemy import Column, String, DateTime, Enum, Integer, Boolean
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -23,6 +23,10 @@ class User(Base):
     subscription_expires_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Bumped by every write to the user's data; drives ETags on polled GETs
+    data_version = Column(Integer, default=0, nullable=False)
+    # Operational endpoints (/admin); only ever set by seed_superuser, never by signup
+    is_superuser = Column(Boolean, default=False, nullable=False)
     
     # Relationships
     task_lists = relationship("TaskList", back_populates="user", cascade="all, delete-orphan")
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, String, Integer, Date, DateTime, ForeignKey
+from datetime import datetime
+from app.db.database import Base
+
+
+class UserStats(Base):
+    """Running task list and task counters for a user's dashboard"""
+    __tablename__ = "user_stats"
+
+    user_id = Column(String(36), ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    total_task_lists = Column(Integer, default=0, nullable=False)
+    completed_task_lists = Column(Integer, default=0, nullable=False)
+    total_tasks = Column(Integer, default=0, nullable=False)
+    completed_tasks = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+
+class UserDayStats(Base):
+    """Running time block counters for one user on one calendar day"""
+    __tablename__ = "user_day_stats"
+
+    user_id = Column(String(36), ForeignKey("users.user_id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    total_time_blocks = Column(Integer, default=0, nullable=False)
+    completed_time_blocks = Column(Integer, default=0, nullable=False)
+    missed_time_blocks = Column(Integer, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
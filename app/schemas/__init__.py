@@ -1,11 +1,39 @@
 from app.schemas.user import UserCreate, UserLogin, UserResponse, UserUpdate
 from app.schemas.token import Token, TokenData
-from app.schemas.task_list import TaskListCreate, TaskListUpdate, TaskListResponse
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
-from app.schemas.time_block import TimeBlockCreate, TimeBlockUpdate, TimeBlockResponse
+from app.schemas.task_list import (
+    TaskListCreate,
+    TaskListUpdate,
+    TaskListResponse,
+    TaskListPage,
+    TaskListDetail
+)
+from app.schemas.task import (
+    TaskCreate,
+    TaskBulkCreate,
+    TaskUpdate,
+    TaskBulkUpdate,
+    TaskResponse,
+    TaskPage,
+    TaskDetail,
+    TaskBulkCreated
+)
+from app.schemas.time_block import (
+    TimeBlockCreate,
+    TimeBlockTemplateEntry,
+    TimeBlockTemplateImport,
+    TimeBlockUpdate,
+    TimeBlockResponse,
+    TimeBlockPage,
+    TimeBlockDetail,
+    TimeBlockTemplateCreated,
+    TimeBlockInterval,
+    TimeBlockConflict,
+    TimeBlockConflicts
+)
+from app.schemas.dashboard import DashboardStats
 from app.schemas.subscription import (
     SubscriptionInitialize,
     SubscriptionVerify,
     SubscriptionResponse,
     SubscriptionStatus
-)
\ No newline at end of file
+)
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class DashboardStats(BaseModel):
+    total_task_lists: int
+    completed_task_lists: int
+    total_tasks: int
+    completed_tasks: int
+    today_time_blocks: int
+    completed_time_blocks: int
+    missed_time_blocks: int
+    overall_completion: float
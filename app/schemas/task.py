@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist
 from datetime import datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class TaskBase(BaseModel):
@@ -11,11 +11,24 @@ class TaskCreate(TaskBase):
     task_list_id: str
 
 
+class TaskBulkCreate(BaseModel):
+    task_list_id: str
+    titles: conlist(str, min_items=1, max_items=500)
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     is_completed: Optional[bool] = None
 
 
+class TaskBulkUpdate(BaseModel):
+    # Either explicit task ids or every task in one list
+    task_ids: Optional[conlist(str, min_items=1, max_items=500)] = None
+    task_list_id: Optional[str] = None
+    action: str  # complete, uncomplete or rename
+    title: Optional[str] = None
+
+
 class TaskResponse(TaskBase):
     task_id: str
     task_list_id: str
@@ -25,4 +38,18 @@ class TaskResponse(TaskBase):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TaskPage(BaseModel):
+    tasks: List[TaskResponse]
+    next_cursor: Optional[str] = None
+
+
+class TaskDetail(BaseModel):
+    task: TaskResponse
+
+
+class TaskBulkCreated(BaseModel):
+    message: str
+    tasks: List[TaskResponse]
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import date, datetime
-from typing import Optional
+from typing import Optional, List
 
 
 class TaskListBase(BaseModel):
@@ -30,4 +30,13 @@ class TaskListResponse(TaskListBase):
     completed_tasks: int = 0
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TaskListPage(BaseModel):
+    task_lists: List[TaskListResponse]
+    next_cursor: Optional[str] = None
+
+
+class TaskListDetail(BaseModel):
+    task_list: TaskListResponse
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, conlist, root_validator
 from datetime import date, time, datetime
-from typing import Optional
+from datetime import date as Date  # for fields named date, which would shadow the type
+from typing import Optional, List
 
 
 class TimeBlockBase(BaseModel):
@@ -12,13 +13,41 @@ class TimeBlockBase(BaseModel):
 
 class TimeBlockCreate(TimeBlockBase):
     task_id: Optional[str] = None
+    allow_overlap: bool = False
+
+
+class TimeBlockTemplateEntry(BaseModel):
+    weekday: Optional[int] = None  # 0 = Monday; omitted means every day
+    start_time: time
+    end_time: time
+    task_id: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class TimeBlockTemplateImport(BaseModel):
+    blocks: conlist(TimeBlockTemplateEntry, min_items=1, max_items=200)
+    start_date: date
+    end_date: Optional[date] = None
+    allow_overlap: bool = False
 
 
 class TimeBlockUpdate(BaseModel):
+    date: Optional[Date] = None
+    start_time: Optional[time] = None
+    end_time: Optional[time] = None
+    allow_overlap: bool = False
     status: Optional[str] = None
     notes: Optional[str] = None
     completed_at: Optional[datetime] = None
 
+    @root_validator(pre=True)
+    def reject_nulls(cls, values):
+        # Omit a field to keep it; null would clear a column that cannot be empty
+        for name in ("date", "start_time", "end_time", "status", "allow_overlap"):
+            if name in values and values[name] is None:
+                raise ValueError(f"{name} cannot be null")
+        return values
+
 
 class TimeBlockResponse(TimeBlockBase):
     time_block_id: str
@@ -30,4 +59,35 @@ class TimeBlockResponse(TimeBlockBase):
     task_title: Optional[str] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class TimeBlockPage(BaseModel):
+    time_blocks: List[TimeBlockResponse]
+    next_cursor: Optional[str] = None
+
+
+class TimeBlockDetail(BaseModel):
+    time_block: TimeBlockResponse
+
+
+class TimeBlockInterval(BaseModel):
+    time_block_id: str
+    date: date
+    start_time: time
+    end_time: time
+
+
+class TimeBlockConflict(BaseModel):
+    first: TimeBlockInterval
+    second: TimeBlockInterval
+
+
+class TimeBlockTemplateCreated(BaseModel):
+    message: str
+    time_blocks: List[TimeBlockResponse]
+    conflicts: List[TimeBlockConflict] = []
+
+
+class TimeBlockConflicts(BaseModel):
+    conflicts: List[TimeBlockConflict]
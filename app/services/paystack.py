@@ -1,17 +1,96 @@
+import asyncio
+import random
+import time
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.metrics import PAYSTACK_LATENCY
+
+# Upstream answers worth another try for idempotent requests
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Transaction states that will not change on a later verification
+TERMINAL_STATUSES = {"success", "failed", "reversed"}
 
 
 class PaystackService:
     BASE_URL = "https://api.paystack.co"
     
-    def __init__(self):
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
         self.secret_key = settings.PAYSTACK_SECRET_KEY
         self.headers = {
             "Authorization": f"Bearer {self.secret_key}",
             "Content-Type": "application/json"
         }
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._verifications_in_flight: Dict[str, asyncio.Future] = {}
+        self.verification_cache = TTLCache(
+            maxsize=settings.PAYSTACK_VERIFY_CACHE_MAX_SIZE,
+            ttl=settings.PAYSTACK_VERIFY_CACHE_TTL_SECONDS
+        )
+    
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            headers=self.headers,
+            transport=self.transport,
+            timeout=httpx.Timeout(
+                settings.PAYSTACK_READ_TIMEOUT,
+                connect=settings.PAYSTACK_CONNECT_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.PAYSTACK_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PAYSTACK_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.PAYSTACK_KEEPALIVE_EXPIRY
+            )
+        )
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client; opened by start() or on first use outside the app lifespan"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+    
+    async def start(self) -> None:
+        """Open the shared connection pool"""
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+    
+    async def close(self) -> None:
+        """Close the shared connection pool"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _timed(self, operation: str, request) -> httpx.Response:
+        """Await one HTTP call, recording its latency by operation and status"""
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await request
+            status = str(response.status_code)
+            return response
+        finally:
+            PAYSTACK_LATENCY.observe(time.perf_counter() - started, operation, status)
+    
+    async def _get_with_retries(self, url: str, operation: str) -> httpx.Response:
+        """GET with jittered exponential backoff on transport errors and retryable statuses"""
+        attempts = settings.PAYSTACK_MAX_RETRIES + 1
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = await self._timed(operation, self.client.get(url))
+                if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                    return response
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+            
+            # Full jitter: sleep anywhere up to the exponential ceiling
+            await asyncio.sleep(random.uniform(0, settings.PAYSTACK_RETRY_BACKOFF * (2 ** attempt)))
     
     async def initialize_transaction(
         self,
@@ -21,7 +100,7 @@ class PaystackService:
         callback_url: str = None
     ) -> Dict[str, Any]:
         """Initialize a Paystack transaction"""
-        url = f"{self.BASE_URL}/transaction/initialize"
+        url = "/transaction/initialize"
         
         payload = {
             "email": email,
@@ -32,17 +111,35 @@ class PaystackService:
         if callback_url:
             payload["callback_url"] = callback_url
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(url, json=payload, headers=self.headers)
-            return response.json()
+        # POST creates a transaction, so it is never retried
+        response = await self._timed("initialize", self.client.post(url, json=payload))
+        return response.json()
     
     async def verify_transaction(self, reference: str) -> Dict[str, Any]:
         """Verify a Paystack transaction"""
-        url = f"{self.BASE_URL}/transaction/verify/{reference}"
+        url = f"/transaction/verify/{reference}"
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers)
-            return response.json()
+        response = await self._get_with_retries(url, "verify")
+        return response.json()
+    
+    async def verify_transaction_once(self, reference: str) -> Dict[str, Any]:
+        """Verify a transaction, collapsing concurrent calls and caching final outcomes"""
+        cached = self.verification_cache.get(reference)
+        if cached is not None:
+            return cached
+        
+        future = self._verifications_in_flight.get(reference)
+        if future is None:
+            future = asyncio.ensure_future(self.verify_transaction(reference))
+            self._verifications_in_flight[reference] = future
+            future.add_done_callback(lambda _: self._verifications_in_flight.pop(reference, None))
+        
+        # Shielded so one caller disconnecting does not cancel the shared request
+        response = await asyncio.shield(future)
+        
+        if response.get("status") and response.get("data", {}).get("status") in TERMINAL_STATUSES:
+            self.verification_cache.set(reference, response)
+        return response
     
     def calculate_amount(self, tier: str) -> int:
         """Calculate amount in kobo based on subscription tier"""
@@ -54,4 +151,11 @@ class PaystackService:
             raise ValueError("Invalid subscription tier")
 
 
-paystack_service = PaystackService()
\ No newline at end of file
+def _build_service() -> PaystackService:
+    if settings.PAYSTACK_USE_MOCK:
+        from app.services.paystack_mock import MockPaystack
+        return PaystackService(transport=MockPaystack().transport())
+    return PaystackService()
+
+
+paystack_service = _build_service()
@@ -0,0 +1,77 @@
+import json
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+import httpx
+
+
+class MockPaystack:
+    """In-process stand-in for the Paystack API, served through httpx.MockTransport.
+
+    Initialized transactions verify as successful unless marked otherwise.
+    Queued faults are served before the real answer, so retry behaviour can
+    be exercised without the network.
+    """
+
+    def __init__(self, currency: str = "NGN"):
+        self.currency = currency
+        self.transactions: Dict[str, Dict[str, Any]] = {}
+        self.faults: Deque[Any] = deque()
+        self.calls: Dict[str, int] = {"initialize": 0, "verify": 0}  # requests answered for real
+        self.requests: List[str] = []  # "METHOD path" of every request, faults included
+
+    def add_transaction(self, reference: str, amount: int, status: str = "success") -> None:
+        """Register a transaction as if it had been initialized and paid"""
+        self.transactions[reference] = {"amount": amount, "status": status}
+
+    def fail_next(self, times: int = 1, status_code: Optional[int] = 503, error: Optional[Exception] = None) -> None:
+        """Answer the next `times` requests with a status code or a transport error"""
+        for _ in range(times):
+            self.faults.append(error if error is not None else status_code)
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(f"{request.method} {request.url.path}")
+        if self.faults:
+            fault = self.faults.popleft()
+            if isinstance(fault, Exception):
+                raise fault
+            return httpx.Response(fault, json={"status": False, "message": "Injected fault"})
+
+        path = request.url.path
+        if request.method == "POST" and path == "/transaction/initialize":
+            return self._initialize(json.loads(request.content))
+        if request.method == "GET" and path.startswith("/transaction/verify/"):
+            return self._verify(path.rsplit("/", 1)[-1])
+        return httpx.Response(404, json={"status": False, "message": "Not found"})
+
+    def _initialize(self, payload: Dict[str, Any]) -> httpx.Response:
+        self.calls["initialize"] += 1
+        reference = payload["reference"]
+        self.add_transaction(reference, payload["amount"])
+        return httpx.Response(200, json={
+            "status": True,
+            "message": "Authorization URL created",
+            "data": {
+                "authorization_url": f"https://checkout.paystack.com/mock/{reference}",
+                "access_code": f"mock_{reference}",
+                "reference": reference
+            }
+        })
+
+    def _verify(self, reference: str) -> httpx.Response:
+        self.calls["verify"] += 1
+        transaction = self.transactions.get(reference)
+        if transaction is None:
+            return httpx.Response(400, json={"status": False, "message": "Transaction reference not found"})
+        return httpx.Response(200, json={
+            "status": True,
+            "message": "Verification successful",
+            "data": {
+                "reference": reference,
+                "status": transaction["status"],
+                "amount": transaction["amount"],
+                "currency": self.currency
+            }
+        })
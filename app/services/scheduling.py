@@ -0,0 +1,84 @@
+import heapq
+from datetime import date, time
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.time_block import TimeBlock
+
+# (time_block_id, date, start_time, end_time)
+Interval = Tuple[str, date, time, time]
+
+
+def overlaps(start: time, end: time, other_start: time, other_end: time) -> bool:
+    """Half-open overlap test: blocks that merely touch do not conflict"""
+    return start < other_end and other_start < end
+
+
+def overlapping_pairs(intervals: Sequence[Interval]) -> List[Tuple[Interval, Interval]]:
+    """Every overlapping pair among intervals sorted by (date, start_time).
+
+    Sweep line over each day: a min-heap of end times holds the blocks still
+    open when the next one starts, so the cost is O(n log n) plus one step
+    per reported pair.
+    """
+    pairs = []
+    open_blocks: List[Tuple[time, int]] = []
+    current_day = None
+
+    for index, interval in enumerate(intervals):
+        _, day, start, end = interval
+        if day != current_day:
+            open_blocks.clear()
+            current_day = day
+
+        while open_blocks and open_blocks[0][0] <= start:
+            heapq.heappop(open_blocks)
+
+        for _, other in open_blocks:
+            pairs.append((intervals[other], interval))
+
+        heapq.heappush(open_blocks, (end, index))
+
+    return pairs
+
+
+async def find_overlapping_blocks(
+    db: AsyncSession,
+    user_id: str,
+    day: date,
+    start: time,
+    end: time,
+    exclude_id: Optional[str] = None
+) -> List[Interval]:
+    """Blocks on one day that overlap [start, end), read with a single index range scan"""
+    # ix_time_blocks_user_date_start bounds the scan to blocks starting before `end`
+    candidates = (await db.execute(select(
+        TimeBlock.time_block_id, TimeBlock.date, TimeBlock.start_time, TimeBlock.end_time
+    ).where(
+        TimeBlock.user_id == user_id,
+        TimeBlock.date == day,
+        TimeBlock.start_time < end
+    ).order_by(TimeBlock.start_time))).all()
+
+    return [
+        tuple(row) for row in candidates
+        if row.time_block_id != exclude_id and overlaps(start, end, row.start_time, row.end_time)
+    ]
+
+
+async def find_blocks_in_range(db: AsyncSession, user_id: str, start_date: date, end_date: date) -> List[Interval]:
+    """A user's blocks between two dates inclusive, sorted by (date, start_time)"""
+    intervals = (await db.execute(select(
+        TimeBlock.time_block_id, TimeBlock.date, TimeBlock.start_time, TimeBlock.end_time
+    ).where(
+        TimeBlock.user_id == user_id,
+        TimeBlock.date >= start_date,
+        TimeBlock.date <= end_date
+    ).order_by(TimeBlock.date, TimeBlock.start_time))).all()
+
+    return [tuple(row) for row in intervals]
+
+
+async def find_conflicts_in_range(db: AsyncSession, user_id: str, start_date: date, end_date: date) -> List[Tuple[Interval, Interval]]:
+    """All overlapping pairs of a user's blocks between two dates inclusive"""
+    return overlapping_pairs(await find_blocks_in_range(db, user_id, start_date, end_date))
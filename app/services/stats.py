@@ -0,0 +1,239 @@
+from datetime import date
+from typing import Dict, Optional
+from sqlalchemy import select, update, delete, func, case, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import use_primary
+from app.models.user import User
+from app.models.task_list import TaskList, TaskListStatus
+from app.models.task import Task
+from app.models.time_block import TimeBlock, TimeBlockStatus
+from app.models.user_stats import UserStats, UserDayStats
+
+USER_COUNTERS = ("total_task_lists", "completed_task_lists", "total_tasks", "completed_tasks")
+DAY_COUNTERS = ("total_time_blocks", "completed_time_blocks", "missed_time_blocks")
+
+
+def _count(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+async def count_user_totals(db: AsyncSession, user_id: str) -> Dict[str, int]:
+    """Count task lists and tasks for a user straight from the source tables"""
+    lists = (await db.execute(select(
+        func.count(TaskList.task_list_id),
+        _count(TaskList.status == TaskListStatus.COMPLETED)
+    ).where(TaskList.user_id == user_id))).one()
+
+    tasks = (await db.execute(select(
+        func.count(Task.task_id),
+        _count(Task.is_completed == True)
+    ).join(TaskList).where(TaskList.user_id == user_id))).one()
+
+    return {
+        "total_task_lists": int(lists[0]),
+        "completed_task_lists": int(lists[1]),
+        "total_tasks": int(tasks[0]),
+        "completed_tasks": int(tasks[1])
+    }
+
+
+async def count_day_totals(db: AsyncSession, user_id: str, day: date) -> Dict[str, int]:
+    """Count a user's time blocks on one day straight from the source table"""
+    row = (await db.execute(select(
+        func.count(TimeBlock.time_block_id),
+        _count(TimeBlock.status == TimeBlockStatus.COMPLETED),
+        _count(TimeBlock.status == TimeBlockStatus.MISSED)
+    ).where(TimeBlock.user_id == user_id, TimeBlock.date == day))).one()
+
+    return {
+        "total_time_blocks": int(row[0]),
+        "completed_time_blocks": int(row[1]),
+        "missed_time_blocks": int(row[2])
+    }
+
+
+async def _apply_deltas(db: AsyncSession, model, filters, deltas: Dict[str, int]) -> bool:
+    """Increment counters in place; returns False when the row does not exist yet"""
+    values = {name: getattr(model, name) + delta for name, delta in deltas.items()}
+    result = await db.execute(
+        update(model).where(*filters).values(**values).execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+async def _insert_counters(db: AsyncSession, row, filters, deltas: Dict[str, int]) -> None:
+    """Insert a freshly counted row, falling back to the deltas if another transaction won the race"""
+    try:
+        async with db.begin_nested():
+            db.add(row)
+    except IntegrityError:
+        await _apply_deltas(db, type(row), filters, deltas)
+
+
+async def adjust_user_stats(db: AsyncSession, user_id: str, **deltas: int) -> None:
+    """Apply counter deltas for a user in the caller's transaction.
+
+    Call after the triggering change has been flushed. A missing row is
+    seeded from a full recount, which already includes that change.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    filters = [UserStats.user_id == user_id]
+    if await _apply_deltas(db, UserStats, filters, deltas):
+        return
+
+    row = UserStats(user_id=user_id, **await count_user_totals(db, user_id))
+    await _insert_counters(db, row, filters, deltas)
+
+
+async def adjust_day_stats(db: AsyncSession, user_id: str, day: date, **deltas: int) -> None:
+    """Apply time block counter deltas for one user and day in the caller's transaction"""
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    filters = [UserDayStats.user_id == user_id, UserDayStats.date == day]
+    if await _apply_deltas(db, UserDayStats, filters, deltas):
+        return
+
+    row = UserDayStats(user_id=user_id, date=day, **await count_day_totals(db, user_id, day))
+    await _insert_counters(db, row, filters, deltas)
+
+
+async def add_day_time_blocks(db: AsyncSession, user_id: str, counts: Dict[date, int]) -> None:
+    """Add newly inserted time blocks to many days' counters with a fixed number of statements.
+
+    Call after the blocks have been inserted; days without a counter row are
+    seeded from one grouped recount that already includes them.
+    """
+    counts = {day: count for day, count in counts.items() if count}
+    if not counts:
+        return
+
+    existing = set((await db.execute(select(UserDayStats.date).where(
+        UserDayStats.user_id == user_id, UserDayStats.date.in_(counts)
+    ))).scalars().all())
+
+    if existing:
+        await db.execute(
+            update(UserDayStats).where(
+                UserDayStats.user_id == user_id, UserDayStats.date.in_(existing)
+            ).values(
+                total_time_blocks=UserDayStats.total_time_blocks + case(
+                    {day: counts[day] for day in existing}, value=UserDayStats.date
+                )
+            ).execution_options(synchronize_session=False)
+        )
+
+    missing = [day for day in counts if day not in existing]
+    if not missing:
+        return
+
+    recounted = (await db.execute(select(
+        TimeBlock.date,
+        func.count(TimeBlock.time_block_id),
+        _count(TimeBlock.status == TimeBlockStatus.COMPLETED),
+        _count(TimeBlock.status == TimeBlockStatus.MISSED)
+    ).where(TimeBlock.user_id == user_id, TimeBlock.date.in_(missing)).group_by(TimeBlock.date))).all()
+
+    try:
+        async with db.begin_nested():
+            db.add_all([
+                UserDayStats(
+                    user_id=user_id,
+                    date=day,
+                    total_time_blocks=int(total),
+                    completed_time_blocks=int(completed),
+                    missed_time_blocks=int(missed)
+                )
+                for day, total, completed, missed in recounted
+            ])
+    except IntegrityError:
+        # Another transaction seeded some of these days first
+        for day in missing:
+            await adjust_day_stats(db, user_id, day, total_time_blocks=counts[day])
+
+
+def time_block_status_deltas(status, sign: int = 1) -> Dict[str, int]:
+    """Counter deltas contributed by a time block in the given status"""
+    return {
+        "completed_time_blocks": sign if status == TimeBlockStatus.COMPLETED else 0,
+        "missed_time_blocks": sign if status == TimeBlockStatus.MISSED else 0
+    }
+
+
+async def rebuild_user_stats(db: AsyncSession, user_id: str) -> UserStats:
+    """Recount every counter for a user, replacing whatever was stored"""
+    stats = await db.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(user_id=user_id)
+        db.add(stats)
+
+    for name, value in (await count_user_totals(db, user_id)).items():
+        setattr(stats, name, value)
+
+    await db.execute(
+        delete(UserDayStats).where(UserDayStats.user_id == user_id).execution_options(synchronize_session=False)
+    )
+
+    days = (await db.execute(select(
+        TimeBlock.date,
+        func.count(TimeBlock.time_block_id),
+        _count(TimeBlock.status == TimeBlockStatus.COMPLETED),
+        _count(TimeBlock.status == TimeBlockStatus.MISSED)
+    ).where(TimeBlock.user_id == user_id).group_by(TimeBlock.date))).all()
+
+    db.add_all([
+        UserDayStats(
+            user_id=user_id,
+            date=day,
+            total_time_blocks=int(total),
+            completed_time_blocks=int(completed),
+            missed_time_blocks=int(missed)
+        )
+        for day, total, completed, missed in days
+    ])
+    await db.flush()
+    return stats
+
+
+async def get_dashboard_counters(db: AsyncSession, user_id: str, today: Optional[date] = None) -> Dict[str, int]:
+    """Read the stored counters for a user and day with a single primary-key lookup"""
+    today = today or date.today()
+
+    row = (await db.execute(select(UserStats, UserDayStats).outerjoin(
+        UserDayStats,
+        and_(UserDayStats.user_id == UserStats.user_id, UserDayStats.date == today)
+    ).where(UserStats.user_id == user_id))).first()
+
+    if row is None:
+        # First visit since the counters were introduced: seed them once, counting
+        # on the primary so a lagging replica cannot be written back as the truth
+        use_primary(db)
+        stats = await rebuild_user_stats(db, user_id)
+        await db.commit()
+        day_stats = await db.get(UserDayStats, (user_id, today))
+    else:
+        stats, day_stats = row
+
+    counters = {name: getattr(stats, name) for name in USER_COUNTERS}
+    for name in DAY_COUNTERS:
+        counters[name] = getattr(day_stats, name) if day_stats else 0
+    return counters
+
+
+async def rebuild_all_user_stats(db: AsyncSession, user_id: Optional[str] = None) -> int:
+    """Recount counters for one user, or for every user, committing per user"""
+    stmt = select(User.user_id)
+    if user_id:
+        stmt = stmt.where(User.user_id == user_id)
+
+    rebuilt = 0
+    for uid in (await db.execute(stmt)).scalars().all():
+        await rebuild_user_stats(db, uid)
+        await db.commit()
+        rebuilt += 1
+    return rebuilt
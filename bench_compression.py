@@ -0,0 +1,55 @@
+import sys
+import time
+import zlib
+from app.api.responses import ORJSONResponse
+from app.middleware.compression import brotli
+from bench_serialization import make_time_blocks, make_tasks, time_blocks_serialized, tasks_serialized
+
+# Effective downlink used to translate bytes saved into transfer time
+LINK_KBPS = 1000  # a slow mobile connection
+
+
+def payloads(sizes):
+    """Typical JSON bodies: time-block and task pages of several lengths"""
+    for count in sizes:
+        yield f"time-blocks x{count}", ORJSONResponse(time_blocks_serialized(make_time_blocks(count))).body
+        yield f"tasks x{count}", ORJSONResponse(tasks_serialized(make_tasks(count))).body
+
+
+def codecs():
+    for level in (1, 6, 9):
+        yield f"gzip-{level}", lambda body, level=level: zlib.compress(body, level, wbits=31)
+    if brotli is not None:
+        for quality in (1, 4, 6, 11):
+            yield f"br-{quality}", lambda body, quality=quality: brotli.compress(body, quality=quality)
+
+
+def best_of(repeats: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_compression(sizes=(10, 100, 1000, 5000), repeats: int = 10):
+    """CPU time spent against bytes and transfer time saved, per codec and payload size"""
+    if brotli is None:
+        print("Brotli is not installed; only gzip is measured\n")
+
+    print(f"{'payload':<18} {'codec':<8} {'bytes':>9} {'compressed':>10} {'ratio':>6} {'cpu ms':>8} {'saved ms':>9} {'cpu/saved':>9}")
+    for label, body in payloads(sizes):
+        for name, compress in codecs():
+            seconds = best_of(repeats, lambda: compress(body))
+            compressed = len(compress(body))
+            saved_ms = (len(body) - compressed) * 8 / LINK_KBPS
+            print(
+                f"{label:<18} {name:<8} {len(body):>9} {compressed:>10} {len(body) / compressed:>6.1f} "
+                f"{seconds * 1e3:>8.3f} {saved_ms:>9.1f} {seconds * 1e3 / saved_ms if saved_ms > 0 else 0:>9.4f}"
+            )
+        print()
+    print(f"saved ms: transfer time saved at {LINK_KBPS} kbit/s; cpu/saved: server CPU ms spent per ms saved")
+
+if __name__ == "__main__":
+    bench_compression(repeats=int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,291 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+BENCH_PASSWORD = "benchmark-password"
+BENCH_START_DATE = date(2026, 1, 5)  # a Monday, so seeded weeks line up
+BENCH_DAYS = 60
+
+
+def configure_environment(db_path: str, bcrypt_rounds: int) -> None:
+    """Point the app at the SQLite stand-in; must run before any app module is imported"""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DB_CREATE_TABLES_ON_STARTUP"] = "true"
+    os.environ["PAYSTACK_USE_MOCK"] = "true"
+    os.environ["BCRYPT_ROUNDS"] = str(bcrypt_rounds)
+    for name, value in {
+        "SECRET_KEY": "benchmark-secret",
+        "PAYSTACK_SECRET_KEY": "sk_test_benchmark",
+        "PAYSTACK_PUBLIC_KEY": "pk_test_benchmark",
+        "FIRST_SUPERUSER_EMAIL": "admin@example.com",
+        "FIRST_SUPERUSER_PASSWORD": "benchmark"
+    }.items():
+        os.environ.setdefault(name, value)
+
+
+def seed_database(users: int, seed: int, mix: str = None, workers: int = 1) -> None:
+    """Deterministic synthetic users spread over BENCH_DAYS, from generate_data"""
+    from generate_data import GeneratorConfig, generate, parse_mix, seeded_password_hash
+
+    config = GeneratorConfig(
+        users=users, seed=seed, start_date=BENCH_START_DATE, days=BENCH_DAYS, email_prefix="bench",
+        password_hash=seeded_password_hash(BENCH_PASSWORD, seed)
+    )
+    generate(config._replace(mix=parse_mix(mix)) if mix else config, workers)
+
+
+async def load_fixtures():
+    """Per-user ids the scenarios pick from, read back from the seeded database"""
+    from sqlalchemy import select
+    from app.core.security import create_access_token
+    from app.db.database import AsyncSessionLocal
+    from app.models.user import User
+    from app.models.task_list import TaskList
+    from app.models.task import Task
+
+    async with AsyncSessionLocal() as db:
+        fixtures = []
+        # The superuser the app seeds on startup owns no data to exercise
+        users = select(User.user_id, User.email).where(User.is_superuser.is_(False)).order_by(User.email)
+        for user_id, email in (await db.execute(users)).all():
+            task_list_ids = (await db.execute(select(TaskList.task_list_id).where(
+                TaskList.user_id == user_id
+            ).order_by(TaskList.task_list_id))).scalars().all()
+            task_ids = (await db.execute(select(Task.task_id).join(TaskList).where(
+                TaskList.user_id == user_id
+            ).order_by(Task.task_id))).scalars().all()
+            fixtures.append({
+                "user_id": user_id,
+                "email": email,
+                "headers": {"Authorization": f"Bearer {create_access_token({'sub': user_id})}"},
+                "task_list_ids": task_list_ids,
+                "task_ids": task_ids
+            })
+    return fixtures
+
+
+def scenarios(api: str):
+    """(router, name, request factory); a factory maps (fixture, rng) to method, url, json, extra headers"""
+    def day(rng):
+        return (BENCH_START_DATE + timedelta(days=rng.randrange(BENCH_DAYS))).isoformat()
+
+    return [
+        ("auth", "GET /auth/me", lambda f, rng: ("GET", f"{api}/auth/me", None, {})),
+        ("auth", "POST /auth/login", lambda f, rng: (
+            "POST", f"{api}/auth/login", {"email": f["email"], "password": BENCH_PASSWORD}, {})),
+        ("dashboard", "GET /dashboard/stats", lambda f, rng: ("GET", f"{api}/dashboard/stats", None, {})),
+        ("dashboard", "GET /dashboard/stats (If-None-Match)", lambda f, rng: (
+            "GET", f"{api}/dashboard/stats", None, {"If-None-Match": f.get("dashboard_etag", "")})),
+        ("task_lists", "GET /task-lists", lambda f, rng: ("GET", f"{api}/task-lists", None, {})),
+        ("task_lists", "GET /task-lists/{id}", lambda f, rng: (
+            "GET", f"{api}/task-lists/{rng.choice(f['task_list_ids'])}", None, {})),
+        ("task_lists", "GET /task-lists/{id}/tasks", lambda f, rng: (
+            "GET", f"{api}/task-lists/{rng.choice(f['task_list_ids'])}/tasks", None, {})),
+        ("task_lists", "POST /task-lists", lambda f, rng: ("POST", f"{api}/task-lists", {
+            "title": "Bench list", "duration_type": "daily",
+            "start_date": BENCH_START_DATE.isoformat(), "end_date": BENCH_START_DATE.isoformat()
+        }, {})),
+        ("tasks", "GET /tasks/{id}", lambda f, rng: ("GET", f"{api}/tasks/{rng.choice(f['task_ids'])}", None, {})),
+        ("tasks", "PATCH /tasks/{id}/toggle", lambda f, rng: (
+            "PATCH", f"{api}/tasks/{rng.choice(f['task_ids'])}/toggle", None, {})),
+        ("tasks", "POST /tasks", lambda f, rng: (
+            "POST", f"{api}/tasks", {"task_list_id": rng.choice(f["task_list_ids"]), "title": "Bench task"}, {})),
+        ("tasks", "PATCH /tasks/bulk", lambda f, rng: ("PATCH", f"{api}/tasks/bulk", {
+            "task_list_id": rng.choice(f["task_list_ids"]), "action": rng.choice(["complete", "uncomplete"])
+        }, {})),
+        ("time_blocks", "GET /time-blocks?date_filter", lambda f, rng: (
+            "GET", f"{api}/time-blocks?date_filter={day(rng)}", None, {})),
+        ("time_blocks", "GET /time-blocks", lambda f, rng: ("GET", f"{api}/time-blocks", None, {})),
+        ("time_blocks", "POST /time-blocks", lambda f, rng: ("POST", f"{api}/time-blocks", {
+            "date": day(rng), "start_time": "07:00:00", "end_time": "07:30:00", "allow_overlap": True
+        }, {})),
+        ("time_blocks", "GET /time-blocks/conflicts", lambda f, rng: (
+            "GET", f"{api}/time-blocks/conflicts?start_date={BENCH_START_DATE.isoformat()}&end_date={day(rng)}", None, {})),
+        ("subscription", "GET /subscription/status", lambda f, rng: ("GET", f"{api}/subscription/status", None, {})),
+        ("subscription", "POST /subscription/initialize", lambda f, rng: (
+            "POST", f"{api}/subscription/initialize", {"tier": "monthly", "email": f["email"]}, {})),
+    ]
+
+
+def percentile(sorted_samples, fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    index = max(0, min(len(sorted_samples) - 1, round(fraction * len(sorted_samples) + 0.5) - 1))
+    return sorted_samples[index]
+
+
+async def run_scenario(client, fixtures, factory, requests: int, concurrency: int, warmup: int, seed: int):
+    """Issue `requests` calls from `concurrency` workers; returns latencies, errors, SQL totals and wall time"""
+    from app.db.query_stats import QueryStats, track_queries
+
+    next_index = 0
+    latencies, errors, db = [], 0, QueryStats()
+
+    async def worker(limit: int, record: bool):
+        nonlocal next_index, errors
+        while next_index < limit:
+            i = next_index
+            next_index += 1
+            rng = random.Random(seed * 1_000_003 + i)
+            fixture = fixtures[i % len(fixtures)]
+            method, url, body, headers = factory(fixture, rng)
+            started = time.perf_counter()
+            # The in-process transport runs the app in this task, so the scope sees its statements
+            with track_queries() as stats:
+                response = await client.request(method, url, json=body, headers={**fixture["headers"], **headers})
+            elapsed = time.perf_counter() - started
+            if record:
+                latencies.append(elapsed)
+                db.statements += stats.statements
+                db.rows += stats.rows
+                db.seconds += stats.seconds
+                if response.status_code >= 400:
+                    errors += 1
+
+    await asyncio.gather(*[worker(warmup, False) for _ in range(concurrency)])
+
+    next_index = 0
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(requests, True) for _ in range(concurrency)])
+    wall = time.perf_counter() - started
+    return latencies, errors, db, wall
+
+
+async def run_benchmarks(args):
+    import httpx
+    from app.core.config import settings
+    from app.main import app
+
+    results = []
+    async with app.router.lifespan_context(app):
+        fixtures = await load_fixtures()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for fixture in fixtures:
+                response = await client.get(f"{settings.API_V1_STR}/dashboard/stats", headers=fixture["headers"])
+                fixture["dashboard_etag"] = response.headers.get("etag", "")
+
+            for router, name, factory in scenarios(settings.API_V1_STR):
+                if args.routers and router not in args.routers:
+                    continue
+                latencies, errors, db, wall = await run_scenario(
+                    client, fixtures, factory, args.requests, args.concurrency, args.warmup, args.seed
+                )
+                latencies.sort()
+                result = {
+                    "router": router,
+                    "scenario": name,
+                    "requests": len(latencies),
+                    "errors": errors,
+                    "p50_ms": percentile(latencies, 0.50) * 1e3,
+                    "p95_ms": percentile(latencies, 0.95) * 1e3,
+                    "p99_ms": percentile(latencies, 0.99) * 1e3,
+                    "mean_ms": statistics.fmean(latencies) * 1e3,
+                    "throughput_rps": len(latencies) / wall,
+                    "queries_per_request": db.statements / len(latencies),
+                    "rows_per_request": db.rows / len(latencies),
+                    "db_ms_per_request": db.seconds * 1e3 / len(latencies)
+                }
+                results.append(result)
+                print(
+                    f"{name:<38} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                    f"{result['throughput_rps']:>9.1f} {result['queries_per_request']:>7.2f} "
+                    f"{result['db_ms_per_request']:>6.2f} {errors:>6}"
+                )
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(base_path: str, new_path: str) -> None:
+    """Print per-scenario changes between two result files"""
+    with open(base_path) as f:
+        base = {r["scenario"]: r for r in json.load(f)["scenarios"]}
+    with open(new_path) as f:
+        new = json.load(f)["scenarios"]
+
+    def change(old, current):
+        return f"{(current - old) / old * 100:+7.1f}%" if old else "    n/a"
+
+    print(f"{'scenario':<38} {'p50':>9} {'p95':>9} {'rps':>9} {'queries':>13}")
+    for result in new:
+        old = base.get(result["scenario"])
+        if old is None:
+            print(f"{result['scenario']:<38} (new)")
+            continue
+        print(
+            f"{result['scenario']:<38} {change(old['p50_ms'], result['p50_ms'])} {change(old['p95_ms'], result['p95_ms'])} "
+            f"{change(old['throughput_rps'], result['throughput_rps'])} "
+            f"{old['queries_per_request']:>5.2f} -> {result['queries_per_request']:<5.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every API router against a seeded SQLite stand-in")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--mix", help="user profile shares, e.g. power=0.02,regular=0.18,light=0.8")
+    parser.add_argument("--seed-workers", type=int, default=1, help="processes used to generate the data")
+    parser.add_argument("--bcrypt-rounds", type=int, default=4, help="cost for seeded passwords and login")
+    parser.add_argument("--routers", nargs="*", help="only these routers, e.g. tasks time_blocks")
+    parser.add_argument("--db", help="SQLite file to create (default: a fresh temporary file)")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="blockr-bench-"), "bench.db")
+    if os.path.exists(db_path):
+        sys.exit(f"{db_path} already exists; the benchmark seeds a fresh database")
+    configure_environment(db_path, args.bcrypt_rounds)
+
+    started = time.perf_counter()
+    seed_database(args.users, args.seed, args.mix, args.seed_workers)
+    print(f"Seeded {args.users} users into {db_path} in {time.perf_counter() - started:.1f}s\n")
+
+    print(f"{'scenario':<38} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>9} {'queries':>7} {'db ms':>6} {'errors':>6}")
+    results = asyncio.run(run_benchmarks(args))
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.utcnow().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "users": args.users,
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "concurrency": args.concurrency,
+                "seed": args.seed,
+                "mix": args.mix,
+                "bcrypt_rounds": args.bcrypt_rounds
+            },
+            "scenarios": results
+        }, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
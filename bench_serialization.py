@@ -0,0 +1,152 @@
+import asyncio
+import json
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from datetime import time as clock
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.api.responses import ORJSONResponse, serialize
+from app.models.task import Task
+from app.models.time_block import TimeBlock, TimeBlockStatus
+from app.schemas.task import TaskResponse, TaskPage
+from app.schemas.time_block import TimeBlockResponse, TimeBlockPage
+
+
+def make_time_blocks(count: int):
+    """Transient ORM rows shaped like a GET /time-blocks page"""
+    now = datetime.utcnow()
+    statuses = list(TimeBlockStatus)
+    rows = []
+    for i in range(count):
+        block = TimeBlock(
+            time_block_id=str(uuid.uuid4()),
+            user_id=str(uuid.uuid4()),
+            task_id=str(uuid.uuid4()) if i % 2 else None,
+            date=date(2026, 1, 1) + timedelta(days=i // 8),
+            start_time=clock(8 + i % 8, 0),
+            end_time=clock(9 + i % 8, 0),
+            status=statuses[i % len(statuses)],
+            notes="Deep work" if i % 3 else None,
+            completed_at=now if i % 3 == 1 else None,
+            created_at=now
+        )
+        rows.append((block, f"Task {i}" if block.task_id else None))
+    return rows
+
+
+def make_tasks(count: int):
+    """Transient ORM rows shaped like a GET /task-lists/{id}/tasks page"""
+    now = datetime.utcnow()
+    task_list_id = str(uuid.uuid4())
+    return [
+        Task(
+            task_id=str(uuid.uuid4()),
+            task_list_id=task_list_id,
+            title=f"Task {i}",
+            is_completed=bool(i % 2),
+            completed_at=now if i % 2 else None,
+            order_index=i,
+            created_at=now
+        )
+        for i in range(count)
+    ]
+
+
+def time_blocks_by_hand(rows):
+    """The hand-built dicts the endpoint used to return"""
+    return {"time_blocks": [
+        {
+            "time_block_id": tb.time_block_id,
+            "user_id": tb.user_id,
+            "task_id": tb.task_id,
+            "date": tb.date,
+            "start_time": str(tb.start_time),
+            "end_time": str(tb.end_time),
+            "status": tb.status.value,
+            "notes": tb.notes,
+            "completed_at": tb.completed_at,
+            "created_at": tb.created_at,
+            "task_title": task_title
+        }
+        for tb, task_title in rows
+    ], "next_cursor": None}
+
+
+def tasks_by_hand(tasks):
+    return {"tasks": [
+        {
+            "task_id": task.task_id,
+            "task_list_id": task.task_list_id,
+            "title": task.title,
+            "is_completed": task.is_completed,
+            "completed_at": task.completed_at,
+            "order_index": task.order_index,
+            "created_at": task.created_at
+        }
+        for task in tasks
+    ], "next_cursor": None}
+
+
+def time_blocks_serialized(rows):
+    return {
+        "time_blocks": [serialize(TimeBlockResponse, tb, task_title=task_title) for tb, task_title in rows],
+        "next_cursor": None
+    }
+
+
+def tasks_serialized(tasks):
+    return {"tasks": [serialize(TaskResponse, task) for task in tasks], "next_cursor": None}
+
+
+async def render_via_fastapi(content, response_type) -> bytes:
+    """What FastAPI does with a returned value: validate against the response model, jsonable_encoder, json.dumps"""
+    field = create_response_field(name=f"Response_{response_type.__name__}", type_=response_type)
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+def best_of(repeats: int, fn) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_case(label, rows, by_hand, serialized, page_model, repeats):
+    loop = asyncio.new_event_loop()
+    count = len(rows)
+
+    paths = [
+        ("hand-built dict, response_model=dict", lambda: loop.run_until_complete(render_via_fastapi(by_hand(rows), dict))),
+        (f"validated response_model={page_model.__name__}", lambda: loop.run_until_complete(render_via_fastapi(serialized(rows), page_model))),
+        ("serialize() + ORJSONResponse", lambda: ORJSONResponse(serialized(rows)).body),
+    ]
+
+    # Every path must produce the same document
+    documents = [json.loads(fn()) for _, fn in paths]
+    assert all(document == documents[0] for document in documents[1:]), f"{label}: outputs differ"
+
+    print(f"== {label}: {count} rows, best of {repeats}")
+    baseline = None
+    for name, fn in paths:
+        seconds = best_of(repeats, fn)
+        baseline = baseline or seconds
+        print(f"{name:<48} {seconds * 1e3:8.2f} ms  {seconds / count * 1e6:7.2f} us/row  {baseline / seconds:5.1f}x")
+    print()
+    loop.close()
+
+
+def bench_serialization(count: int = 1000, repeats: int = 20):
+    """Compare per-row serialization cost of the old and new response paths"""
+    run_case("GET /time-blocks", make_time_blocks(count), time_blocks_by_hand, time_blocks_serialized, TimeBlockPage, repeats)
+    run_case("GET /task-lists/{id}/tasks", make_tasks(count), tasks_by_hand, tasks_serialized, TaskPage, repeats)
+
+if __name__ == "__main__":
+    bench_serialization(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    )
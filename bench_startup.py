@@ -0,0 +1,101 @@
+import time
+
+PROCESS_STARTED = time.perf_counter()
+
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_TARGETS = ("app.db.database", "app.db.base", "app.main")
+
+
+def child_import(module: str) -> dict:
+    """Seconds to import one module in a fresh interpreter"""
+    started = time.perf_counter()
+    __import__(module)
+    return {"seconds": time.perf_counter() - started}
+
+
+async def child_first_request() -> dict:
+    """Phases from a cold process to the first answered requests"""
+    import httpx
+    from app.main import app
+    from app.core.config import settings
+    imported = time.perf_counter()
+
+    async with app.router.lifespan_context(app):
+        started_up = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/health")
+            first_response = time.perf_counter()
+            # Unknown email: one user lookup, no password hashing
+            await client.post(
+                f"{settings.API_V1_STR}/auth/login",
+                json={"email": "nobody@example.com", "password": "not-a-password"}
+            )
+            first_query = time.perf_counter()
+
+    return {
+        "import": imported - PROCESS_STARTED,
+        "startup": started_up - imported,
+        "first_response": first_response - PROCESS_STARTED,
+        "first_db_response": first_query - PROCESS_STARTED
+    }
+
+
+def run_child(*args: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", *args],
+        check=True,
+        capture_output=True,
+        text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    return {"median": statistics.median(samples), "min": min(samples), "max": max(samples)}
+
+
+def prepare_database() -> None:
+    """Make sure the tables exist so the first query measures a query, not an error"""
+    from app.db.base import Base
+    from app.db.database import get_engine
+    Base.metadata.create_all(bind=get_engine())
+
+
+def bench_startup(runs: int = 5, output_path: str = None):
+    """Import time and time to first request, each measured in fresh interpreters"""
+    prepare_database()
+    results = {}
+
+    for module in IMPORT_TARGETS:
+        results[f"import {module}"] = summarize([run_child("import", module)["seconds"] for _ in range(runs)])
+
+    phases = [run_child("first-request") for _ in range(runs)]
+    for phase in phases[0]:
+        results[f"first request: {phase}"] = summarize([sample[phase] for sample in phases])
+
+    print(f"{'measurement':<40} {'median ms':>10} {'min ms':>8} {'max ms':>8}   ({runs} runs)")
+    for name, summary in results.items():
+        print(f"{name:<40} {summary['median'] * 1e3:>10.1f} {summary['min'] * 1e3:>8.1f} {summary['max'] * 1e3:>8.1f}")
+
+    if output_path:
+        with open(output_path, "w") as f:
+            json.dump({"runs": runs, "results": results}, f, indent=2)
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        if sys.argv[2] == "import":
+            result = child_import(sys.argv[3])
+        else:
+            result = asyncio.run(child_first_request())
+        print(json.dumps(result))
+    else:
+        bench_startup(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+            sys.argv[2] if len(sys.argv) > 2 else None
+        )
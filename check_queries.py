@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+
+from bench_endpoints import configure_environment, seed_database, load_fixtures, scenarios
+
+# Most statements one request may issue, per benchmark scenario. One more than
+# the steady state where a cold principal cache costs a user lookup.
+QUERY_BUDGETS = {
+    "GET /auth/me": 1,
+    "POST /auth/login": 1,
+    "GET /dashboard/stats": 3,
+    "GET /dashboard/stats (If-None-Match)": 2,
+    "GET /task-lists": 4,
+    "GET /task-lists/{id}": 3,
+    "GET /task-lists/{id}/tasks": 4,
+    "POST /task-lists": 5,
+    "GET /tasks/{id}": 2,
+    "PATCH /tasks/{id}/toggle": 6,
+    "POST /tasks": 7,
+    "PATCH /tasks/bulk": 4,
+    "GET /time-blocks?date_filter": 3,
+    "GET /time-blocks": 3,
+    "POST /time-blocks": 10,
+    "GET /time-blocks/conflicts": 2,
+    "GET /subscription/status": 2,
+    "POST /subscription/initialize": 1,
+}
+
+
+async def check_budgets(seed: int) -> int:
+    """Send every scenario once per seeded user under its budget; returns the number of failures"""
+    import httpx
+    from app.core.config import settings
+    from app.db.query_stats import assert_max_queries
+    from app.main import app
+
+    failures = 0
+    async with app.router.lifespan_context(app):
+        fixtures = await load_fixtures()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://check", timeout=60) as client:
+            for router, name, factory in scenarios(settings.API_V1_STR):
+                budget = QUERY_BUDGETS[name]
+                worst = 0
+                try:
+                    for i, fixture in enumerate(fixtures):
+                        method, url, body, headers = factory(fixture, random.Random(seed * 1_000_003 + i))
+                        with assert_max_queries(budget, label=f"{name} as {fixture['email']}") as stats:
+                            response = await client.request(
+                                method, url, json=body, headers={**fixture["headers"], **headers}
+                            )
+                        worst = max(worst, stats.statements)
+                        if response.status_code >= 400:
+                            raise AssertionError(f"{name} as {fixture['email']} returned {response.status_code}")
+                except AssertionError as e:
+                    failures += 1
+                    print(f"✗ {e}\n")
+                    continue
+                print(f"✓ {name:<38} {worst:>3} / {budget} queries")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when an endpoint issues more SQL statements than its budget")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(prefix="blockr-queries-"), "queries.db")
+    configure_environment(db_path, bcrypt_rounds=4)
+    # Plenty of power users, so per-row query patterns show up as large counts
+    seed_database(args.users, args.seed, mix="power=0.3,regular=0.3,light=0.4")
+
+    failures = asyncio.run(check_budgets(args.seed))
+    if failures:
+        sys.exit(f"{failures} endpoint(s) over their query budget")
+    print("All endpoints within their query budgets")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import sys
+from datetime import date
+from sqlalchemy import text, func, and_
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.user import User
+from app.models.task_list import TaskList, TaskListStatus
+from app.models.task import Task
+from app.models.time_block import TimeBlock, TimeBlockStatus
+from app.models.subscription import Subscription
+from app.models.user_stats import UserStats, UserDayStats
+
+PLACEHOLDER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def endpoint_queries(db: Session, user_id: str, task_list_id: str, today: date):
+    """The statement shapes each endpoint issues, labelled by route"""
+    return [
+        ("auth: get_current_user", db.query(User).filter(User.user_id == user_id).limit(1)),
+        ("POST /auth/login", db.query(User).filter(User.email == "someone@example.com").limit(1)),
+        ("GET /dashboard/stats", db.query(UserStats, UserDayStats).outerjoin(
+            UserDayStats,
+            and_(UserDayStats.user_id == UserStats.user_id, UserDayStats.date == today)
+        ).filter(UserStats.user_id == user_id).limit(1)),
+        ("GET /task-lists", db.query(TaskList).filter(
+            TaskList.user_id == user_id
+        ).order_by(TaskList.created_at, TaskList.task_list_id).limit(101)),
+        ("GET /task-lists: task counts", db.query(func.count(Task.task_id)).filter(
+            Task.task_list_id == task_list_id,
+            Task.is_completed == True
+        )),
+        ("GET /task-lists/{id}/tasks", db.query(Task).filter(
+            Task.task_list_id == task_list_id
+        ).order_by(Task.order_index, Task.task_id)),
+        ("GET /time-blocks", db.query(TimeBlock, Task.title).outerjoin(
+            Task, TimeBlock.task_id == Task.task_id
+        ).filter(TimeBlock.user_id == user_id).order_by(
+            TimeBlock.date, TimeBlock.start_time, TimeBlock.time_block_id
+        ).limit(101)),
+        ("GET /time-blocks?date_filter", db.query(TimeBlock, Task.title).outerjoin(
+            Task, TimeBlock.task_id == Task.task_id
+        ).filter(TimeBlock.user_id == user_id, TimeBlock.date == today).order_by(
+            TimeBlock.date, TimeBlock.start_time, TimeBlock.time_block_id
+        ).limit(101)),
+        ("stats recount: task lists", db.query(func.count(TaskList.task_list_id)).filter(
+            TaskList.user_id == user_id,
+            TaskList.status == TaskListStatus.COMPLETED
+        )),
+        ("stats recount: time blocks", db.query(func.count(TimeBlock.time_block_id)).filter(
+            TimeBlock.user_id == user_id,
+            TimeBlock.date == today,
+            TimeBlock.status == TimeBlockStatus.COMPLETED
+        )),
+        ("GET /subscription/status", db.query(Subscription).filter(
+            Subscription.user_id == user_id
+        ).order_by(Subscription.created_at.desc()).limit(1)),
+    ]
+
+
+def explain_queries(user_id: str = None):
+    """Print the database's plan for every endpoint query shape"""
+    db = SessionLocal()
+    try:
+        dialect = db.get_bind().dialect
+        prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+
+        user_id = user_id or db.query(User.user_id).limit(1).scalar() or PLACEHOLDER_ID
+        task_list_id = db.query(TaskList.task_list_id).filter(
+            TaskList.user_id == user_id
+        ).limit(1).scalar() or PLACEHOLDER_ID
+
+        for label, query in endpoint_queries(db, user_id, task_list_id, date.today()):
+            sql = str(query.statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            result = db.execute(text(prefix + sql))
+            print(f"== {label}")
+            print(sql)
+            print("-- plan:")
+            print("\t".join(result.keys()))
+            for row in result:
+                print("\t".join("" if value is None else str(value) for value in row))
+            print()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    explain_queries(sys.argv[1] if len(sys.argv) > 1 else None)
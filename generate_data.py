@@ -0,0 +1,321 @@
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, time as clock, timedelta
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import create_engine, insert, func, select
+from app.db.database import engine_config
+from app.db.base import Base, User, TaskList, Task, TimeBlock, UserStats, UserDayStats
+from app.models.task_list import TaskListStatus
+from app.models.time_block import TimeBlockStatus
+from app.models.user import SubscriptionTier
+from app.services.stats import USER_COUNTERS, DAY_COUNTERS
+
+# Synthetic users are generated one at a time from their own seeded random
+# stream, so the rows for user N are the same whatever the worker count or
+# chunk size. Counters are written alongside, so no rebuild is needed.
+
+TABLE_ORDER = (User, TaskList, Task, TimeBlock, UserStats, UserDayStats)
+DURATION_DAYS = {"daily": 1, "weekly": 7, "monthly": 30}
+
+
+class UserProfile(NamedTuple):
+    task_lists: Tuple[int, int]  # per user, skewed towards the low end
+    tasks_per_list: Tuple[int, int]
+    active_day_ratio: float  # share of days in the spread with any time blocks
+    blocks_per_day: Tuple[int, int]
+    subscriber_ratio: float
+
+
+PROFILES = {
+    "power": UserProfile((150, 400), (10, 40), 0.9, (6, 12), 0.6),
+    "regular": UserProfile((20, 60), (5, 15), 0.5, (3, 6), 0.1),
+    "light": UserProfile((1, 8), (2, 8), 0.1, (1, 3), 0.0),
+}
+
+
+class GeneratorConfig(NamedTuple):
+    users: int = 1000
+    seed: int = 1
+    mix: Tuple[Tuple[str, float], ...] = (("power", 0.02), ("regular", 0.18), ("light", 0.80))
+    start_date: date = date(2025, 1, 1)
+    days: int = 365
+    as_of: Optional[date] = None  # days before this are in the past; defaults to two weeks before the end
+    task_completion: float = 0.7  # for lists that have started
+    block_completed: float = 0.65  # for past days
+    block_missed: float = 0.2
+    email_prefix: str = "user"
+    password_hash: str = ""
+
+    @property
+    def cutoff(self) -> date:
+        return self.as_of or self.start_date + timedelta(days=max(self.days - 14, 0))
+
+
+def parse_mix(value: str) -> Tuple[Tuple[str, float], ...]:
+    """'power=0.02,regular=0.18,light=0.8' -> normalized (profile, share) pairs"""
+    pairs = []
+    for part in value.split(","):
+        name, _, share = part.partition("=")
+        if name.strip() not in PROFILES:
+            raise ValueError(f"Unknown profile {name!r}; choose from {', '.join(PROFILES)}")
+        pairs.append((name.strip(), float(share)))
+    total = sum(share for _, share in pairs)
+    if total <= 0:
+        raise ValueError("Profile shares must add up to more than zero")
+    return tuple((name, share / total) for name, share in pairs)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _skewed(rng: random.Random, bounds: Tuple[int, int]) -> int:
+    low, high = bounds
+    return int(rng.triangular(low, high + 1, low))
+
+
+def seeded_password_hash(password: str, seed: int) -> str:
+    """bcrypt hash with a salt drawn from the seed, so even the users table is reproducible"""
+    from passlib.hash import bcrypt
+    from passlib.utils.binary import bcrypt64
+    from app.core import security
+    salt = bcrypt64.repair_unused(bcrypt64.encode_bytes(random.Random(f"{seed}:password").randbytes(16))[:22])
+    return bcrypt.using(rounds=security.bcrypt_rounds, salt=salt.decode()).hash(password)
+
+
+def generate_user(config: GeneratorConfig, index: int) -> Dict[type, List[dict]]:
+    """Every row belonging to synthetic user `index`, keyed by model"""
+    rng = random.Random(f"{config.seed}:{index}")
+    roll, profile = rng.random(), PROFILES[config.mix[-1][0]]
+    for name, share in config.mix:
+        if roll < share:
+            profile = PROFILES[name]
+            break
+        roll -= share
+
+    cutoff = config.cutoff
+    joined = datetime.combine(config.start_date, clock(9)) - timedelta(days=rng.randrange(1, 365))
+    user_id = _uuid(rng)
+    subscribed = rng.random() < profile.subscriber_ratio
+    rows = {model: [] for model in TABLE_ORDER}
+    rows[User].append({
+        "user_id": user_id,
+        "email": f"{config.email_prefix}{index}@example.com",
+        "name": f"User {index}",
+        "password_hash": config.password_hash,
+        "subscription_tier": rng.choice([SubscriptionTier.MONTHLY, SubscriptionTier.YEARLY]) if subscribed else SubscriptionTier.FREE,
+        "subscription_expires_at": datetime.combine(cutoff, clock()) + timedelta(days=30) if subscribed else None,
+        "created_at": joined,
+        "updated_at": joined,
+        "data_version": 0
+    })
+
+    totals = Counter()
+    task_ids = []
+    for _ in range(_skewed(rng, profile.task_lists)):
+        duration_type = rng.choice(("daily", "weekly", "weekly", "monthly"))
+        start = config.start_date + timedelta(days=rng.randrange(config.days))
+        end = start + timedelta(days=DURATION_DAYS[duration_type] - 1)
+        created_at = datetime.combine(start, clock(8)) - timedelta(minutes=rng.randrange(1, 600))
+        started = start <= cutoff
+        status = TaskListStatus.ACTIVE
+        if end < cutoff:
+            status = TaskListStatus.COMPLETED if rng.random() < config.task_completion else (
+                TaskListStatus.ARCHIVED if rng.random() < 0.3 else TaskListStatus.ACTIVE
+            )
+        task_list_id = _uuid(rng)
+        rows[TaskList].append({
+            "task_list_id": task_list_id,
+            "user_id": user_id,
+            "title": f"{duration_type.title()} plan {start.isoformat()}",
+            "duration_type": duration_type,
+            "start_date": start,
+            "end_date": end,
+            "status": status,
+            "created_at": created_at,
+            "completed_at": datetime.combine(end, clock(18)) if status == TaskListStatus.COMPLETED else None
+        })
+        totals["total_task_lists"] += 1
+        totals["completed_task_lists"] += status == TaskListStatus.COMPLETED
+
+        for order_index in range(_skewed(rng, profile.tasks_per_list)):
+            completed = status == TaskListStatus.COMPLETED or (started and rng.random() < config.task_completion)
+            task_id = _uuid(rng)
+            task_ids.append(task_id)
+            rows[Task].append({
+                "task_id": task_id,
+                "task_list_id": task_list_id,
+                "title": f"Task {order_index + 1}",
+                "is_completed": completed,
+                "completed_at": datetime.combine(start, clock(12)) + timedelta(minutes=rng.randrange(600)) if completed else None,
+                "order_index": order_index,
+                "created_at": created_at
+            })
+            totals["total_tasks"] += 1
+            totals["completed_tasks"] += completed
+
+    for offset in range(config.days):
+        if rng.random() >= profile.active_day_ratio:
+            continue
+        day = config.start_date + timedelta(days=offset)
+        past = day < cutoff
+        minute = 7 * 60 + rng.choice((0, 30, 60))
+        day_totals = Counter()
+        for _ in range(_skewed(rng, profile.blocks_per_day)):
+            length = rng.choice((30, 45, 60, 60, 90, 120))
+            if minute + length >= 24 * 60:
+                break
+            status, roll = TimeBlockStatus.PENDING, rng.random()
+            if past and roll < config.block_completed:
+                status = TimeBlockStatus.COMPLETED
+            elif past and roll < config.block_completed + config.block_missed:
+                status = TimeBlockStatus.MISSED
+            end_minute = minute + length
+            rows[TimeBlock].append({
+                "time_block_id": _uuid(rng),
+                "user_id": user_id,
+                "task_id": rng.choice(task_ids) if task_ids and rng.random() < 0.6 else None,
+                "date": day,
+                "start_time": clock(minute // 60, minute % 60),
+                "end_time": clock(end_minute // 60, end_minute % 60),
+                "status": status,
+                "notes": None,
+                "completed_at": datetime.combine(day, clock(end_minute // 60, end_minute % 60)) if status == TimeBlockStatus.COMPLETED else None,
+                "created_at": datetime.combine(day, clock(6))
+            })
+            day_totals["total_time_blocks"] += 1
+            day_totals["completed_time_blocks"] += status == TimeBlockStatus.COMPLETED
+            day_totals["missed_time_blocks"] += status == TimeBlockStatus.MISSED
+            minute = end_minute + rng.choice((0, 0, 15, 30, 60))
+        if day_totals:
+            rows[UserDayStats].append({
+                "user_id": user_id,
+                "date": day,
+                "updated_at": joined,
+                **{name: day_totals[name] for name in DAY_COUNTERS}
+            })
+
+    rows[UserStats].append({
+        "user_id": user_id,
+        "updated_at": joined,
+        **{name: totals[name] for name in USER_COUNTERS}
+    })
+    return rows
+
+
+_worker_engine = None
+
+
+def _init_worker() -> None:
+    """One engine per worker process; SQLite workers queue for the write lock instead of failing"""
+    global _worker_engine
+    config = engine_config()
+    connect_args = dict(config.connect_args)
+    if config.sync_url.startswith("sqlite"):
+        connect_args["timeout"] = 120
+    _worker_engine = create_engine(config.sync_url, connect_args=connect_args, **config.pool_args)
+
+
+def write_users(job: Tuple[GeneratorConfig, int, int, int]) -> Dict[str, int]:
+    """Generate users [first, last) and insert them one chunked transaction per table batch"""
+    config, first, last, chunk_size = job
+    if _worker_engine is None:
+        _init_worker()
+
+    rows = {model: [] for model in TABLE_ORDER}
+    for index in range(first, last):
+        for model, values in generate_user(config, index).items():
+            rows[model].extend(values)
+
+    # Parents first, so the batch is valid with foreign keys enforced
+    for model in TABLE_ORDER:
+        values = rows[model]
+        for start in range(0, len(values), chunk_size):
+            with _worker_engine.begin() as conn:
+                conn.execute(insert(model), values[start:start + chunk_size])
+    return {model.__tablename__: len(values) for model, values in rows.items()}
+
+
+def generate(config: GeneratorConfig, workers: int = 1, users_per_job: int = 20, chunk_size: int = 5000,
+             progress: bool = False) -> Dict[str, int]:
+    """Create the tables if needed and write `config.users` synthetic users; returns rows per table"""
+    _init_worker()
+    Base.metadata.create_all(bind=_worker_engine)
+    with _worker_engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(User).where(
+            User.email.like(f"{config.email_prefix}%@example.com")
+        )).scalar():
+            raise RuntimeError(f"Users with the '{config.email_prefix}' prefix already exist; pick another --email-prefix")
+
+    jobs = [(config, first, min(first + users_per_job, config.users), chunk_size)
+            for first in range(0, config.users, users_per_job)]
+    written = Counter()
+    started = time.perf_counter()
+
+    if workers > 1:
+        # spawn, not fork: children build their own engines instead of inheriting pooled sockets
+        with multiprocessing.get_context("spawn").Pool(workers, initializer=_init_worker) as pool:
+            results = pool.imap_unordered(write_users, jobs)
+            for done, counts in enumerate(results, 1):
+                written.update(counts)
+                if progress:
+                    _report(done, len(jobs), written, started)
+    else:
+        for done, job in enumerate(jobs, 1):
+            written.update(write_users(job))
+            if progress:
+                _report(done, len(jobs), written, started)
+    _worker_engine.dispose()
+    return dict(written)
+
+
+def _report(done: int, total: int, written: Counter, started: float) -> None:
+    rows = sum(written.values())
+    print(f"\r{done}/{total} batches, {rows} rows, {rows / (time.perf_counter() - started):,.0f} rows/s",
+          end="", file=sys.stderr, flush=True)
+
+
+def main():
+    defaults = GeneratorConfig()
+    parser = argparse.ArgumentParser(description="Fill the configured database with synthetic Blockr users")
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--mix", type=parse_mix, default=defaults.mix,
+                        help="profile shares, e.g. power=0.02,regular=0.18,light=0.8")
+    parser.add_argument("--start-date", type=date.fromisoformat, default=defaults.start_date)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--as-of", type=date.fromisoformat, help="first day treated as the future")
+    parser.add_argument("--task-completion", type=float, default=defaults.task_completion)
+    parser.add_argument("--block-completed", type=float, default=defaults.block_completed)
+    parser.add_argument("--block-missed", type=float, default=defaults.block_missed)
+    parser.add_argument("--email-prefix", default=defaults.email_prefix)
+    parser.add_argument("--password", default="password123", help="shared password for every synthetic user")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--users-per-job", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per INSERT transaction")
+    args = parser.parse_args()
+
+    config = GeneratorConfig(
+        users=args.users, seed=args.seed, mix=args.mix, start_date=args.start_date, days=args.days,
+        as_of=args.as_of, task_completion=args.task_completion, block_completed=args.block_completed,
+        block_missed=args.block_missed, email_prefix=args.email_prefix,
+        password_hash=seeded_password_hash(args.password, args.seed)
+    )
+
+    print(f"Generating {config.users} users into {engine_config().description} with {args.workers} worker(s)...")
+    started = time.perf_counter()
+    written = generate(config, args.workers, args.users_per_job, args.chunk_size, progress=True)
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    for table, rows in written.items():
+        print(f"  {table:<16} {rows:>12,}")
+    total = sum(written.values())
+    print(f"✅ Wrote {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
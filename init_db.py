@@ -1,12 +1,19 @@
-from app.db.database import engine
+import asyncio
+from app.db.database import get_engine, dispose_engines
 from app.db.base import Base
+from app.db.seed import seed_superuser
 from app.core.config import settings
 
+async def _seed():
+    await seed_superuser()
+    await dispose_engines()
+
 def init_db():
-    """Initialize database - create all tables"""
+    """Initialize database - create all tables and the superuser account"""
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     print("✅ Database tables created successfully!")
+    asyncio.run(_seed())
 
 if __name__ == "__main__":
-    init_db()
\ No newline at end of file
+    init_db()
@@ -0,0 +1,15 @@
+import asyncio
+import sys
+from app.db.database import AsyncSessionLocal
+from app.services.stats import rebuild_all_user_stats
+
+
+async def rebuild_stats(user_id: str = None):
+    """Recompute dashboard counters from the source tables"""
+    print("Rebuilding dashboard counters...")
+    async with AsyncSessionLocal() as db:
+        rebuilt = await rebuild_all_user_stats(db, user_id)
+    print(f"✅ Rebuilt counters for {rebuilt} user(s)!")
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_stats(sys.argv[1] if len(sys.argv) > 1 else None))
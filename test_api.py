@@ -1,6 +1,6 @@
-from app.db.database import engine
+from app.db.database import get_engine
 from app.db.base import Base
 
 # Create tables
-Base.metadata.create_all(bind=engine)
+Base.metadata.create_all(bind=get_engine())
 print("✅ Database ready!")
\ No newline at end of file
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import uuid
+
+# Settings are read when app modules are imported, so the environment has to
+# be in place first. Tests run against a throwaway SQLite file with cheap
+# bcrypt and the in-process Paystack fake.
+_db_dir = tempfile.mkdtemp(prefix="blockr-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{os.path.join(_db_dir, 'tests.db')}",
+    "DB_CREATE_TABLES_ON_STARTUP": "true",
+    "SECRET_KEY": "test-secret-key",
+    "BCRYPT_ROUNDS": "4",
+    "PASSWORD_HASH_WORKERS": "0",
+    "PAYSTACK_SECRET_KEY": "sk_test_tests",
+    "PAYSTACK_PUBLIC_KEY": "pk_test_tests",
+    "PAYSTACK_USE_MOCK": "true",
+    "FIRST_SUPERUSER_EMAIL": "admin@example.com",
+    "FIRST_SUPERUSER_PASSWORD": "admin-password",
+})
+
+import pytest
+from fastapi.testclient import TestClient
+
+API = "/api/v1"
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def register(client) -> dict:
+    """Sign up a new user; returns their Authorization header"""
+    response = client.post(f"{API}/auth/signup", json={
+        "email": f"user-{uuid.uuid4().hex[:12]}@example.com",
+        "name": "Test User",
+        "password": "test-password"
+    })
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+@pytest.fixture
+def auth_headers(client):
+    """Authorization headers for a freshly registered user"""
+    return register(client)
+
+
+@pytest.fixture
+def make_task_list(client):
+    def make(headers, title="Week"):
+        response = client.post(f"{API}/task-lists", json={
+            "title": title,
+            "duration_type": "weekly",
+            "start_date": "2026-10-12",
+            "end_date": "2026-10-18"
+        }, headers=headers)
+        assert response.status_code == 200, response.text
+        return response.json()["task_list"]["task_list_id"]
+    return make
+
+
+@pytest.fixture
+def tracked_request(client):
+    """Send one request on the app's own event loop, so query tracking sees its statements.
+
+    Returns (response, QueryStats) with the SQL recorded.
+    """
+    import httpx
+    from app.db.query_stats import track_queries
+    
+    async def send(method, url, **kwargs):
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            with track_queries(record_statements=True) as stats:
+                response = await async_client.request(method, url, **kwargs)
+        return response, stats
+    
+    return lambda method, url, **kwargs: client.portal.call(lambda: send(method, url, **kwargs))
+
+
+@pytest.fixture
+def world(client, auth_headers, make_task_list):
+    """Two lists with tasks, a time block on one task, and the URLs the cache serves"""
+    first, second = make_task_list(auth_headers, "First"), make_task_list(auth_headers, "Second")
+    task_id = client.post(f"{API}/tasks", json={"task_list_id": first, "title": "Write"}, headers=auth_headers).json()["task"]["task_id"]
+    client.post(f"{API}/tasks/bulk", json={"task_list_id": second, "titles": ["a", "b"]}, headers=auth_headers)
+    time_block_id = client.post(f"{API}/time-blocks", json={
+        "task_id": task_id, "date": "2026-10-14", "start_time": "09:00:00", "end_time": "10:00:00"
+    }, headers=auth_headers).json()["time_block"]["time_block_id"]
+    return {
+        "headers": auth_headers,
+        "first": first,
+        "second": second,
+        "task_id": task_id,
+        "time_block_id": time_block_id,
+        "urls": [
+            "/task-lists",
+            f"/task-lists/{first}",
+            f"/task-lists/{first}/tasks",
+            f"/task-lists/{second}",
+            f"/task-lists/{second}/tasks",
+            "/time-blocks",
+            "/time-blocks?date_filter=2026-10-14",
+        ]
+    }
+
+
+# Every data write the API offers, as a call against the world fixture
+WRITES = {
+    "create task": lambda c, w: c.post(f"{API}/tasks", json={"task_list_id": w["first"], "title": "New"}, headers=w["headers"]),
+    "bulk create tasks": lambda c, w: c.post(f"{API}/tasks/bulk", json={"task_list_id": w["first"], "titles": ["x", "y"]}, headers=w["headers"]),
+    "rename task": lambda c, w: c.put(f"{API}/tasks/{w['task_id']}", json={"title": "Renamed"}, headers=w["headers"]),
+    "complete task": lambda c, w: c.put(f"{API}/tasks/{w['task_id']}", json={"is_completed": True}, headers=w["headers"]),
+    "toggle task": lambda c, w: c.patch(f"{API}/tasks/{w['task_id']}/toggle", headers=w["headers"]),
+    "delete task": lambda c, w: c.delete(f"{API}/tasks/{w['task_id']}", headers=w["headers"]),
+    "bulk complete by list": lambda c, w: c.patch(f"{API}/tasks/bulk", json={"task_list_id": w["second"], "action": "complete"}, headers=w["headers"]),
+    "bulk rename by ids": lambda c, w: c.patch(f"{API}/tasks/bulk", json={"task_ids": [w["task_id"]], "action": "rename", "title": "Bulk"}, headers=w["headers"]),
+    "create task list": lambda c, w: c.post(f"{API}/task-lists", json={"title": "Third", "duration_type": "daily", "start_date": "2026-10-14", "end_date": "2026-10-14"}, headers=w["headers"]),
+    "update task list": lambda c, w: c.put(f"{API}/task-lists/{w['first']}", json={"title": "First!"}, headers=w["headers"]),
+    "delete task list": lambda c, w: c.delete(f"{API}/task-lists/{w['first']}", headers=w["headers"]),
+    "create time block": lambda c, w: c.post(f"{API}/time-blocks", json={"date": "2026-10-14", "start_time": "11:00:00", "end_time": "12:00:00"}, headers=w["headers"]),
+    "import template": lambda c, w: c.post(f"{API}/time-blocks/template", json={"start_date": "2026-10-14", "blocks": [{"start_time": "13:00:00", "end_time": "14:00:00"}]}, headers=w["headers"]),
+    "update time block": lambda c, w: c.patch(f"{API}/time-blocks/{w['time_block_id']}", json={"notes": "Moved"}, headers=w["headers"]),
+    "move time block": lambda c, w: c.patch(f"{API}/time-blocks/{w['time_block_id']}", json={"date": "2026-10-15"}, headers=w["headers"]),
+    "delete time block": lambda c, w: c.delete(f"{API}/time-blocks/{w['time_block_id']}", headers=w["headers"]),
+}
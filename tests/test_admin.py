@@ -0,0 +1,23 @@
+from tests.conftest import API
+
+
+def test_signup_refuses_the_superuser_email(client):
+    response = client.post(f"{API}/auth/signup", json={
+        "email": "ADMIN@example.com", "name": "Mallory", "password": "x"
+    })
+    assert response.status_code == 400
+
+
+def test_regular_user_cannot_read_or_clear_slow_queries(client, auth_headers):
+    assert client.get(f"{API}/admin/slow-queries", headers=auth_headers).status_code == 403
+    assert client.delete(f"{API}/admin/slow-queries", headers=auth_headers).status_code == 403
+
+
+def test_seeded_superuser_can_read_slow_queries(client):
+    login = client.post(f"{API}/auth/login", json={"email": "admin@example.com", "password": "admin-password"})
+    assert login.status_code == 200, login.text
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+    
+    response = client.get(f"{API}/admin/slow-queries", headers=headers)
+    assert response.status_code == 200
+    assert "slow_queries" in response.json()
@@ -0,0 +1,61 @@
+import uuid
+from sqlalchemy import select
+from app.api.v1.endpoints import auth
+from app.core import security
+from app.core.security import PasswordHasherBusy, get_password_hash, password_needs_rehash
+from app.db.database import SessionLocal
+from app.models.user import User
+from tests.conftest import API
+
+
+def signup(client):
+    email = f"login-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post(f"{API}/auth/signup", json={"email": email, "name": "L", "password": "secret"})
+    assert response.status_code == 200, response.text
+    return email
+
+
+def stored_hash(email):
+    with SessionLocal() as db:
+        return db.scalar(select(User.password_hash).where(User.email == email))
+
+
+def test_rehash_only_raises_the_cost(monkeypatch):
+    monkeypatch.setattr(security, "bcrypt_rounds", 5)
+    assert password_needs_rehash(get_password_hash("pw", rounds=4))
+    assert not password_needs_rehash(get_password_hash("pw", rounds=5))
+    assert not password_needs_rehash(get_password_hash("pw", rounds=6))
+
+
+def test_login_rehashes_to_a_higher_target(client, monkeypatch):
+    email = signup(client)
+    monkeypatch.setattr(security, "bcrypt_rounds", 5)
+    
+    assert client.post(f"{API}/auth/login", json={"email": email, "password": "secret"}).status_code == 200
+    assert security.hash_rounds(stored_hash(email)) == 5
+
+
+def test_login_never_lowers_the_cost(client, monkeypatch):
+    email = signup(client)
+    monkeypatch.setattr(security, "bcrypt_rounds", 5)
+    client.post(f"{API}/auth/login", json={"email": email, "password": "secret"})
+    
+    # A worker that calibrated lower leaves the stronger hash alone
+    monkeypatch.setattr(security, "bcrypt_rounds", 4)
+    assert client.post(f"{API}/auth/login", json={"email": email, "password": "secret"}).status_code == 200
+    assert security.hash_rounds(stored_hash(email)) == 5
+
+
+def test_busy_hasher_skips_the_rehash_instead_of_failing_login(client, monkeypatch):
+    email = signup(client)
+    original = stored_hash(email)
+    monkeypatch.setattr(security, "bcrypt_rounds", 5)
+    
+    async def busy(password):
+        raise PasswordHasherBusy()
+    
+    monkeypatch.setattr(auth, "hash_password_async", busy)
+    response = client.post(f"{API}/auth/login", json={"email": email, "password": "secret"})
+    
+    assert response.status_code == 200
+    assert stored_hash(email) == original
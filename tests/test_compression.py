@@ -0,0 +1,146 @@
+import asyncio
+import gzip
+import zlib
+import pytest
+from starlette.datastructures import Headers
+from app.middleware.compression import CompressionMiddleware, choose_encoding
+from tests.conftest import API
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENCODINGS = ["gzip", pytest.param("br", marks=pytest.mark.skipif(brotli is None, reason="brotli is not installed"))]
+
+BODY = b'{"items": [' + b",".join(b'{"title": "task %d"}' % i for i in range(200)) + b"]}"
+
+
+def endpoint(chunks, content_type="application/json", headers=()):
+    """ASGI app sending the chunks as one body, or streamed if there are several"""
+    async def app(scope, receive, send):
+        raw = [(b"content-type", content_type.encode()), *headers]
+        if len(chunks) == 1:
+            raw.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": raw})
+        for index, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": index < len(chunks) - 1})
+    return app
+
+
+def call(app, accept_encoding=None, minimum_size=1024):
+    """Run one request through the middleware; returns (headers, [body chunks])"""
+    request_headers = [] if accept_encoding is None else [(b"accept-encoding", accept_encoding.encode())]
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": request_headers}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, minimum_size=minimum_size)(scope, receive, send))
+    assert sent[0]["type"] == "http.response.start"
+    return Headers(raw=sent[0]["headers"]), [message["body"] for message in sent[1:]]
+
+
+def decode(encoding, data):
+    return brotli.decompress(data) if encoding == "br" else gzip.decompress(data)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("br", "br"),
+    ("gzip, br", "br"),
+    ("gzip;q=1.0, br;q=0.5", "gzip"),
+    ("br;q=0, gzip", "gzip"),
+    ("*", "br"),
+    ("*;q=0.2, br;q=0", "gzip"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("", None),
+])
+def test_negotiation(header, expected):
+    assert choose_encoding(header, brotli_available=True) == expected
+
+
+def test_brotli_is_not_offered_without_the_package():
+    assert choose_encoding("br", brotli_available=False) is None
+    assert choose_encoding("br, gzip", brotli_available=False) == "gzip"
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_large_body_is_compressed(encoding):
+    headers, chunks = call(endpoint([BODY]), accept_encoding=encoding)
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(chunks[0]) < len(BODY)
+    assert decode(encoding, chunks[0]) == BODY
+
+
+def test_vary_is_appended_to_an_existing_header():
+    headers, _ = call(endpoint([BODY], headers=[(b"vary", b"Authorization")]), accept_encoding="gzip")
+    assert headers["vary"] == "Authorization, Accept-Encoding"
+
+
+@pytest.mark.parametrize("accept_encoding", [None, "identity"])
+def test_body_is_left_alone_without_an_accepted_coding(accept_encoding):
+    headers, chunks = call(endpoint([BODY]), accept_encoding=accept_encoding)
+    assert "content-encoding" not in headers
+    # Caches still have to key on Accept-Encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert chunks == [BODY]
+
+
+def test_body_under_the_minimum_size_passes_through():
+    small = b'{"ok": true}'
+    headers, chunks = call(endpoint([small]), accept_encoding="gzip", minimum_size=len(small) + 1)
+    assert "content-encoding" not in headers
+    assert headers["content-length"] == str(len(small))
+    assert chunks == [small]
+
+
+def test_incompressible_body_passes_through():
+    noise = zlib.compress(BODY)  # high entropy: gzip cannot make it smaller
+    headers, chunks = call(endpoint([noise]), accept_encoding="gzip", minimum_size=1)
+    assert "content-encoding" not in headers
+    assert chunks == [noise]
+
+
+@pytest.mark.parametrize("content_type, headers", [
+    ("image/png", ()),
+    ("application/json", [(b"content-encoding", b"gzip")]),
+])
+def test_non_textual_and_already_encoded_responses_pass_through(content_type, headers):
+    response_headers, chunks = call(endpoint([BODY], content_type, headers), accept_encoding="gzip")
+    assert "vary" not in response_headers
+    assert response_headers.getlist("content-encoding") == [value.decode() for _, value in headers]
+    assert chunks == [BODY]
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_streamed_body_is_compressed_chunk_by_chunk(encoding):
+    parts = [BODY[:300], BODY[300:2000], BODY[2000:]]
+    headers, chunks = call(endpoint(parts), accept_encoding=encoding, minimum_size=10**6)
+    assert headers["content-encoding"] == encoding
+    assert headers["vary"] == "Accept-Encoding"
+    assert "content-length" not in headers
+    assert len(chunks) == len(parts)
+
+    # Each chunk is flushed, so everything sent so far decodes on its own
+    decoder = zlib.decompressobj(31) if encoding == "gzip" else brotli.Decompressor()
+    feed = decoder.decompress if encoding == "gzip" else decoder.process
+    received = b""
+    for part, chunk in zip(parts, chunks):
+        received += feed(chunk)
+        assert received.endswith(part)
+    assert received == BODY
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_app_responses_are_negotiated(client, encoding):
+    response = client.get(f"{API}/openapi.json", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["openapi"]
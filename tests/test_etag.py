@@ -0,0 +1,101 @@
+from datetime import date
+import pytest
+from sqlalchemy import select
+from app.api import etag
+from app.db.database import SessionLocal
+from app.models.user import User
+from tests.conftest import API, WRITES, register
+
+POLLED = ["/dashboard/stats", "/task-lists", "/task-lists/{first}/tasks", "/time-blocks", "/time-blocks?date_filter=2026-10-14"]
+
+
+def data_version(client, headers) -> int:
+    user_id = client.get(f"{API}/auth/me", headers=headers).json()["user"]["user_id"]
+    with SessionLocal() as db:
+        return db.scalar(select(User.data_version).where(User.user_id == user_id))
+
+
+def etag_of(client, url, headers) -> str:
+    response = client.get(API + url, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.headers["ETag"]
+
+
+@pytest.mark.parametrize("url", POLLED)
+def test_unchanged_resource_is_not_modified(client, world, url):
+    url = url.format(**world)
+    tag = etag_of(client, url, world["headers"])
+
+    for if_none_match in [tag, tag.removeprefix("W/"), f'W/"other", {tag}', "*"]:
+        response = client.get(API + url, headers={**world["headers"], "If-None-Match": if_none_match})
+        assert response.status_code == 304, if_none_match
+        assert response.headers["ETag"] == tag
+        assert response.content == b""
+
+    response = client.get(API + url, headers={**world["headers"], "If-None-Match": 'W/"other"'})
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("write", WRITES)
+def test_every_write_bumps_data_version(client, world, write):
+    tags = {url: etag_of(client, url.format(**world), world["headers"]) for url in POLLED}
+    before = data_version(client, world["headers"])
+
+    response = WRITES[write](client, world)
+    assert response.status_code == 200, response.text
+
+    assert data_version(client, world["headers"]) == before + 1
+    for url, tag in tags.items():
+        response = client.get(API + url.format(**world), headers={**world["headers"], "If-None-Match": tag})
+        if response.status_code == 404:  # the write deleted it
+            continue
+        assert response.status_code == 200, url
+        assert response.headers["ETag"] != tag
+
+
+def test_subscription_changes_bump_data_version(client, auth_headers):
+    reference = client.post(f"{API}/subscription/initialize", json={
+        "tier": "monthly", "email": "payer@example.com"
+    }, headers=auth_headers).json()["reference"]
+    tag = etag_of(client, "/dashboard/stats", auth_headers)
+    before = data_version(client, auth_headers)
+
+    assert client.post(f"{API}/subscription/verify", json={"reference": reference}, headers=auth_headers).json()["success"]
+    assert data_version(client, auth_headers) == before + 1
+    assert etag_of(client, "/dashboard/stats", auth_headers) != tag
+
+    # A repeated verification activates nothing and changes nothing
+    assert client.post(f"{API}/subscription/verify", json={"reference": reference}, headers=auth_headers).json()["success"]
+    assert data_version(client, auth_headers) == before + 1
+
+    assert client.post(f"{API}/subscription/cancel", headers=auth_headers).status_code == 200
+    assert data_version(client, auth_headers) == before + 2
+
+
+def test_etag_varies_with_query_string_and_date(client, world, monkeypatch):
+    headers = world["headers"]
+    tags = {
+        etag_of(client, "/time-blocks", headers),
+        etag_of(client, "/time-blocks?date_filter=2026-10-14", headers),
+        etag_of(client, "/time-blocks?date_filter=2026-10-15", headers),
+        etag_of(client, "/time-blocks?limit=1", headers),
+    }
+    assert len(tags) == 4
+
+    today = etag_of(client, "/dashboard/stats", headers)
+    assert etag_of(client, "/dashboard/stats", headers) == today
+
+    class Tomorrow(date):
+        @classmethod
+        def today(cls):
+            return date.fromordinal(date.today().toordinal() + 1)
+
+    monkeypatch.setattr(etag, "date", Tomorrow)
+    tomorrow = etag_of(client, "/dashboard/stats", headers)
+    assert tomorrow != today
+    response = client.get(f"{API}/dashboard/stats", headers={**headers, "If-None-Match": today})
+    assert response.status_code == 200
+
+
+def test_etags_are_per_user(client, world):
+    assert etag_of(client, "/task-lists", world["headers"]) != etag_of(client, "/task-lists", register(client))
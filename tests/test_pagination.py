@@ -0,0 +1,29 @@
+import pytest
+from app.api.pagination import MAX_PAGE_SIZE
+from tests.conftest import API
+
+
+@pytest.fixture
+def list_urls(auth_headers, make_task_list):
+    task_list_id = make_task_list(auth_headers)
+    return ["/task-lists", f"/task-lists/{task_list_id}/tasks", "/time-blocks"]
+
+
+def test_page_size_is_capped(client, auth_headers, list_urls):
+    for url in list_urls:
+        assert client.get(f"{API}{url}?limit={MAX_PAGE_SIZE}", headers=auth_headers).status_code == 200
+        assert client.get(f"{API}{url}?limit={MAX_PAGE_SIZE + 1}", headers=auth_headers).status_code == 422
+        assert client.get(f"{API}{url}?limit=10000000", headers=auth_headers).status_code == 422
+
+
+def test_cursor_walks_every_row_once(client, auth_headers, make_task_list):
+    created = {make_task_list(auth_headers, f"List {i}") for i in range(5)}
+    seen, cursor = [], None
+    while True:
+        params = "?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(f"{API}/task-lists{params}", headers=auth_headers).json()
+        seen.extend(task_list["task_list_id"] for task_list in page["task_lists"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(created)
@@ -0,0 +1,120 @@
+import asyncio
+import httpx
+import pytest
+from app.core.config import settings
+from app.services import paystack
+from app.services.paystack import PaystackService
+from app.services.paystack_mock import MockPaystack
+
+
+@pytest.fixture
+def mock():
+    return MockPaystack()
+
+
+@pytest.fixture
+def backoff_ceilings(monkeypatch):
+    """Upper bounds the retry loop drew its jittered sleeps from; the sleeps themselves are skipped"""
+    ceilings = []
+    
+    def uniform(low, high):
+        assert low == 0
+        ceilings.append(high)
+        return 0
+    
+    monkeypatch.setattr(paystack.random, "uniform", uniform)
+    return ceilings
+
+
+def run(mock, call):
+    async def scenario():
+        service = PaystackService(transport=mock.transport())
+        try:
+            return await call(service)
+        finally:
+            await service.close()
+    return asyncio.run(scenario())
+
+
+def test_verify_retries_retryable_statuses_with_full_jitter(mock, backoff_ceilings):
+    mock.add_transaction("ref-1", 399000)
+    mock.fail_next(2, status_code=503)
+    
+    response = run(mock, lambda service: service.verify_transaction("ref-1"))
+    
+    assert response["data"]["status"] == "success"
+    assert mock.requests == ["GET /transaction/verify/ref-1"] * 3
+    assert backoff_ceilings == [settings.PAYSTACK_RETRY_BACKOFF, settings.PAYSTACK_RETRY_BACKOFF * 2]
+
+
+def test_verify_gives_up_after_max_retries(mock, backoff_ceilings):
+    mock.fail_next(settings.PAYSTACK_MAX_RETRIES + 5, status_code=502)
+    
+    response = run(mock, lambda service: service.verify_transaction("ref-2"))
+    
+    assert response["message"] == "Injected fault"
+    assert len(mock.requests) == settings.PAYSTACK_MAX_RETRIES + 1
+    assert len(backoff_ceilings) == settings.PAYSTACK_MAX_RETRIES
+
+
+def test_verify_retries_timeouts_then_raises(mock, backoff_ceilings):
+    mock.fail_next(settings.PAYSTACK_MAX_RETRIES + 1, error=httpx.ReadTimeout("timed out"))
+    
+    with pytest.raises(httpx.ReadTimeout):
+        run(mock, lambda service: service.verify_transaction("ref-3"))
+    assert len(mock.requests) == settings.PAYSTACK_MAX_RETRIES + 1
+
+
+def test_verify_does_not_retry_client_errors(mock, backoff_ceilings):
+    response = run(mock, lambda service: service.verify_transaction("unknown"))
+    
+    assert response["status"] is False
+    assert len(mock.requests) == 1
+    assert backoff_ceilings == []
+
+
+def test_initialize_is_never_retried(mock, backoff_ceilings):
+    mock.fail_next(1, status_code=503)
+    response = run(mock, lambda service: service.initialize_transaction("a@example.com", 399000, "ref-4"))
+    assert response["status"] is False
+    assert mock.requests == ["POST /transaction/initialize"]
+    
+    mock.fail_next(1, error=httpx.ConnectTimeout("timed out"))
+    with pytest.raises(httpx.ConnectTimeout):
+        run(mock, lambda service: service.initialize_transaction("a@example.com", 399000, "ref-5"))
+    assert mock.requests == ["POST /transaction/initialize"] * 2
+    assert backoff_ceilings == []
+
+
+def test_client_uses_configured_timeouts(mock):
+    service = PaystackService(transport=mock.transport())
+    timeout = service.client.timeout
+    assert timeout.read == settings.PAYSTACK_READ_TIMEOUT
+    assert timeout.connect == settings.PAYSTACK_CONNECT_TIMEOUT
+    asyncio.run(service.close())
+
+
+def test_concurrent_verifies_of_one_reference_make_one_upstream_call(mock):
+    mock.add_transaction("ref-6", 399000)
+    
+    async def verify_concurrently(service):
+        return await asyncio.gather(*(service.verify_transaction_once("ref-6") for _ in range(10)))
+    
+    responses = run(mock, verify_concurrently)
+    
+    assert all(response["data"]["status"] == "success" for response in responses)
+    assert mock.calls["verify"] == 1
+
+
+def test_final_outcomes_are_cached_but_pending_ones_are_not(mock):
+    mock.add_transaction("done", 399000)
+    mock.add_transaction("pending", 399000, status="ongoing")
+    
+    async def verify_twice(service):
+        for reference in ("done", "pending"):
+            await service.verify_transaction_once(reference)
+            await service.verify_transaction_once(reference)
+    
+    run(mock, verify_twice)
+    assert mock.requests.count("GET /transaction/verify/done") == 1
+    assert mock.requests.count("GET /transaction/verify/pending") == 2
@@ -0,0 +1,72 @@
+import uuid
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from app.core.metrics import (
+    DB_POOL_CHECKOUTS, DB_POOL_CONNECTIONS, DB_POOL_CHECKOUT_WAIT, DB_POOL_CONNECT_TIME, DB_POOL_HOLD_TIME
+)
+from app.db import pool_metrics
+from app.db.pool_metrics import instrument_pool, pool_status
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=1)
+    engine.label = f"test-{uuid.uuid4().hex[:8]}"
+    instrument_pool(engine, engine.label)
+    yield engine
+    engine.dispose()
+    pool_metrics._engines.pop(engine.label, None)
+
+
+def observations(histogram, label):
+    series = histogram.values.get((label,))
+    return 0 if series is None else sum(series[:-1])
+
+
+def test_status_and_counts_follow_the_pool_across_dispose(engine):
+    label, first_pool = engine.label, engine.pool
+    with engine.connect() as connection:
+        connection.execute(text("select 1"))
+        assert pool_status()[label] == {"checked_out": 1, "size": 2, "overflow": -1}
+    assert DB_POOL_CHECKOUTS.values[(label,)] == 1
+    assert DB_POOL_CONNECTIONS.values[(label,)] == 1
+    assert observations(DB_POOL_CONNECT_TIME, label) == 1
+    assert observations(DB_POOL_HOLD_TIME, label) == 1
+    assert observations(DB_POOL_CHECKOUT_WAIT, label) == 1
+
+    engine.dispose()
+    assert engine.pool is not first_pool
+
+    with engine.connect(), engine.connect():
+        assert pool_status()[label] == {"checked_out": 2, "size": 2, "overflow": 0}
+    assert DB_POOL_CHECKOUTS.values[(label,)] == 3
+    assert DB_POOL_CONNECTIONS.values[(label,)] == 3
+    assert observations(DB_POOL_CONNECT_TIME, label) == 3
+    assert observations(DB_POOL_HOLD_TIME, label) == 3
+    assert observations(DB_POOL_CHECKOUT_WAIT, label) == 3
+
+
+def test_gauges_read_the_current_pool(engine, client):
+    engine.dispose()
+    with engine.connect():
+        body = client.get("/metrics").text
+    assert f'db_pool_checked_out{{engine="{engine.label}"}} 1' in body
+    assert f'db_pool_size{{engine="{engine.label}"}} 2' in body
+
+
+def test_checkout_wait_covers_queueing_for_an_exhausted_pool(tmp_path):
+    label = f"test-{uuid.uuid4().hex[:8]}"
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=1, max_overflow=0, pool_timeout=0.2)
+    instrument_pool(engine, label)
+    try:
+        engine.dispose()  # the wait is still timed on the replacement pool
+        with engine.connect():
+            with pytest.raises(PoolTimeout):
+                engine.connect()
+        series = DB_POOL_CHECKOUT_WAIT.values[(label,)]
+        assert sum(series[:-1]) == 2
+        assert series[-1] >= 0.2  # the timed-out checkout waited out pool_timeout
+    finally:
+        engine.dispose()
+        pool_metrics._engines.pop(label, None)
@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy import update
+from app.api import deps
+from app.api.deps import invalidate_principal
+from app.core.cache import TTLCache
+from app.db.database import AsyncSessionLocal
+from app.models.user import User
+from tests.conftest import API, register
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A fresh principal cache driven by a fake clock"""
+    clock = Clock()
+    monkeypatch.setattr(deps, "principal_cache", TTLCache(maxsize=100, ttl=60, timer=clock))
+    return clock
+
+
+def me(tracked_request, headers):
+    """GET /auth/me; returns (user, number of users rows loaded to build the principal)"""
+    response, stats = tracked_request("GET", f"{API}/auth/me", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["user"], sum("users.password_hash" in sql for sql in stats.recorded)
+
+
+def run_sql(client, statement):
+    async def run():
+        async with AsyncSessionLocal() as db:
+            await db.execute(statement)
+            await db.commit()
+    client.portal.call(run)
+
+
+def test_cached_principal_is_reused(client, auth_headers, tracked_request, clock):
+    user, lookups = me(tracked_request, auth_headers)
+    assert lookups == 1
+    assert me(tracked_request, auth_headers) == (user, 0)
+
+    # A change made without invalidating is not seen while the entry lives
+    run_sql(client, update(User).where(User.user_id == user["user_id"]).values(name="Renamed"))
+    assert me(tracked_request, auth_headers) == (user, 0)
+
+    invalidate_principal(user["user_id"])
+    renamed, lookups = me(tracked_request, auth_headers)
+    assert (renamed["name"], lookups) == ("Renamed", 1)
+
+
+def test_principal_expires_after_the_ttl(client, auth_headers, tracked_request, clock):
+    me(tracked_request, auth_headers)
+    clock.now += 59
+    assert me(tracked_request, auth_headers)[1] == 0
+    clock.now += 2
+    assert me(tracked_request, auth_headers)[1] == 1
+
+
+def test_subscription_changes_invalidate_the_principal(client, auth_headers, tracked_request, clock):
+    user, _ = me(tracked_request, auth_headers)
+    assert user["subscription_tier"] == "free"
+
+    reference = client.post(f"{API}/subscription/initialize", json={
+        "tier": "monthly", "email": "payer@example.com"
+    }, headers=auth_headers).json()["reference"]
+    assert client.post(f"{API}/subscription/verify", json={"reference": reference}, headers=auth_headers).json()["success"]
+    upgraded, lookups = me(tracked_request, auth_headers)
+    assert (upgraded["subscription_tier"], lookups) == ("monthly", 1)
+    assert upgraded["subscription_expires_at"] is not None
+
+    # The upgraded principal is cached again, so cancel's tier check sees it
+    assert client.post(f"{API}/subscription/cancel", headers=auth_headers).status_code == 200
+    cancelled, lookups = me(tracked_request, auth_headers)
+    assert (cancelled["subscription_tier"], cancelled["subscription_expires_at"], lookups) == ("free", None, 1)
+
+
+def test_removed_user_is_rejected_once_invalidated(client, auth_headers, tracked_request, clock):
+    user, _ = me(tracked_request, auth_headers)
+
+    async def remove():
+        async with AsyncSessionLocal() as db:
+            await db.delete(await db.get(User, user["user_id"]))
+            await db.commit()
+    client.portal.call(remove)
+
+    invalidate_principal(user["user_id"])
+    response, _ = tracked_request("GET", f"{API}/auth/me", headers=auth_headers)
+    assert response.status_code == 401
+
+
+def test_principals_are_per_user(client, tracked_request, clock):
+    first, second = register(client), register(client)
+    first_user, _ = me(tracked_request, first)
+    second_user, _ = me(tracked_request, second)
+    assert first_user["user_id"] != second_user["user_id"]
+
+    invalidate_principal(first_user["user_id"])
+    assert me(tracked_request, first)[1] == 1
+    assert me(tracked_request, second) == (second_user, 0)
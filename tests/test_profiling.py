@@ -0,0 +1,94 @@
+import asyncio
+import os
+import re
+import time
+import httpx
+import pytest
+from app.middleware.profiling import ProfilingMiddleware
+
+TOKEN = "s3cret"
+FOLDED_LINE = re.compile(r"^GET /busy(;[^;]+)* \d+$")
+
+
+def busy_work(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def endpoint(scope, receive, send):
+    busy_work(0.03)
+    await asyncio.sleep(0.03)
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"done"})
+
+
+@pytest.fixture
+def profiled(tmp_path):
+    """Send GET /busy requests through the profiler; returns (send, profile directory)"""
+    directory = tmp_path / "profiles"
+
+    def send(count=1, headers=None, params=None, **options):
+        app = ProfilingMiddleware(endpoint, directory=str(directory), **{"token": TOKEN, **options})
+
+        async def run():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                return [await client.get("/busy", headers=headers, params=params) for _ in range(count)]
+
+        return asyncio.run(run())
+
+    return send, directory
+
+
+def saved(directory):
+    return sorted(os.listdir(directory)) if directory.exists() else []
+
+
+@pytest.mark.parametrize("headers, params", [
+    ({"X-Profile": TOKEN}, None),
+    (None, {"profile": TOKEN}),
+])
+def test_token_gated_request_is_profiled(profiled, headers, params):
+    send, directory = profiled
+    [response] = send(headers=headers, params=params)
+    assert response.text == "done"
+    assert saved(directory) == [response.headers["X-Profile"]]
+
+    folded = (directory / response.headers["X-Profile"]).read_text().splitlines()
+    assert folded and all(FOLDED_LINE.match(line) for line in folded)
+    # CPU time shows the running stack, waiting shows the awaited object
+    assert any("busy_work (test_profiling.py" in line for line in folded)
+    assert any(re.search(r";sleep \(tasks\.py:\d+\);\[await \w+\] \d+$", line) for line in folded)
+
+
+@pytest.mark.parametrize("headers, params", [
+    (None, None),
+    ({"X-Profile": "wrong"}, None),
+    (None, {"profile": "wrong"}),
+])
+def test_ungated_request_is_not_sampled(profiled, headers, params):
+    send, directory = profiled
+    [response] = send(headers=headers, params=params)
+    assert response.text == "done"
+    assert "X-Profile" not in response.headers
+    assert saved(directory) == []
+
+
+def test_no_token_means_no_header_gate(profiled):
+    send, directory = profiled
+    [response] = send(headers={"X-Profile": ""}, token="")
+    assert "X-Profile" not in response.headers
+    assert saved(directory) == []
+
+
+def test_sample_rate_profiles_without_a_token(profiled):
+    send, directory = profiled
+    responses = send(count=2, token="", sample_rate=1.0)
+    assert saved(directory) == sorted(response.headers["X-Profile"] for response in responses)
+
+
+def test_retention_keeps_only_the_newest_profiles(profiled):
+    send, directory = profiled
+    responses = send(count=5, headers={"X-Profile": TOKEN}, keep=3)
+    names = [response.headers["X-Profile"] for response in responses]
+    assert saved(directory) == names[-3:]
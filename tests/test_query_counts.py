@@ -0,0 +1,154 @@
+import httpx
+import pytest
+from sqlalchemy import text
+from app.core.response_cache import response_cache
+from app.db.database import SessionLocal
+from app.db.query_stats import assert_max_queries, track_queries
+from app.middleware.query_stats import QueryStatsMiddleware
+from tests.conftest import API, WRITES
+
+# Most statements each endpoint may issue once the principal cache is warm,
+# with the response cache off; the fixture data is large enough that any
+# per-row query would blow the budget
+READ_BUDGETS = {
+    "/dashboard/stats": 2,
+    "/task-lists": 3,
+    "/task-lists/{first}": 2,
+    "/task-lists/{first}/tasks": 3,
+    "/tasks/{task_id}": 1,
+    "/time-blocks": 2,
+    "/time-blocks?date_filter=2026-10-14": 2,
+    "/time-blocks/conflicts?start_date=2026-10-14": 1,
+    "/time-blocks/{time_block_id}": 1,
+}
+WRITE_BUDGETS = {
+    "create task": 6,
+    "bulk create tasks": 5,
+    "rename task": 4,
+    "complete task": 5,
+    "toggle task": 5,
+    "delete task": 6,
+    "bulk complete by list": 3,
+    "bulk rename by ids": 3,
+    "create task list": 4,
+    "update task list": 4,
+    "delete task list": 7,
+    "create time block": 5,
+    "import template": 5,
+    "update time block": 4,
+    "move time block": 11,
+    "delete time block": 4,
+}
+
+
+@pytest.fixture
+def big_world(client, world, monkeypatch):
+    """The shared world plus enough tasks, lists and overlapping blocks to expose per-row queries"""
+    monkeypatch.setattr(response_cache, "backend", None)
+    headers = world["headers"]
+    titles = [f"Task {i}" for i in range(20)]
+    task_ids = [task["task_id"] for task in client.post(f"{API}/tasks/bulk", json={
+        "task_list_id": world["first"], "titles": titles
+    }, headers=headers).json()["tasks"]]
+    for i, task_id in enumerate(task_ids[:10]):
+        client.post(f"{API}/time-blocks", json={
+            "task_id": task_id, "date": "2026-10-14", "start_time": f"{15 + i % 3:02d}:30:00", "end_time": f"{16 + i % 3:02d}:15:00",
+            "allow_overlap": True
+        }, headers=headers)
+    for i in range(5):
+        client.post(f"{API}/task-lists", json={
+            "title": f"Extra {i}", "duration_type": "daily", "start_date": "2026-10-14", "end_date": "2026-10-14"
+        }, headers=headers)
+    return world
+
+
+class TrackedClient:
+    """client-like calls that go through tracked_request; each returns (response, stats)"""
+
+    def __init__(self, tracked_request):
+        self.tracked_request = tracked_request
+
+    def __getattr__(self, method):
+        return lambda url, **kwargs: self.tracked_request(method.upper(), url, **kwargs)
+
+
+def test_every_read_and_write_has_a_budget():
+    assert set(WRITE_BUDGETS) == set(WRITES)
+
+
+@pytest.mark.parametrize("url", READ_BUDGETS)
+def test_read_query_budget(big_world, tracked_request, url):
+    tracked_request("GET", f"{API}/auth/me", headers=big_world["headers"])  # warm the principal cache
+    with assert_max_queries(READ_BUDGETS[url], label=f"GET {url}"):
+        response, _ = tracked_request("GET", API + url.format(**big_world), headers=big_world["headers"])
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("write", WRITE_BUDGETS)
+def test_write_query_budget(big_world, tracked_request, write):
+    tracked_request("GET", f"{API}/auth/me", headers=big_world["headers"])
+    with assert_max_queries(WRITE_BUDGETS[write], label=write):
+        response, _ = WRITES[write](TrackedClient(tracked_request), big_world)
+    assert response.status_code == 200, response.text
+
+
+def test_query_headers(client, auth_headers, make_task_list, monkeypatch):
+    """QueryStatsMiddleware reports the statements it saw, matching an outer tracker"""
+    monkeypatch.setattr(response_cache, "backend", None)
+    make_task_list(auth_headers)
+    app = QueryStatsMiddleware(client.app)
+
+    async def send(url):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+            with track_queries() as stats:
+                response = await async_client.get(url, headers=auth_headers)
+        return response, stats
+
+    response, stats = client.portal.call(send, f"{API}/task-lists")
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) == stats.statements > 0
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert f'desc="{stats.statements} queries, ' in response.headers["Server-Timing"]
+
+    response, _ = client.portal.call(send, "/")
+    assert response.headers["X-DB-Queries"] == "0"
+
+
+def test_failed_statements_are_counted_and_leave_nothing_behind(client):
+    with SessionLocal() as db, track_queries(record_statements=True) as stats:
+        with pytest.raises(Exception):
+            db.execute(text("SELECT * FROM no_such_table"))
+        db.rollback()
+        db.execute(text("UPDATE users SET name = name WHERE 1 = 0"))
+        connection_info = db.connection().info
+    assert stats.statements == 2
+    assert stats.recorded[0] == "SELECT * FROM no_such_table"
+    assert not any("started" in key for key in connection_info)
+
+
+def test_time_blocks_query_count_does_not_grow_with_rows(client, auth_headers, make_task_list, tracked_request, monkeypatch):
+    """Task titles come from the same statement as the blocks, however many blocks link tasks"""
+    monkeypatch.setattr(response_cache, "backend", None)
+    task_list_id = make_task_list(auth_headers)
+    task_id = client.post(f"{API}/tasks", json={"task_list_id": task_list_id, "title": "Linked"}, headers=auth_headers).json()["task"]["task_id"]
+    
+    client.post(f"{API}/time-blocks", json={
+        "task_id": task_id, "date": "2026-10-01", "start_time": "09:00:00", "end_time": "10:00:00"
+    }, headers=auth_headers)
+    tracked_request("GET", f"{API}/time-blocks", headers=auth_headers)  # warm the principal cache
+    response, one = tracked_request("GET", f"{API}/time-blocks", headers=auth_headers)
+    assert len(response.json()["time_blocks"]) == 1
+    assert one.statements > 0
+    
+    client.post(f"{API}/time-blocks/template", json={
+        "start_date": "2026-10-02", "end_date": "2026-10-31",
+        "blocks": [{"start_time": "09:00:00", "end_time": "10:00:00", "task_id": task_id}]
+    }, headers=auth_headers)
+    with assert_max_queries(one.statements, label="GET /time-blocks with 31 linked blocks"):
+        response, many = tracked_request("GET", f"{API}/time-blocks", headers=auth_headers)
+    
+    blocks = response.json()["time_blocks"]
+    assert len(blocks) == 31
+    assert all(block["task_title"] == "Linked" for block in blocks)
+    assert many.statements == one.statements
@@ -0,0 +1,85 @@
+import asyncio
+import sqlite3
+import pytest
+from app.core.config import settings
+from app.core.redis_mock import MockRedis
+from app.core.response_cache import response_cache
+from app.db import database
+from app.db.recent_writers import RecentWriters
+from tests.conftest import API, register
+
+PRIMARY_PATH = settings.DATABASE_URL.split("sqlite:///", 1)[1]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def title_in(path, task_list_id):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT title FROM task_lists WHERE task_list_id = ?", (task_list_id,)).fetchone()[0]
+
+
+@pytest.fixture(params=["memory", "redis"])
+def replica(request, client, auth_headers, make_task_list, tmp_path, monkeypatch):
+    """A separate SQLite file as the replica, copied from the primary and then diverged from it"""
+    task_list_id = make_task_list(auth_headers, "On the primary")
+    replica_path = str(tmp_path / "replica.db")
+    with sqlite3.connect(PRIMARY_PATH) as primary, sqlite3.connect(replica_path) as copy:
+        primary.backup(copy)
+    with sqlite3.connect(replica_path) as copy:
+        copy.execute("UPDATE task_lists SET title = 'On the replica' WHERE task_list_id = ?", (task_list_id,))
+
+    clock = Clock()
+    writers = RecentWriters(settings.DB_READ_YOUR_WRITES_SECONDS, MockRedis(clock) if request.param == "redis" else None, timer=clock)
+    monkeypatch.setattr(database, "recent_writers", writers)
+    monkeypatch.setattr(response_cache, "backend", None)
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", f"sqlite:///{replica_path}")
+    database._replica_engine = None
+    yield {"path": replica_path, "task_list_id": task_list_id, "headers": auth_headers, "clock": clock, "writers": writers}
+    asyncio.run(database.get_replica_engine().dispose())
+    database._replica_engine = None
+
+
+def read_title(client, replica, headers=None):
+    response = client.get(f"{API}/task-lists/{replica['task_list_id']}", headers=headers or replica["headers"])
+    assert response.status_code == 200, response.text
+    return response.json()["task_list"]["title"]
+
+
+def test_reads_go_to_the_replica(client, replica):
+    assert read_title(client, replica) == "On the replica"
+
+
+def test_writes_go_to_the_primary_and_the_writer_reads_it_for_the_window(client, replica):
+    response = client.put(f"{API}/task-lists/{replica['task_list_id']}", json={"title": "Written"}, headers=replica["headers"])
+    assert response.status_code == 200, response.text
+    assert title_in(PRIMARY_PATH, replica["task_list_id"]) == "Written"
+    assert title_in(replica["path"], replica["task_list_id"]) == "On the replica"
+
+    assert read_title(client, replica) == "Written"
+    replica["clock"].now += settings.DB_READ_YOUR_WRITES_SECONDS - 1
+    assert read_title(client, replica) == "Written"
+
+    replica["clock"].now += 2
+    assert read_title(client, replica) == "On the replica"
+
+
+def test_stickiness_reaches_other_processes_only_through_redis(client, replica):
+    client.put(f"{API}/task-lists/{replica['task_list_id']}", json={"title": "Written"}, headers=replica["headers"])
+
+    # Another worker process has none of this one's local marks
+    replica["writers"].clear()
+    expected = "Written" if replica["writers"].shared else "On the replica"
+    assert read_title(client, replica) == expected
+
+
+def test_other_users_writes_do_not_pin_this_user(client, replica):
+    client.post(f"{API}/task-lists", json={
+        "title": "Theirs", "duration_type": "daily", "start_date": "2026-10-14", "end_date": "2026-10-14"
+    }, headers=register(client))
+    assert read_title(client, replica) == "On the replica"
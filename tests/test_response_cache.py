@@ -0,0 +1,176 @@
+import asyncio
+import httpx
+import pytest
+from sqlalchemy import update
+from app.core.redis_mock import MockRedis
+from app.core.response_cache import MemoryBackend, RedisBackend, response_cache, task_list_tag
+from app.core.config import settings
+from app.db import database
+from app.db.database import SessionLocal
+from app.models.task import Task
+from tests.conftest import API, WRITES, register
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    """Run each test against a fresh backend of both kinds"""
+    saved = response_cache.backend
+    if request.param == "memory":
+        response_cache.backend = MemoryBackend(maxsize=1000, ttl=300)
+    else:
+        response_cache.backend = RedisBackend(MockRedis(), ttl=300)
+    yield response_cache.backend
+    response_cache.backend = saved
+
+
+def read_all(client, world):
+    bodies = {}
+    for url in world["urls"]:
+        response = client.get(API + url, headers=world["headers"])
+        bodies[url] = (response.status_code, response.json())
+    return bodies
+
+
+def read_uncached(client, world):
+    saved, response_cache.backend = response_cache.backend, None
+    try:
+        return read_all(client, world)
+    finally:
+        response_cache.backend = saved
+
+
+def hits():
+    return sum(counts[0] for counts in response_cache.counts.values())
+
+
+@pytest.mark.parametrize("write", WRITES)
+def test_no_stale_read_after_write(client, backend, world, write):
+    before = read_all(client, world)
+    hits_before = hits()
+    assert read_all(client, world) == before
+    assert hits() - hits_before == len(world["urls"])  # the second pass is served from the cache
+
+    response = WRITES[write](client, world)
+    assert response.status_code == 200, response.text
+
+    after = read_all(client, world)
+    assert after != before
+    assert after == read_uncached(client, world)
+
+
+def test_write_between_lookup_and_store_is_never_served(client, backend, world):
+    """A write that commits and invalidates while a read is building leaves an unservable entry"""
+    url = f"/task-lists/{world['first']}/tasks"
+    store = backend.store
+
+    async def store_after_concurrent_write(key, versions, body):
+        with SessionLocal() as db:
+            db.execute(update(Task).where(Task.task_id == world["task_id"]).values(title="Concurrent"))
+            db.commit()
+        await backend.invalidate([task_list_tag(world["first"])])
+        await store(key, versions, body)
+
+    backend.store = store_after_concurrent_write
+    stale = client.get(API + url, headers=world["headers"]).json()
+    backend.store = store
+    assert stale["tasks"][0]["title"] == "Write"
+
+    fresh = client.get(API + url, headers=world["headers"]).json()
+    assert fresh["tasks"][0]["title"] == "Concurrent"
+
+
+@pytest.mark.parametrize("url,change", [
+    ("/task-lists", {"is_completed": True}),
+    ("/task-lists/{first}/tasks", {"title": "Renamed"}),
+    ("/time-blocks", {"title": "Renamed"}),
+])
+def test_read_between_version_bump_and_invalidation_gets_the_new_body(client, backend, world, monkeypatch, url, change):
+    """A write commits its data_version bump before it invalidates tags; a read in that gap must not pair the new ETag with the old body"""
+    url = API + url.format(**world)
+    client.get(url, headers=world["headers"])
+    before = client.get(url, headers=world["headers"]).json()
+
+    invalidate, reads = response_cache.invalidate, []
+
+    async def read_then_invalidate(*tags):
+        transport = httpx.ASGITransport(app=client.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as in_loop:
+            reads.append(await in_loop.get(url, headers=world["headers"]))
+        await invalidate(*tags)
+
+    monkeypatch.setattr(response_cache, "invalidate", read_then_invalidate)
+    response = client.put(f"{API}/tasks/{world['task_id']}", json=change, headers=world["headers"])
+    assert response.status_code == 200
+    monkeypatch.setattr(response_cache, "invalidate", invalidate)
+
+    between = reads[0]
+    assert between.json() != before
+    assert between.json() == read_uncached(client, world)[url[len(API):]][1]
+    revalidated = client.get(url, headers={**world["headers"], "If-None-Match": between.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_cache_fills_with_a_replica_configured(client, backend, world, monkeypatch):
+    """Misses are built on the primary, so replica routing does not stop entries from being stored"""
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", settings.DATABASE_URL)
+    database.recent_writers.clear()
+    try:
+        read_all(client, world)
+        hits_before = hits()
+        read_all(client, world)
+        assert hits() - hits_before == len(world["urls"])
+    finally:
+        asyncio.run(database.get_replica_engine().dispose())
+        database._replica_engine = None
+
+
+def test_other_users_never_see_cached_entries(client, backend, world):
+    other_headers = register(client)
+    read_all(client, world)
+
+    assert client.get(f"{API}/task-lists/{world['first']}", headers=other_headers).status_code == 404
+    assert client.get(f"{API}/task-lists/{world['first']}/tasks", headers=other_headers).status_code == 404
+    assert client.get(f"{API}/task-lists", headers=other_headers).json()["task_lists"] == []
+
+
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+def test_backend_versions(kind):
+    backend = MemoryBackend(maxsize=2, ttl=60) if kind == "memory" else RedisBackend(MockRedis(), ttl=60)
+
+    async def scenario():
+        versions, body = await backend.lookup("key", ["tag"])
+        assert body is None
+        await backend.store("key", versions, b"v1")
+        assert (await backend.lookup("key", ["tag"]))[1] == b"v1"
+
+        await backend.invalidate(["tag"])
+        assert (await backend.lookup("key", ["tag"]))[1] is None
+
+        # Stored with versions read before the invalidation: never served
+        await backend.store("key", versions, b"stale")
+        assert (await backend.lookup("key", ["tag"]))[1] is None
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_tag_eviction_cannot_revive_entries():
+    backend = MemoryBackend(maxsize=2, ttl=60)
+
+    async def scenario():
+        versions, _ = await backend.lookup("key", ["tag"])
+        await backend.store("key", versions, b"body")
+        await backend.invalidate(["tag"])
+        await backend.invalidate(["a", "b", "c"])  # pushes "tag" out of the tag table
+        assert (await backend.lookup("key", ["tag"]))[1] is None
+
+    asyncio.run(scenario())
+
+
+def test_hit_rates_are_reported(client, backend, world):
+    read_all(client, world)
+    read_all(client, world)
+    stats = client.get("/health").json()["response_cache"]
+    assert stats["backend"] == backend.name
+    assert stats["hits"] > 0 and 0 < stats["hit_rate"] <= 1
+    assert f"{API}/task-lists/{{task_list_id}}/tasks" in stats["routes"]
+    assert "response_cache_requests_total" in client.get("/metrics").text
@@ -0,0 +1,98 @@
+import pytest
+from pydantic import BaseModel, ValidationError
+from app.main import app
+from app.schemas import TaskResponse
+from tests.conftest import API
+
+# Endpoints return ORJSONResponse, so FastAPI never runs their payloads
+# through the route's response_model. These tests do it instead: every key
+# the model declares must be present, nothing else may be, and every value
+# must validate.
+
+
+def assert_matches(model, payload, path="$"):
+    assert isinstance(payload, dict), f"{path}: expected an object, got {payload!r}"
+    missing, extra = set(model.__fields__) - set(payload), set(payload) - set(model.__fields__)
+    assert not missing and not extra, f"{path}: missing {sorted(missing)}, undeclared {sorted(extra)}"
+    model.parse_obj(payload)
+    for name, field in model.__fields__.items():
+        value = payload[name]
+        if value is None or not (isinstance(field.type_, type) and issubclass(field.type_, BaseModel)):
+            continue
+        for i, item in enumerate(value if isinstance(value, list) else [value]):
+            assert_matches(field.type_, item, f"{path}.{name}[{i}]")
+
+
+@pytest.fixture
+def world(client, auth_headers, make_task_list):
+    task_list_id = make_task_list(auth_headers)
+    task_id = client.post(f"{API}/tasks", json={"task_list_id": task_list_id, "title": "Write"}, headers=auth_headers).json()["task"]["task_id"]
+    client.put(f"{API}/tasks/{task_id}", json={"is_completed": True}, headers=auth_headers)
+    time_block_id = client.post(f"{API}/time-blocks", json={
+        "task_id": task_id, "date": "2026-10-14", "start_time": "09:00:00", "end_time": "10:00:00"
+    }, headers=auth_headers).json()["time_block"]["time_block_id"]
+    client.post(f"{API}/time-blocks", json={
+        "date": "2026-10-14", "start_time": "09:30:00", "end_time": "10:30:00", "allow_overlap": True
+    }, headers=auth_headers)
+    return {"headers": auth_headers, "task_list_id": task_list_id, "task_id": task_id, "time_block_id": time_block_id}
+
+
+# (method, route path) -> (url, JSON body)
+CASES = {
+    ("GET", "/task-lists"): ("/task-lists?limit=1", None),
+    ("GET", "/task-lists/{task_list_id}"): ("/task-lists/{task_list_id}", None),
+    ("GET", "/task-lists/{task_list_id}/tasks"): ("/task-lists/{task_list_id}/tasks?limit=1", None),
+    ("POST", "/tasks/bulk"): ("/tasks/bulk", {"task_list_id": "{task_list_id}", "titles": ["a", "b"]}),
+    ("GET", "/tasks/{task_id}"): ("/tasks/{task_id}", None),
+    ("GET", "/time-blocks"): ("/time-blocks?limit=1", None),
+    ("POST", "/time-blocks/template"): ("/time-blocks/template", {
+        "start_date": "2026-10-14", "allow_overlap": True,
+        "blocks": [{"start_time": "09:45:00", "end_time": "11:00:00", "task_id": "{task_id}"}]
+    }),
+    ("GET", "/time-blocks/conflicts"): ("/time-blocks/conflicts?start_date=2026-10-14", None),
+    ("GET", "/time-blocks/{time_block_id}"): ("/time-blocks/{time_block_id}", None),
+    ("GET", "/dashboard/stats"): ("/dashboard/stats", None),
+}
+
+
+def typed_routes():
+    """Every API route whose response_model is a pydantic model"""
+    for route in app.routes:
+        model = getattr(route, "response_model", None)
+        if isinstance(model, type) and issubclass(model, BaseModel) and route.path.startswith(API):
+            for method in route.methods:
+                yield (method, route.path[len(API):]), model
+
+
+def fill(value, world):
+    if isinstance(value, str):
+        return value.format(**world)
+    if isinstance(value, list):
+        return [fill(item, world) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, world) for key, item in value.items()}
+    return value
+
+
+def test_every_typed_route_is_checked():
+    assert {key for key, _ in typed_routes()} == set(CASES)
+
+
+@pytest.mark.parametrize("route,model", [pytest.param(*case, id=" ".join(case[0])) for case in typed_routes()])
+def test_payload_matches_response_model(client, world, route, model):
+    url, body = CASES[route]
+    response = client.request(route[0], API + fill(url, world), json=fill(body, world), headers=world["headers"])
+    assert response.status_code == 200, response.text
+    assert_matches(model, response.json())
+
+
+def test_drift_is_caught(client, world):
+    payload = client.get(f"{API}/tasks/{world['task_id']}", headers=world["headers"]).json()["task"]
+    assert_matches(TaskResponse, payload)
+
+    with pytest.raises(AssertionError, match="undeclared"):
+        assert_matches(TaskResponse, {**payload, "user_id": "leaked"})
+    with pytest.raises(AssertionError, match="missing"):
+        assert_matches(TaskResponse, {key: value for key, value in payload.items() if key != "order_index"})
+    with pytest.raises(ValidationError):
+        assert_matches(TaskResponse, {**payload, "created_at": "yesterday"})
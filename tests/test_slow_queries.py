@@ -0,0 +1,22 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.db.slow_queries import SlowQueryLog
+
+
+def test_failed_statement_leaves_no_timing_on_the_connection(tmp_path):
+    log = SlowQueryLog(threshold_ms=1e-6)
+    engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    log.instrument(engine)
+    try:
+        with engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM no_such_table"))
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+            assert not any("started" in key for key in connection.info)
+    finally:
+        engine.dispose()
+
+    [entry] = log.report()
+    assert entry["count"] == 2  # both literals share one fingerprint
@@ -0,0 +1,119 @@
+from datetime import date
+import pytest
+from sqlalchemy import select
+from app.db.database import AsyncSessionLocal
+from app.models.time_block import TimeBlock
+from app.models.user_stats import UserStats, UserDayStats
+from app.services.stats import count_user_totals, count_day_totals, rebuild_user_stats, DAY_COUNTERS, USER_COUNTERS
+from tests.conftest import API, WRITES
+
+TODAY = date.today().isoformat()
+
+
+def sequence(*calls):
+    """Several requests as one write; returns the last response"""
+    def run(c, w):
+        for call in calls:
+            response = call(c, w)
+            assert response.status_code == 200, response.text
+        return response
+    return run
+
+
+def patch_block(**changes):
+    return lambda c, w: c.patch(f"{API}/time-blocks/{w['time_block_id']}", json=changes, headers=w["headers"])
+
+
+# WRITES plus the status changes and day moves that only the counters care about
+STATS_WRITES = {
+    **WRITES,
+    "complete task list": lambda c, w: c.put(f"{API}/task-lists/{w['first']}", json={"status": "completed"}, headers=w["headers"]),
+    "delete completed list with completed tasks": sequence(
+        lambda c, w: c.put(f"{API}/tasks/{w['task_id']}", json={"is_completed": True}, headers=w["headers"]),
+        lambda c, w: c.put(f"{API}/task-lists/{w['first']}", json={"status": "completed"}, headers=w["headers"]),
+        lambda c, w: c.delete(f"{API}/task-lists/{w['first']}", headers=w["headers"]),
+    ),
+    "complete time block": patch_block(status="completed"),
+    "miss time block": patch_block(status="missed"),
+    "move completed block to today": sequence(patch_block(status="completed"), patch_block(date=TODAY)),
+    "move missed block and reopen it": sequence(patch_block(status="missed"), patch_block(date=TODAY, status="pending")),
+    "delete completed block": sequence(
+        patch_block(status="completed"),
+        lambda c, w: c.delete(f"{API}/time-blocks/{w['time_block_id']}", headers=w["headers"]),
+    ),
+    "import template over today": lambda c, w: c.post(f"{API}/time-blocks/template", json={
+        "start_date": TODAY, "end_date": TODAY, "blocks": [{"start_time": "20:00:00", "end_time": "21:00:00"}]
+    }, headers=w["headers"]),
+}
+
+
+def user_id_of(client, headers) -> str:
+    return client.get(f"{API}/auth/me", headers=headers).json()["user"]["user_id"]
+
+
+def counters(client, user_id):
+    """(stored, recounted) user and per-day counters; all-zero days are left out of both"""
+    async def read():
+        async with AsyncSessionLocal() as db:
+            stored_user = await db.get(UserStats, user_id)
+            stored = {"user": {name: getattr(stored_user, name) for name in USER_COUNTERS} if stored_user else None}
+            fresh = {"user": await count_user_totals(db, user_id)}
+            days = set((await db.execute(select(UserDayStats.date).where(UserDayStats.user_id == user_id))).scalars())
+            days |= set((await db.execute(select(TimeBlock.date).where(TimeBlock.user_id == user_id))).scalars())
+            for day in days:
+                row = await db.get(UserDayStats, (user_id, day))
+                stored[day] = {name: getattr(row, name) for name in DAY_COUNTERS} if row else {name: 0 for name in DAY_COUNTERS}
+                fresh[day] = await count_day_totals(db, user_id, day)
+            for day in days:
+                if not any(stored[day].values()) and not any(fresh[day].values()):
+                    del stored[day], fresh[day]
+            return stored, fresh
+    return client.portal.call(read)
+
+
+def dashboard_matches(client, headers, fresh):
+    stats = client.get(f"{API}/dashboard/stats", headers=headers).json()
+    today = fresh.get(date.today(), {name: 0 for name in DAY_COUNTERS})
+    assert stats == {
+        **fresh["user"],
+        "today_time_blocks": today["total_time_blocks"],
+        "completed_time_blocks": today["completed_time_blocks"],
+        "missed_time_blocks": today["missed_time_blocks"],
+        "overall_completion": round(fresh["user"]["completed_tasks"] / fresh["user"]["total_tasks"] * 100, 2)
+        if fresh["user"]["total_tasks"] else 0.0
+    }
+
+
+@pytest.mark.parametrize("write", STATS_WRITES)
+def test_counters_match_a_recount_after_every_write(client, world, write):
+    headers = world["headers"]
+    # A block today, so the dashboard's day figures are exercised too
+    client.post(f"{API}/time-blocks", json={
+        "task_id": world["task_id"], "date": TODAY, "start_time": "07:00:00", "end_time": "08:00:00"
+    }, headers=headers)
+    client.put(f"{API}/tasks/{world['task_id']}", json={"is_completed": True}, headers=headers)
+    user_id = user_id_of(client, headers)
+    dashboard_matches(client, headers, counters(client, user_id)[1])  # seeds the counter row
+
+    response = STATS_WRITES[write](client, world)
+    assert response.status_code == 200, response.text
+
+    stored, fresh = counters(client, user_id)
+    assert stored == fresh
+    dashboard_matches(client, headers, fresh)
+
+
+def test_rebuild_repairs_drifted_counters(client, world):
+    user_id = user_id_of(client, world["headers"])
+    client.get(f"{API}/dashboard/stats", headers=world["headers"])
+
+    async def drift_then_rebuild():
+        async with AsyncSessionLocal() as db:
+            (await db.get(UserStats, user_id)).total_tasks += 7
+            await db.commit()
+            await rebuild_user_stats(db, user_id)
+            await db.commit()
+
+    client.portal.call(drift_then_rebuild)
+    stored, fresh = counters(client, user_id)
+    assert stored == fresh
@@ -0,0 +1,92 @@
+import pytest
+from tests.conftest import API, register
+
+
+@pytest.fixture
+def tasks(client, auth_headers, make_task_list):
+    """A list of three tasks; returns (task_list_id, task ids)"""
+    task_list_id = make_task_list(auth_headers)
+    created = client.post(f"{API}/tasks/bulk", json={"task_list_id": task_list_id, "titles": ["a", "b", "c"]}, headers=auth_headers)
+    return task_list_id, [task["task_id"] for task in created.json()["tasks"]]
+
+
+def bulk(client, headers, **body):
+    return client.patch(f"{API}/tasks/bulk", json=body, headers=headers)
+
+
+def get_task(client, headers, task_id):
+    return client.get(f"{API}/tasks/{task_id}", headers=headers).json()["task"]
+
+
+def test_complete_by_list_counts_only_changed_rows_and_keeps_completed_at(client, auth_headers, tasks):
+    task_list_id, task_ids = tasks
+    client.patch(f"{API}/tasks/{task_ids[0]}/toggle", headers=auth_headers)
+    first_completed_at = get_task(client, auth_headers, task_ids[0])["completed_at"]
+    assert first_completed_at is not None
+
+    response = bulk(client, auth_headers, task_list_id=task_list_id, action="complete")
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+
+    completed = [get_task(client, auth_headers, task_id) for task_id in task_ids]
+    assert all(task["is_completed"] and task["completed_at"] for task in completed)
+    assert completed[0]["completed_at"] == first_completed_at
+
+    assert bulk(client, auth_headers, task_list_id=task_list_id, action="complete").json()["updated"] == 0
+
+
+def test_uncomplete_by_ids_clears_completed_at(client, auth_headers, tasks):
+    task_list_id, task_ids = tasks
+    bulk(client, auth_headers, task_list_id=task_list_id, action="complete")
+
+    response = bulk(client, auth_headers, task_ids=task_ids[:2], action="uncomplete")
+    assert response.json()["updated"] == 2
+    states = [get_task(client, auth_headers, task_id) for task_id in task_ids]
+    assert [(task["is_completed"], task["completed_at"] is None) for task in states] == [(False, True), (False, True), (True, False)]
+
+
+def test_rename_by_ids(client, auth_headers, tasks):
+    _, task_ids = tasks
+    response = bulk(client, auth_headers, task_ids=task_ids[1:], action="rename", title="Renamed")
+    assert response.json()["updated"] == 2
+    assert [get_task(client, auth_headers, task_id)["title"] for task_id in task_ids] == ["a", "Renamed", "Renamed"]
+
+
+def test_other_users_tasks_never_match(client, auth_headers, tasks):
+    task_list_id, task_ids = tasks
+    other_headers = register(client)
+
+    assert bulk(client, other_headers, task_ids=task_ids, action="complete").json()["updated"] == 0
+    assert bulk(client, other_headers, task_list_id=task_list_id, action="rename", title="Mine").json()["updated"] == 0
+    assert all(
+        not task["is_completed"] and task["title"] in "abc"
+        for task in (get_task(client, auth_headers, task_id) for task_id in task_ids)
+    )
+
+
+@pytest.mark.parametrize("body", [
+    {"action": "complete"},
+    {"task_ids": ["x"], "task_list_id": "y", "action": "complete"},
+])
+def test_requires_exactly_one_selector(client, auth_headers, body):
+    response = bulk(client, auth_headers, **body)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Provide either task_ids or task_list_id"
+
+
+@pytest.mark.parametrize("title", [None, ""])
+def test_rename_requires_a_title(client, auth_headers, tasks, title):
+    task_list_id, task_ids = tasks
+    response = bulk(client, auth_headers, task_list_id=task_list_id, action="rename", title=title)
+    assert response.status_code == 400
+    assert get_task(client, auth_headers, task_ids[0])["title"] == "a"
+
+
+def test_rejects_unknown_action(client, auth_headers, tasks):
+    task_list_id, _ = tasks
+    assert bulk(client, auth_headers, task_list_id=task_list_id, action="archive").status_code == 400
+
+
+def test_rejects_empty_and_oversized_id_lists(client, auth_headers):
+    assert bulk(client, auth_headers, task_ids=[], action="complete").status_code == 422
+    assert bulk(client, auth_headers, task_ids=[f"id-{i}" for i in range(501)], action="complete").status_code == 422
@@ -0,0 +1,56 @@
+from tests.conftest import API
+
+
+def import_template(client, headers, blocks, **extra):
+    return client.post(f"{API}/time-blocks/template", json={
+        "start_date": "2026-10-14", "blocks": blocks, **extra
+    }, headers=headers)
+
+
+def test_rejects_end_before_start(client, auth_headers):
+    response = import_template(client, auth_headers, [{"start_time": "11:00:00", "end_time": "10:00:00"}])
+    assert response.status_code == 400
+    assert client.get(f"{API}/time-blocks", headers=auth_headers).json()["time_blocks"] == []
+
+
+def test_rejects_overlap_with_existing_block(client, auth_headers):
+    client.post(f"{API}/time-blocks", json={
+        "date": "2026-10-14", "start_time": "09:00:00", "end_time": "10:00:00"
+    }, headers=auth_headers)
+    
+    response = import_template(client, auth_headers, [{"start_time": "09:15:00", "end_time": "09:45:00"}])
+    assert response.status_code == 409
+    (conflict,) = response.json()["detail"]["conflicts"]
+    assert {conflict["first"]["start_time"], conflict["second"]["start_time"]} == {"09:00:00", "09:15:00"}
+    assert len(client.get(f"{API}/time-blocks", headers=auth_headers).json()["time_blocks"]) == 1
+
+
+def test_rejects_overlap_between_template_entries(client, auth_headers):
+    response = import_template(client, auth_headers, [
+        {"start_time": "09:00:00", "end_time": "10:00:00"},
+        {"start_time": "09:30:00", "end_time": "10:30:00"}
+    ])
+    assert response.status_code == 409
+
+
+def test_allow_overlap_creates_and_reports_conflicts(client, auth_headers):
+    client.post(f"{API}/time-blocks", json={
+        "date": "2026-10-14", "start_time": "09:00:00", "end_time": "10:00:00"
+    }, headers=auth_headers)
+    
+    response = import_template(
+        client, auth_headers, [{"start_time": "09:15:00", "end_time": "09:45:00"}], allow_overlap=True
+    )
+    assert response.status_code == 200
+    assert len(response.json()["conflicts"]) == 1
+    assert len(client.get(f"{API}/time-blocks", headers=auth_headers).json()["time_blocks"]) == 2
+
+
+def test_touching_blocks_do_not_conflict(client, auth_headers):
+    response = import_template(client, auth_headers, [
+        {"start_time": "09:00:00", "end_time": "10:00:00"},
+        {"start_time": "10:00:00", "end_time": "11:00:00"}
+    ], end_date="2026-10-16")
+    assert response.status_code == 200
+    assert len(response.json()["time_blocks"]) == 6
+    assert response.json()["conflicts"] == []
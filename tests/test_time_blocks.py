@@ -0,0 +1,106 @@
+import pytest
+from tests.conftest import API, register
+
+
+def create_block(client, headers, start, end, day="2026-10-14", **extra):
+    return client.post(f"{API}/time-blocks", json={
+        "date": day, "start_time": start, "end_time": end, **extra
+    }, headers=headers)
+
+
+def block_id(response):
+    assert response.status_code == 200, response.text
+    return response.json()["time_block"]["time_block_id"]
+
+
+def update_block(client, headers, time_block_id, **changes):
+    return client.patch(f"{API}/time-blocks/{time_block_id}", json=changes, headers=headers)
+
+
+def test_create_rejects_an_overlap(client, auth_headers):
+    existing = block_id(create_block(client, auth_headers, "09:00:00", "10:00:00"))
+
+    response = create_block(client, auth_headers, "09:30:00", "10:30:00")
+    assert response.status_code == 409
+    assert [c["time_block_id"] for c in response.json()["detail"]["conflicts"]] == [existing]
+    assert len(client.get(f"{API}/time-blocks", headers=auth_headers).json()["time_blocks"]) == 1
+
+
+def test_create_allows_touching_blocks_other_days_and_allow_overlap(client, auth_headers):
+    block_id(create_block(client, auth_headers, "09:00:00", "10:00:00"))
+    block_id(create_block(client, auth_headers, "10:00:00", "11:00:00"))
+    block_id(create_block(client, auth_headers, "09:30:00", "10:30:00", day="2026-10-15"))
+
+    response = create_block(client, auth_headers, "09:30:00", "10:30:00", allow_overlap=True)
+    assert response.status_code == 200
+    assert len(response.json()["conflicts"]) == 2
+
+
+def test_create_rejects_end_before_start(client, auth_headers):
+    assert create_block(client, auth_headers, "10:00:00", "10:00:00").status_code == 400
+
+
+def test_update_rejects_moving_onto_another_block(client, auth_headers):
+    block_id(create_block(client, auth_headers, "09:00:00", "10:00:00"))
+    other = block_id(create_block(client, auth_headers, "11:00:00", "12:00:00", day="2026-10-15"))
+
+    assert update_block(client, auth_headers, other, date="2026-10-14", start_time="09:30:00").status_code == 409
+    assert update_block(client, auth_headers, other, date="2026-10-14").status_code == 200
+    assert update_block(client, auth_headers, other, start_time="09:45:00").status_code == 409
+    assert update_block(client, auth_headers, other, start_time="09:45:00", allow_overlap=True).status_code == 200
+
+    # Resizing within its own old slot is not an overlap with itself
+    lone = block_id(create_block(client, auth_headers, "14:00:00", "15:00:00"))
+    assert update_block(client, auth_headers, lone, start_time="14:30:00").status_code == 200
+
+
+def test_update_rejects_end_before_start(client, auth_headers):
+    time_block_id = block_id(create_block(client, auth_headers, "09:00:00", "10:00:00"))
+    assert update_block(client, auth_headers, time_block_id, end_time="08:00:00").status_code == 400
+
+
+@pytest.mark.parametrize("field", ["date", "start_time", "end_time", "status", "allow_overlap"])
+def test_update_rejects_explicit_null(client, auth_headers, field):
+    time_block_id = block_id(create_block(client, auth_headers, "09:00:00", "10:00:00"))
+
+    response = update_block(client, auth_headers, time_block_id, **{field: None})
+    assert response.status_code == 422
+    block = client.get(f"{API}/time-blocks/{time_block_id}", headers=auth_headers).json()["time_block"]
+    assert (block["date"], block["start_time"], block["end_time"]) == ("2026-10-14", "09:00:00", "10:00:00")
+
+
+def test_update_can_clear_nullable_fields(client, auth_headers):
+    time_block_id = block_id(create_block(client, auth_headers, "09:00:00", "10:00:00", notes="Focus"))
+    assert update_block(client, auth_headers, time_block_id, notes=None).status_code == 200
+    assert client.get(f"{API}/time-blocks/{time_block_id}", headers=auth_headers).json()["time_block"]["notes"] is None
+
+
+def test_conflicts_lists_each_overlapping_pair_in_range(client, auth_headers):
+    a = block_id(create_block(client, auth_headers, "09:00:00", "10:00:00"))
+    b = block_id(create_block(client, auth_headers, "09:30:00", "11:00:00", allow_overlap=True))
+    c = block_id(create_block(client, auth_headers, "10:30:00", "12:00:00", allow_overlap=True))
+    block_id(create_block(client, auth_headers, "12:00:00", "13:00:00"))  # touches c only
+    d = block_id(create_block(client, auth_headers, "09:00:00", "10:00:00", day="2026-10-16"))
+    e = block_id(create_block(client, auth_headers, "09:00:00", "09:30:00", day="2026-10-16", allow_overlap=True))
+
+    def pairs(**params):
+        response = client.get(f"{API}/time-blocks/conflicts", params=params, headers=auth_headers)
+        assert response.status_code == 200, response.text
+        return {frozenset((p["first"]["time_block_id"], p["second"]["time_block_id"])) for p in response.json()["conflicts"]}
+
+    assert pairs(start_date="2026-10-14") == {frozenset((a, b)), frozenset((b, c))}
+    assert pairs(start_date="2026-10-14", end_date="2026-10-16") == {frozenset((a, b)), frozenset((b, c)), frozenset((d, e))}
+    assert pairs(start_date="2026-10-15") == set()
+
+
+def test_conflicts_validates_the_range(client, auth_headers):
+    url = f"{API}/time-blocks/conflicts"
+    assert client.get(url, params={"start_date": "2026-10-14", "end_date": "2026-10-13"}, headers=auth_headers).status_code == 400
+    assert client.get(url, params={"start_date": "2026-01-01", "end_date": "2027-12-31"}, headers=auth_headers).status_code == 400
+
+
+def test_conflicts_are_per_user(client, auth_headers):
+    create_block(client, auth_headers, "09:00:00", "10:00:00")
+    create_block(client, auth_headers, "09:30:00", "10:30:00", allow_overlap=True)
+    response = client.get(f"{API}/time-blocks/conflicts", params={"start_date": "2026-10-14"}, headers=register(client))
+    assert response.json()["conflicts"] == []